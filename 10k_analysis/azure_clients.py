@@ -0,0 +1,124 @@
+import threading
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from azure.core.pipeline.transport import RequestsTransport
+from azure.search.documents import SearchClient
+from azure.search.documents.indexes import SearchIndexClient
+from azure.keyvault.secrets import SecretClient
+
+
+def endpoint_host(endpoint: str) -> str:
+    """scheme://host[:port] of an endpoint URL, the unit connections are pooled by"""
+    parts = urlsplit(endpoint if "://" in endpoint else f"https://{endpoint}")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class PooledSearchIndexClient(SearchIndexClient):
+    """SearchIndexClient whose per-index SearchClients come from (and are shared through) a registry"""
+
+    def __init__(self, endpoint: str, credential, registry: "AzureClientRegistry", **kwargs):
+        super().__init__(endpoint=endpoint, credential=credential, **kwargs)
+        self._registry = registry
+        self._search_endpoint = endpoint
+        self._search_credential = credential
+
+    def get_search_client(self, index_name: str, **kwargs) -> SearchClient:
+        if kwargs:
+            return super().get_search_client(index_name, transport=self._registry.transport(self._search_endpoint),
+                                             **kwargs)
+        return self._registry.search_client(self._search_endpoint, index_name, self._search_credential)
+
+
+class AzureClientRegistry:
+    """Azure SDK clients that share one pooled HTTP session per endpoint.
+
+    Every SDK client built here (search index and search clients, Key Vault
+    secret clients) sends its requests through a RequestsTransport over the
+    registry's ``requests.Session`` for that host, so connections and TLS
+    sessions are kept alive and reused across clients, tools and report
+    runs instead of each new client opening its own. Clients are memoized
+    by (endpoint, index or vault, credential), and the embedding client can
+    borrow the same sessions (``session``).
+
+    ``pool_size`` is the number of connections kept per host (raised per
+    host with ``session(endpoint, pool_size)`` for highly concurrent
+    callers); with ``pool_block`` callers wait for a free connection rather
+    than opening a throwaway one. ``keep_alive=False`` closes every
+    connection after its response.
+    """
+
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True, pool_block: bool = False,
+                 connection_timeout: float = 30.0, read_timeout: float = 120.0):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.pool_block = pool_block
+        self.connection_timeout = connection_timeout
+        self.read_timeout = read_timeout
+        self._sessions: Dict[str, Tuple[requests.Session, int]] = {}  # host -> (session, pool size)
+        self._clients: Dict[Tuple, object] = {}
+        self._lock = threading.RLock()
+
+    def session(self, endpoint: str, pool_size: Optional[int] = None) -> requests.Session:
+        """Shared session for an endpoint's host, with at least ``pool_size`` pooled connections"""
+        host = endpoint_host(endpoint)
+        size = max(self.pool_size, pool_size or 0)
+        with self._lock:
+            session, current = self._sessions.get(host, (None, 0))
+            if session is None:
+                session = requests.Session()
+                if not self.keep_alive:
+                    session.headers['Connection'] = 'close'
+            if size > current:
+                # Azure SDK pipelines retry on their own, so the adapter must not (as azure-core's own adapter)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, pool_block=self.pool_block,
+                                      max_retries=Retry(total=False, redirect=False, raise_on_status=False))
+                session.mount(f"{host}/", adapter)
+                self._sessions[host] = (session, size)
+            return session
+
+    def transport(self, endpoint: str) -> RequestsTransport:
+        """SDK transport over the shared session (closing a client leaves the session open)"""
+        return RequestsTransport(session=self.session(endpoint), session_owner=False,
+                                 connection_timeout=self.connection_timeout, read_timeout=self.read_timeout)
+
+    def _client(self, key: Tuple, create):
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = create()
+            return self._clients[key]
+
+    def search_index_client(self, endpoint: str, credential) -> PooledSearchIndexClient:
+        return self._client(
+            ('index', endpoint_host(endpoint), id(credential)),
+            lambda: PooledSearchIndexClient(endpoint, credential, self, transport=self.transport(endpoint))
+        )
+
+    def search_client(self, endpoint: str, index_name: str, credential) -> SearchClient:
+        return self._client(
+            ('search', endpoint_host(endpoint), index_name, id(credential)),
+            lambda: SearchClient(endpoint=endpoint, index_name=index_name, credential=credential,
+                                 transport=self.transport(endpoint))
+        )
+
+    def secret_client(self, vault_url: str, credential) -> SecretClient:
+        return self._client(
+            ('secrets', endpoint_host(vault_url), id(credential)),
+            lambda: SecretClient(vault_url=vault_url, credential=credential, transport=self.transport(vault_url))
+        )
+
+    def close(self):
+        """Close every pooled connection (clients handed out stay usable and reconnect on demand)"""
+        with self._lock:
+            for session, _ in self._sessions.values():
+                session.close()
+
+
+@lru_cache(maxsize=None)
+def get_client_registry(pool_size: int = 10, keep_alive: bool = True) -> AzureClientRegistry:
+    """Process-wide registry for a pool configuration, shared by every tool and report"""
+    return AzureClientRegistry(pool_size=pool_size, keep_alive=keep_alive)
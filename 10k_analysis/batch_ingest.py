@@ -0,0 +1,390 @@
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from pdf_text_extractor import PDFTextExtractor, join_pages
+from extraction_cache import CachedExtraction, ExtractionCache, file_sha256, load_or_extract
+from pipeline_metrics import NULL_TRACE
+from document_chunk import DocumentChunk
+
+_STOP = object()
+
+
+def _extract_filing(pdf_path: str, cache_dir: Optional[str], cache_max_mb: int,
+                    sha256: Optional[str] = None) -> Tuple[CachedExtraction, float, float]:
+    """Extraction stage worker (runs in a separate process), one filing per call; returns wall and CPU seconds"""
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    cache = ExtractionCache(cache_dir, max_size_mb=cache_max_mb) if cache_dir else None
+    extraction = load_or_extract(pdf_path, PDFTextExtractor(workers=1), cache, sha256)
+    return extraction, time.perf_counter() - start, time.process_time() - cpu_start
+
+
+def load_filing_list(source: str) -> List[str]:
+    """PDF paths from a directory, a JSON manifest or a text manifest (one path per line)"""
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.lower().endswith('.pdf')
+        )
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    if source.lower().endswith('.json'):
+        data = json.loads(content)
+        entries = data.get('filings', []) if isinstance(data, dict) else data
+        paths = [entry['path'] if isinstance(entry, dict) else entry for entry in entries]
+    else:
+        paths = [line.strip() for line in content.splitlines()
+                 if line.strip() and not line.strip().startswith('#')]
+
+    return [path if os.path.isabs(path) else os.path.join(base_dir, path) for path in paths]
+
+
+@dataclass
+class FilingJob:
+    """State of one filing as it moves through the pipeline stages"""
+    pdf_path: str
+    filing_id: Optional[str] = None  # SHA-256 of the PDF
+    extraction: Optional[CachedExtraction] = None
+    company_name: Optional[str] = None
+    ticker: Optional[str] = None
+    metrics: Any = None
+    chunks: Optional[List[DocumentChunk]] = None
+    embeddings: Optional[List[Optional[List[float]]]] = None
+    error: Optional[str] = None
+    trace: Any = NULL_TRACE  # per-stage instrumentation (see pipeline_metrics)
+
+
+@dataclass
+class StageStats:
+    """Work done by one pipeline stage"""
+    name: str
+    unit: str
+    filings: int = 0
+    units: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, start: float, end: float, units: int, busy: Optional[float] = None, error: bool = False):
+        with self._lock:
+            self.filings += 1
+            self.units += units
+            self.errors += int(error)
+            self.busy_seconds += busy if busy is not None else end - start
+            self.first_start = start if self.first_start is None else min(self.first_start, start)
+            self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+    @property
+    def active_seconds(self) -> float:
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+
+class BatchIngestionPipeline:
+    """Ingest many filings with overlapped stages connected by bounded queues.
+
+    extract (process pool) -> parse (thread) -> embed (threads) -> upload (writer thread)
+
+    PDF extraction runs in worker processes, one filing per task. Parsing
+    (company info, metrics, chunking) runs in one thread; several filings can
+    be embedded at once, each through the tool's concurrent embedding client;
+    a single writer thread uploads finished filings. The bounded queues keep at
+    most ``queue_size`` filings waiting between two stages, so memory stays
+    flat while CPU-bound and network-bound work overlap.
+
+    With ``incremental``, filings whose PDF hash is already in the tool's
+    ingest manifest are skipped before extraction.
+    """
+
+    def __init__(self, tool, extract_workers: Optional[int] = None, embed_workers: int = 2,
+                 queue_size: int = 4, incremental: bool = False):
+        self.tool = tool
+        self.incremental = incremental
+        self.extract_workers = extract_workers or os.cpu_count() or 1
+        self.embed_workers = max(1, embed_workers)
+        self.queue_size = queue_size
+
+        cache = getattr(tool, 'extraction_cache', None)
+        self.cache_dir = cache.cache_dir if cache is not None else None
+        self.cache_max_mb = cache.max_bytes // (1024 * 1024) if cache is not None else 0
+
+        self.stats = {
+            'extract': StageStats('extract', 'pages'),
+            'parse': StageStats('parse', 'chunks'),
+            'embed': StageStats('embed', 'chunks'),
+            'upload': StageStats('upload', 'docs'),
+        }
+        self.results: Dict[str, bool] = {}
+        self.skipped: List[str] = []
+        self._results_lock = threading.Lock()
+
+    def run(self, pdf_paths: List[str]) -> Dict[str, bool]:
+        """Ingest every filing and return {pdf_path: success}"""
+        parse_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embed_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        upload_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=self._extract_stage, args=(pdf_paths, parse_queue), name="extract"),
+                   threading.Thread(target=self._parse_stage, args=(parse_queue, embed_queue), name="parse")]
+        threads += [threading.Thread(target=self._embed_stage, args=(embed_queue, upload_queue), name=f"embed-{i}")
+                    for i in range(self.embed_workers)]
+        threads.append(threading.Thread(target=self._upload_stage, args=(upload_queue,), name="upload"))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.print_summary(time.perf_counter() - started)
+        return self.results
+
+    def _finish(self, job: FilingJob, success: bool):
+        self.tool.pipeline_metrics.finish_filing(job.trace, "ok" if success else "failed", job.error)
+        with self._results_lock:
+            self.results[job.pdf_path] = success
+        if success:
+            print(f"✓ {job.pdf_path}")
+        else:
+            print(f"✗ {job.pdf_path}: {job.error}")
+
+    def _skip(self, job: FilingJob):
+        self.tool.pipeline_metrics.finish_filing(job.trace, "skipped")
+        with self._results_lock:
+            self.results[job.pdf_path] = True
+            self.skipped.append(job.pdf_path)
+        print(f"= {job.pdf_path} (unchanged, skipped)")
+
+    def _extract_stage(self, pdf_paths: List[str], out_queue: queue.Queue):
+        stats = self.stats['extract']
+        pending = {}
+        paths = iter(pdf_paths)
+
+        with ProcessPoolExecutor(max_workers=self.extract_workers) as executor:
+            while True:
+                # Keep the pool busy, but never run more than a queue's worth ahead of parsing
+                while len(pending) < self.extract_workers + self.queue_size:
+                    pdf_path = next(paths, None)
+                    if pdf_path is None:
+                        break
+                    job = FilingJob(pdf_path=pdf_path, trace=self.tool.pipeline_metrics.start_filing(pdf_path))
+                    if self.incremental:
+                        try:
+                            job.filing_id = file_sha256(pdf_path)
+                            job.trace.annotate(filing_id=job.filing_id)
+                        except OSError as e:
+                            job.error = f"extraction failed: {e}"
+                            out_queue.put(job)
+                            continue
+                        if job.filing_id in self.tool.manifest:
+                            self._skip(job)
+                            continue
+                    future = executor.submit(_extract_filing, pdf_path, self.cache_dir, self.cache_max_mb,
+                                             job.filing_id)
+                    pending[future] = (job, time.perf_counter())
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, submitted = pending.pop(future)
+                    try:
+                        job.extraction, busy, cpu = future.result()
+                        job.filing_id = job.extraction.sha256
+                        job.trace.annotate(filing_id=job.filing_id)
+                        if job.trace.enabled:
+                            job.trace.add('extract', busy, cpu, pages=len(job.extraction.pages),
+                                          chars=sum(len(page.text) for page in job.extraction.pages),
+                                          bytes=os.path.getsize(job.pdf_path))
+                        stats.record(submitted, time.perf_counter(), len(job.extraction.pages), busy=busy)
+                    except Exception as e:
+                        job.error = f"extraction failed: {e}"
+                        stats.record(submitted, time.perf_counter(), 0, error=True)
+                    out_queue.put(job)
+
+        out_queue.put(_STOP)
+
+    def _parse_stage(self, in_queue: queue.Queue, out_queue: queue.Queue):
+        stats = self.stats['parse']
+        while True:
+            job = in_queue.get()
+            if job is _STOP:
+                break
+            if job.error:
+                self._finish(job, False)
+                continue
+
+            start = time.perf_counter()
+            try:
+                pages = job.extraction.pages
+                job.extraction = None  # pages are no longer needed downstream
+                text = join_pages(pages)
+                if len(text.strip()) < 1000:
+                    raise ValueError("extracted text is very short, PDF may be image-based or corrupted")
+                job.company_name, job.ticker, job.metrics, job.chunks = self.tool.prepare_filing(
+                    text, pages, filing_id=job.filing_id, trace=job.trace, pdf_path=job.pdf_path)
+                stats.record(start, time.perf_counter(), len(job.chunks))
+            except Exception as e:
+                job.error = f"parsing failed: {e}"
+                stats.record(start, time.perf_counter(), 0, error=True)
+                self._finish(job, False)
+                continue
+            out_queue.put(job)
+
+        for _ in range(self.embed_workers):
+            out_queue.put(_STOP)
+
+    def _embed_stage(self, in_queue: queue.Queue, out_queue: queue.Queue):
+        stats = self.stats['embed']
+        while True:
+            job = in_queue.get()
+            if job is _STOP:
+                break
+
+            start = time.perf_counter()
+            try:
+                job.embeddings = self.tool.generate_embeddings([chunk.content for chunk in job.chunks], job.trace)
+                embedded = sum(embedding is not None for embedding in job.embeddings)
+                if embedded == 0:
+                    raise ValueError("no embeddings could be generated")
+                stats.record(start, time.perf_counter(), embedded)
+            except Exception as e:
+                job.error = f"embedding failed: {e}"
+                stats.record(start, time.perf_counter(), 0, error=True)
+                self._finish(job, False)
+                continue
+            out_queue.put(job)
+
+        out_queue.put(_STOP)
+
+    def _upload_stage(self, in_queue: queue.Queue):
+        stats = self.stats['upload']
+        remaining_producers = self.embed_workers
+        while remaining_producers:
+            job = in_queue.get()
+            if job is _STOP:
+                remaining_producers -= 1
+                continue
+
+            start = time.perf_counter()
+            try:
+                document_count = sum(embedding is not None for embedding in job.embeddings)
+                with job.trace.stage('upload'):
+                    indexed = self.tool.index_filing(job.chunks, job.embeddings, job.metrics, job.filing_id,
+                                                     source=job.pdf_path, trace=job.trace)
+                job.chunks = job.embeddings = None
+                if not indexed:
+                    raise ValueError("upload failed")
+                stats.record(start, time.perf_counter(), document_count)
+                self._finish(job, True)
+            except Exception as e:
+                job.error = f"upload failed: {e}"
+                stats.record(start, time.perf_counter(), 0, error=True)
+                self._finish(job, False)
+
+    def print_summary(self, wall_seconds: float):
+        """Per-stage throughput summary"""
+        succeeded = sum(self.results.values())
+        print("\n" + "=" * 80)
+        print(f"BATCH INGESTION SUMMARY: {succeeded}/{len(self.results)} filings ingested in {wall_seconds:.1f}s"
+              + (f" ({len(self.skipped)} unchanged, skipped)" if self.skipped else ""))
+        print("=" * 80)
+        print(f"{'Stage':<10}{'Filings':>9}{'Errors':>8}{'Units':>12}{'Busy (s)':>11}{'Active (s)':>12}{'Units/s':>10}{'Filings/min':>13}")
+        for stage in self.stats.values():
+            active = stage.active_seconds
+            units_rate = stage.units / active if active > 0 else 0.0
+            filings_rate = stage.filings * 60 / active if active > 0 else 0.0
+            units = f"{stage.units} {stage.unit}"
+            print(f"{stage.name:<10}{stage.filings:>9}{stage.errors:>8}{units:>12}{stage.busy_seconds:>11.1f}"
+                  f"{active:>12.1f}{units_rate:>10.1f}{filings_rate:>13.1f}")
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Ingest a directory or manifest of 10-K PDFs")
+    parser.add_argument("source", help="Directory of PDFs, or a manifest (.json list or one path per line)")
+    parser.add_argument("--vault", action="store_true",
+                        help="Use AzureVault10KIngestionTool (Key Vault credentials)")
+    parser.add_argument("--extract-workers", type=int, default=None,
+                        help="PDF extraction processes (default: one per core)")
+    parser.add_argument("--embed-workers", type=int, default=2,
+                        help="Filings embedded concurrently")
+    parser.add_argument("--queue-size", type=int, default=4,
+                        help="Maximum filings waiting between two stages")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-extract PDFs instead of using the extraction cache")
+    parser.add_argument("--local-search", action="store_true",
+                        help="Use the in-process local search index instead of Azure Search")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip PDFs that are already indexed unchanged (per the ingest manifest)")
+    parser.add_argument("--statement-tables", action="store_true",
+                        help="Read income statement and balance sheet values from the PDF's tables")
+    parser.add_argument("--metrics-jsonl", default=None,
+                        help="Append one JSON record of per-stage timings and counters per filing to this file")
+    parser.add_argument("--prometheus", default=None,
+                        help="Write per-stage totals in Prometheus text format to this file when done")
+    args = parser.parse_args()
+
+    pdf_paths = load_filing_list(args.source)
+    if not pdf_paths:
+        print(f"No PDF filings found in {args.source}")
+        sys.exit(1)
+
+    if args.vault:
+        from AzureVault10KIngestionTool import AzureVault10KIngestionTool
+        tool = AzureVault10KIngestionTool(
+            tenant_id=os.getenv("AZURE_TENANT_ID"),
+            client_id=os.getenv("AZURE_CLIENT_ID"),
+            client_secret=os.getenv("AZURE_CLIENT_SECRET"),
+            key_vault_url=os.getenv("AZURE_KEY_VAULT_URL"),
+            azure_search_endpoint=os.getenv("AZURE_SEARCH_ENDPOINT"),
+            use_extraction_cache=not args.no_cache,
+            search_backend="local" if args.local_search else "azure",
+            collect_pipeline_metrics=args.prometheus is not None,
+            pipeline_metrics_path=args.metrics_jsonl,
+            statement_tables=args.statement_tables
+        )
+    else:
+        from Generic10KIngestionTool import Generic10KIngestionTool
+        tool = Generic10KIngestionTool(
+            azure_search_endpoint=os.getenv("AZURE_SEARCH_ENDPOINT"),
+            azure_search_key=os.getenv("AZURE_SEARCH_KEY"),
+            azure_openai_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            azure_openai_key=os.getenv("AZURE_OPENAI_KEY"),
+            use_extraction_cache=not args.no_cache,
+            search_backend="local" if args.local_search else "azure",
+            collect_pipeline_metrics=args.prometheus is not None,
+            pipeline_metrics_path=args.metrics_jsonl,
+            statement_tables=args.statement_tables
+        )
+
+    print(f"Ingesting {len(pdf_paths)} filings...")
+    pipeline = BatchIngestionPipeline(tool, extract_workers=args.extract_workers,
+                                      embed_workers=args.embed_workers, queue_size=args.queue_size,
+                                      incremental=args.incremental)
+    results = pipeline.run(pdf_paths)
+    if args.prometheus:
+        tool.pipeline_metrics.write_prometheus(args.prometheus)
+        print(f"Pipeline metrics written to {args.prometheus}")
+    sys.exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+from bench_pipeline import measure
+from pdf_text_extractor import join_pages
+from stub_services import StubEmbeddingServer
+from synthetic_filings import synthetic_10k_pages, write_synthetic_pdf
+from tenk.profiles import PROFILES
+from tenk.registry import components
+from tokenization import get_token_counter
+
+KINDS = ['extractor', 'chunker', 'embedder']
+
+
+def component_benchmarks(kind: str, names: List[str], pages: int, workdir: str, profile,
+                         server: StubEmbeddingServer) -> Dict[str, Tuple[Callable[[], object], Callable[[object], str]]]:
+    """name -> (one run of the component on a synthetic filing, summary of its output) for each registered name"""
+    token_counter = get_token_counter()
+    filing_pages = synthetic_10k_pages(pages, seed=pages)
+    benchmarks = {}
+
+    if kind == 'extractor':
+        pdf_path = write_synthetic_pdf(os.path.join(workdir, f"synthetic_{pages}.pdf"), pages, seed=pages)
+        for name in names:
+            extractor = components.create('extractor', name)
+            benchmarks[name] = (lambda extractor=extractor: extractor.extract_pages(pdf_path),
+                                lambda result: f"{len(result)} pages, {len(join_pages(result)) / 1024:.0f} KB")
+    elif kind == 'chunker':
+        for name in names:
+            chunker = components.create('chunker', name, profile=profile, token_counter=token_counter)
+            benchmarks[name] = (lambda chunker=chunker: list(chunker.iter_chunks(filing_pages)),
+                                lambda result: f"{len(result)} chunks, {sum(c.token_count for c in result):,} tokens")
+    elif kind == 'embedder':
+        chunker = components.create('chunker', 'section', profile=profile, token_counter=token_counter)
+        texts = [chunk.content for chunk in chunker.iter_chunks(filing_pages)]
+        for name in names:
+            embedder = components.create('embedder', name, endpoint=server.endpoint, api_key="bench-key",
+                                         token_counter=token_counter)
+            benchmarks[name] = (lambda embedder=embedder: embedder.embed(texts),
+                                lambda result: f"{sum(v is not None for v in result.vectors)} vectors, "
+                                               f"{result.api_calls} API calls")
+    return benchmarks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every registered implementation of each pipeline component "
+                                                 "side by side on the same synthetic filings (see tenk.registry)")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS)
+    parser.add_argument("--only", nargs="+", default=None, help="Only these implementation names")
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 250], help="Synthetic filing sizes in pages")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="generic",
+                        help="Filing profile the chunkers split sections by")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    workdir = tempfile.mkdtemp(prefix="bench_components_")
+    timed = 0
+    print(f"{'Component':<28}{'Pages':>7}{'Median (ms)':>14}{'Min (ms)':>11}{'vs fastest':>12}  Output")
+    try:
+        with StubEmbeddingServer() as server:
+            for kind in args.kinds:
+                names = [name for name in components.names(kind) if not args.only or name in args.only]
+                for pages in args.pages:
+                    try:
+                        benchmarks = component_benchmarks(kind, names, pages, workdir, profile, server)
+                    except ImportError as e:
+                        print(f"{kind} skipped: {e}")
+                        break
+                    results = {}
+                    for name, (run, describe) in benchmarks.items():
+                        stats = measure(f"{kind}:{name}", pages, run, args.rounds)
+                        results[name] = (stats, describe(run()))
+                    fastest = min((stats.median for stats, _ in results.values()), default=0.0)
+                    for name, (stats, summary) in results.items():
+                        print(f"{kind + ':' + name:<28}{pages:>7}{stats.median * 1000:>14.2f}{stats.min * 1000:>11.2f}"
+                              f"{stats.median / fastest if fastest > 0 else 1.0:>11.2f}x  {summary}")
+                        timed += 1
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if not timed:
+        print("Nothing to benchmark")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import re
+import time
+import random
+import argparse
+from typing import Dict, List, Optional
+
+from tenk.profiles import GENERIC
+
+# Previous implementation: one re.search/re.findall per pattern over the whole text
+def legacy_extract_value(text: str, patterns: List[str]) -> Optional[float]:
+    for pattern in patterns:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            number_str, scale = match if isinstance(match, tuple) else (match, "")
+            try:
+                value = float(number_str.replace(',', ''))
+                if 'billion' in scale.lower():
+                    value *= 1_000_000_000
+                elif 'million' in scale.lower():
+                    value *= 1_000_000
+                elif 'thousand' in scale.lower():
+                    value *= 1_000
+                if 1_000 <= value <= 10_000_000_000_000:
+                    return value
+            except (ValueError, TypeError):
+                continue
+    return None
+
+
+def legacy_extract(text: str, value_patterns: Dict[str, List[str]], search_patterns: Dict[str, List[str]]) -> Dict:
+    results = {}
+    for field, patterns in search_patterns.items():
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                results[field] = int(match.group(1).replace(',', ''))
+                break
+    for field, patterns in value_patterns.items():
+        value = legacy_extract_value(text, patterns)
+        if value is not None:
+            results[field] = value
+    return results
+
+
+def synthetic_filing(target_bytes: int, seed: int = 7) -> str:
+    """Deterministic 10-K-like text: narrative sections plus Item 7/8 financial tables"""
+    rng = random.Random(seed)
+    words = ("the company operates cloud platform services customers markets growth competition "
+             "regulatory risk products segment operations results liquidity capital fiscal "
+             "net income cash assets sales revenue earnings").split()
+
+    def paragraph() -> str:
+        tokens = [rng.choice(words) for _ in range(rng.randint(40, 120))]
+        for _ in range(rng.randint(0, 4)):  # prose mentions years, percentages and small amounts
+            tokens.insert(rng.randrange(len(tokens)), rng.choice(("2022", "2023", f"{rng.randint(1, 99)}%",
+                                                                  f"${rng.randint(1, 999)},{rng.randint(100, 999)}")))
+        return " ".join(tokens).capitalize() + "."
+
+    header = ("UNITED STATES SECURITIES AND EXCHANGE COMMISSION\nFORM 10-K\n"
+              "Annual report for the fiscal year ended December 31, 2023\nExample Corp.\n\n"
+              "Item 1. Business ... 3\nItem 1A. Risk Factors ... 9\nItem 7. Management's Discussion ... 40\n"
+              "Item 8. Financial Statements ... 60\nItem 9. Changes in Accountants ... 90\n\n")
+    business = "ITEM 1. BUSINESS\n\nAs of December 31, 2023, we had approximately 181,000 full-time employees.\n\n"
+    mdna = "ITEM 7. MANAGEMENT'S DISCUSSION AND ANALYSIS\n\nTotal revenues $ 307,394 million increased 9%.\n\n"
+    statements = ("ITEM 8. FINANCIAL STATEMENTS\n\nCONSOLIDATED STATEMENTS OF INCOME (in millions)\n"
+                  "Total revenues $ 307,394 million\nIncome from operations $ 84,293 million\n"
+                  "Net income $ 73,795 million\n\nCONSOLIDATED BALANCE SHEETS\nTotal assets $ 402,392 million\n"
+                  "Cash and cash equivalents $ 24,048 million\n\n")
+    closing = "ITEM 9. CHANGES IN AND DISAGREEMENTS WITH ACCOUNTANTS\n\n"
+
+    parts = [header, business]
+    size = len(header) + len(business)
+    filler_share = (target_bytes - size) // 3
+    for section in (mdna, statements, closing):
+        parts.append(section)
+        written = 0
+        while written < filler_share:
+            p = paragraph() + "\n\n"
+            parts.append(p)
+            written += len(p)
+    return "".join(parts)[:target_bytes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark for financial metric extraction")
+    parser.add_argument("--size-mb", type=float, default=5.0, help="Synthetic filing size in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = synthetic_filing(int(args.size_mb * 1024 * 1024))
+    engine = GENERIC.metric_engine
+    value_patterns, search_patterns = engine.value_patterns, engine.search_patterns
+
+    def best_of(func) -> float:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    legacy_result = legacy_extract(text, value_patterns, search_patterns)
+    engine_result = engine.extract(text)
+    legacy_time = best_of(lambda: legacy_extract(text, value_patterns, search_patterns))
+    engine_time = best_of(lambda: engine.extract(text))
+
+    print(f"Synthetic filing: {len(text) / 1024 / 1024:.1f} MB")
+    print(f"Legacy per-pattern scans: {legacy_time * 1000:8.1f} ms")
+    print(f"Single-pass engine:       {engine_time * 1000:8.1f} ms")
+    print(f"Speedup:                  {legacy_time / engine_time:8.1f}x")
+    print(f"Legacy result: {legacy_result}")
+    print(f"Engine result: {engine_result}")
+
+
+if __name__ == "__main__":
+    main()
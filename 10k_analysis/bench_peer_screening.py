@@ -0,0 +1,71 @@
+import time
+import argparse
+from typing import Dict, List
+
+import numpy as np
+
+from peer_screening import PeerScreener
+
+SECTORS = ["Technology", "Healthcare", "Energy", "Financial Services", "Industrials", "Consumer Staples"]
+
+
+def synthetic_companies(count: int, seed: int = 7) -> List[Dict]:
+    """Company records with log-normal sizes, noisy margins and some missing metrics"""
+    rng = np.random.default_rng(seed)
+    revenue = 10 ** rng.normal(9.5, 0.8, count)
+    records = []
+    for i in range(count):
+        margin = rng.normal(15, 10)
+        record = {
+            'company_key': f"C{i:05d}_2023",
+            'company_name': f"Company {i}",
+            'ticker': f"C{i:05d}",
+            'filing_year': 2023,
+            'sector': SECTORS[i % len(SECTORS)],
+            'revenue': float(revenue[i]),
+            'employees': int(revenue[i] / rng.uniform(2e5, 1e6)),
+            'revenue_growth': float(rng.normal(8, 12)),
+            'gross_margin': float(margin + rng.uniform(20, 40)),
+            'operating_margin': float(margin),
+            'net_margin': float(margin * 0.8),
+        }
+        if rng.random() < 0.2:
+            del record['revenue_growth']
+        records.append(record)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark for vectorized peer screening")
+    parser.add_argument("--companies", type=int, default=10000)
+    parser.add_argument("--dimensions", type=int, default=1536, help="Business centroid size (0 to disable)")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    records = synthetic_companies(args.companies)
+    centroids = None
+    if args.dimensions:
+        rng = np.random.default_rng(11)
+        centroids = {'business': {r['company_key']: rng.standard_normal(args.dimensions).astype(np.float32)
+                                  for r in records}}
+
+    start = time.perf_counter()
+    screener = PeerScreener(records, centroids=centroids)
+    build_time = time.perf_counter() - start
+
+    references = [records[i]['ticker'] for i in range(0, args.companies, max(1, args.companies // args.queries))]
+    start = time.perf_counter()
+    for reference in references:
+        peers = screener.screen(reference, top=10)
+    screen_time = (time.perf_counter() - start) / len(references)
+
+    print(f"Companies: {args.companies}, centroid dimensions: {args.dimensions}")
+    print(f"Build screening matrix: {build_time * 1000:8.1f} ms")
+    print(f"Screen one company:     {screen_time * 1000:8.2f} ms (mean of {len(references)})")
+    print(f"Nearest peers of {references[-1]}:")
+    for peer in peers[:5]:
+        print(f"  {peer.ticker} distance={peer.distance:.2f} main differences={', '.join(peer.main_differences())}")
+
+
+if __name__ == "__main__":
+    main()
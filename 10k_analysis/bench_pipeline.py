@@ -0,0 +1,234 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from Generic10KIngestionTool import Generic10KIngestionTool
+from ingest_manifest import text_fingerprint
+from pdf_text_extractor import PDFTextExtractor, join_pages
+from section_index import SectionIndex
+from stub_services import StubEmbeddingServer
+from synthetic_filings import synthetic_10k_pages, write_synthetic_pdf
+from tenk_extractor import TenKExtractor
+
+STAGES = ['pdf_extract', 'section_index', 'company_info', 'tenk_extractor', 'classify_industry',
+          'financial_metrics', 'chunk', 'embed', 'index']
+
+DEFAULT_BASELINE = os.path.join(".benchmarks", "pipeline_baseline.json")
+
+
+@dataclass
+class BenchmarkStats:
+    """Timings of one stage on one filing size over several rounds (seconds)"""
+    stage: str
+    pages: int
+    rounds: int
+    min: float
+    max: float
+    mean: float
+    median: float
+    stddev: float
+    ops: float  # rounds per second, from the mean
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}[{self.pages}]"
+
+
+def measure(stage: str, pages: int, func: Callable[[], object], rounds: int, warmup: int = 1) -> BenchmarkStats:
+    """Run ``func`` warmup + rounds times (its output silenced) and summarize the timed rounds"""
+    timings = []
+    with redirect_stdout(io.StringIO()):
+        for round_index in range(warmup + rounds):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            if round_index >= warmup:
+                timings.append(elapsed)
+    mean = statistics.fmean(timings)
+    return BenchmarkStats(
+        stage=stage,
+        pages=pages,
+        rounds=rounds,
+        min=min(timings),
+        max=max(timings),
+        mean=mean,
+        median=statistics.median(timings),
+        stddev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        ops=1 / mean if mean > 0 else 0.0
+    )
+
+
+def machine_info() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': str(os.cpu_count()),
+        'numpy': np.__version__,
+    }
+
+
+def run_benchmarks(page_counts: List[int], stages: List[str], rounds: int, workdir: str) -> List[BenchmarkStats]:
+    """Time every stage on a synthetic filing of each size, fully offline.
+
+    Embeddings come from a local StubEmbeddingServer and documents go to the
+    in-process local search backend, with the extraction and embedding caches
+    off so every round does the full work.
+    """
+    results = []
+    with StubEmbeddingServer() as server:
+        tool = Generic10KIngestionTool(
+            azure_search_endpoint="https://bench.search.windows.net",
+            azure_search_key="",
+            azure_openai_endpoint=server.endpoint,
+            azure_openai_key="bench-key",
+            use_extraction_cache=False,
+            use_embedding_cache=False,
+            search_backend="local",
+            local_index_dir=os.path.join(workdir, "index"),
+            manifest_path=os.path.join(workdir, "manifest.json")
+        )
+        with redirect_stdout(io.StringIO()):
+            tool.create_search_index(recreate=True)
+        extractor = TenKExtractor()
+
+        for pages in page_counts:
+            filing_pages = synthetic_10k_pages(pages, seed=pages)
+            text = join_pages(filing_pages)
+            filing_id = text_fingerprint(text)
+            company_name, ticker = tool.extract_company_info(text)
+            with redirect_stdout(io.StringIO()):
+                metrics = tool.extract_financial_metrics(text, company_name, ticker)
+            chunks = tool.chunk_document_by_sections(text, company_name, ticker, filing_pages, filing_id)
+            texts = [chunk.content for chunk in chunks]
+            print(f"Synthetic filing: {pages} pages, {len(text) / 1024:.0f} KB, {len(chunks)} chunks")
+
+            embeddings = None
+            if 'embed' in stages or 'index' in stages:
+                embeddings = tool.generate_embeddings(texts)
+
+            benchmarks = {
+                'section_index': lambda: SectionIndex.build(text, filing_pages),
+                'company_info': lambda: tool.extract_company_info(text),
+                'tenk_extractor': lambda: extractor.extract_from_text(text),
+                'classify_industry': lambda: tool.classify_industry(text),
+                'financial_metrics': lambda: tool.extract_financial_metrics(text, company_name, ticker),
+                'chunk': lambda: tool.chunk_document_by_sections(text, company_name, ticker, filing_pages, filing_id),
+                'embed': lambda: tool.generate_embeddings(texts),
+                'index': lambda: tool.index_filing(chunks, embeddings, metrics, filing_id),
+            }
+
+            if 'pdf_extract' in stages:
+                try:
+                    pdf_path = write_synthetic_pdf(os.path.join(workdir, f"synthetic_{pages}.pdf"), pages, seed=pages)
+                    pdf_extractor = PDFTextExtractor()
+                    benchmarks['pdf_extract'] = lambda: pdf_extractor.extract_pages(pdf_path)
+                except ImportError:
+                    print("  pdf_extract skipped: reportlab is not installed")
+
+            for stage in STAGES:
+                if stage not in stages or stage not in benchmarks:
+                    continue
+                stats = measure(stage, pages, benchmarks[stage], rounds)
+                results.append(stats)
+                print(f"  {stage:<18} median {stats.median * 1000:10.2f} ms  "
+                      f"(min {stats.min * 1000:.2f}, stddev {stats.stddev * 1000:.2f}, {stats.rounds} rounds)")
+    return results
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(path: str, results: List[BenchmarkStats]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.utcnow().isoformat() + "Z",
+            'machine_info': machine_info(),
+            'benchmarks': [asdict(stats) for stats in results]
+        }, f, indent=2)
+
+
+def compare(results: List[BenchmarkStats], baseline: Dict, threshold: float) -> List[str]:
+    """Print the change against the baseline medians; returns the benchmarks slower than 1 + threshold"""
+    previous = {f"{b['stage']}[{b['pages']}]": b for b in baseline.get('benchmarks', [])}
+    if baseline.get('machine_info') != machine_info():
+        print("Note: the baseline was recorded on a different machine or environment")
+
+    regressions = []
+    print(f"\n{'Benchmark':<28}{'Median (ms)':>14}{'Baseline (ms)':>15}{'Change':>10}")
+    for stats in results:
+        before = previous.get(stats.key)
+        if before is None:
+            print(f"{stats.key:<28}{stats.median * 1000:>14.2f}{'-':>15}{'new':>10}")
+            continue
+        change = stats.median / before['median'] - 1 if before['median'] > 0 else 0.0
+        marker = ""
+        if change > threshold:
+            regressions.append(stats.key)
+            marker = "  REGRESSION"
+        print(f"{stats.key:<28}{stats.median * 1000:>14.2f}{before['median'] * 1000:>15.2f}{change:>+10.1%}{marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline per-stage benchmarks of the 10-K pipeline on synthetic filings")
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 100, 250, 500],
+                        help="Synthetic filing sizes in pages")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline results to compare against (and to write with --save-baseline)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown of the median that counts as a regression")
+    parser.add_argument("--output", default=None, help="Also write this run's results to a JSON file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        results = run_benchmarks(args.pages, args.stages, args.rounds, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        save_results(args.output, results)
+
+    regressions = []
+    baseline = load_baseline(args.baseline)
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+    else:
+        print(f"\nNo baseline at {args.baseline} (run with --save-baseline to create one)")
+
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
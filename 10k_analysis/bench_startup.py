@@ -0,0 +1,148 @@
+import os
+import re
+import sys
+import time
+import shutil
+import argparse
+import statistics
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Dict, List, Tuple
+
+from bench_peer_screening import synthetic_companies
+from ingest_manifest import IngestManifest, IngestedFiling
+
+# Modules a startup should only load in the stage that needs them
+HEAVY_MODULES = ['pandas', 'PyPDF2', 'pdfplumber', 'azure.search.documents', 'azure.identity',
+                 'azure.keyvault.secrets', 'azure.core', 'cryptography', 'requests', 'tiktoken']
+
+IMPORT_TARGETS = ['ingest_manifest', 'tenk_cli', 'Generic10KIngestionTool', 'AzureVault10KIngestionTool',
+                  'quick_ingest', 'batch_ingest']
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_python(args: List[str], importtime: bool = True) -> Tuple[float, Dict[str, int], Dict[str, int]]:
+    """Run ``python [-X importtime] <args>`` in a fresh interpreter.
+
+    Returns the wall time (seconds), the cumulative import time of every
+    top-level import (microseconds) and the self time of every module loaded
+    (both empty without ``importtime``, which adds its own overhead).
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable] + (["-X", "importtime"] if importtime else []) + args, cwd=HERE,
+                               capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{completed.stdout}\n{completed.stderr}")
+
+    top_level, loaded = {}, {}
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        loaded[module] = int(self_us)
+        if len(indent) == 1:
+            top_level[module] = int(cumulative_us)
+    return elapsed, top_level, loaded
+
+
+def heavy_modules(loaded: Dict[str, int]) -> List[str]:
+    return [name for name in HEAVY_MODULES if name in loaded]
+
+
+def seed_workspace(workdir: str, companies: int) -> Dict[str, str]:
+    """Ingest manifest and local company index with synthetic filings, for the CLI commands to query"""
+    from Generic10KIngestionTool import Generic10KIngestionTool
+
+    paths = {
+        'manifest': os.path.join(workdir, "manifest.json"),
+        'index': os.path.join(workdir, "local_index")
+    }
+    records = synthetic_companies(companies)
+    with redirect_stdout(StringIO()):
+        tool = Generic10KIngestionTool(None, None, None, None, search_backend="local",
+                                       local_index_dir=paths['index'], manifest_path=paths['manifest'])
+        tool.create_search_index()
+        for record in records:
+            record['industry'] = record['sector']
+        tool.get_company_client().upload_documents(records)
+
+    manifest = IngestManifest(paths['manifest'])
+    for i, record in enumerate(records):
+        manifest.filings[f"{i:064x}"] = IngestedFiling(
+            filing_id=f"{i:064x}", company_key=record['company_key'], chunk_count=400,
+            source=f"10K_{record['ticker']}.pdf", ingested_at="2024-01-01T00:00:00"
+        )
+    manifest.record(IngestedFiling(filing_id="f" * 64, company_key="ZZZZ_2024", chunk_count=1))
+    paths['reference'] = records[0]['ticker']
+    return paths
+
+
+def summarize(label: str, timings: List[float], budget_ms: float, heavy: List[str]) -> bool:
+    median_ms = statistics.median(timings) * 1000
+    within = median_ms <= budget_ms
+    print(f"{label:<44}{median_ms:>9.0f}{min(timings) * 1000:>9.0f}{'' if within else '  OVER BUDGET':<14}"
+          f"{', '.join(heavy) or '-'}")
+    return within
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark: module import times and CLI command latency")
+    parser.add_argument("--rounds", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--companies", type=int, default=500, help="Synthetic companies in the seeded index")
+    parser.add_argument("--budget-ms", type=float, default=300.0,
+                        help="Median wall time allowed for each CLI command (exit status 1 when exceeded)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Slowest modules to list for the heaviest import target (0 to skip)")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, {args.rounds} rounds, times in ms (median, min)\n")
+    print(f"{'Import':<44}{'Median':>9}{'Min':>9}{'':<14}Heavy modules loaded")
+    slowest: Dict[str, int] = {}
+    slowest_target = None
+    for target in IMPORT_TARGETS:
+        timings, loaded = [], {}
+        for _ in range(args.rounds):
+            _, top_level, loaded = run_python(["-c", f"import {target}"])
+            timings.append(top_level[target] / 1_000_000)
+        summarize(f"import {target}", timings, float('inf'), heavy_modules(loaded))
+        if slowest_target is None or statistics.median(timings) > slowest_target[1]:
+            slowest_target, slowest = (target, statistics.median(timings)), loaded
+
+    if args.top and slowest_target:
+        print(f"\nSlowest modules (self time) when importing {slowest_target[0]}:")
+        for module, self_us in sorted(slowest.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {module:<60}{self_us / 1000:>8.1f}")
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        paths = seed_workspace(workdir, args.companies)
+        commands = {
+            "tenk_cli.py --help": ["tenk_cli.py", "--help"],
+            "tenk_cli.py filings": ["tenk_cli.py", "--manifest", paths['manifest'], "filings"],
+            f"tenk_cli.py comparables ({args.companies} companies)": [
+                "tenk_cli.py", "--manifest", paths['manifest'], "comparables", paths['reference'],
+                "--local-search", "--local-index-dir", paths['index']
+            ],
+        }
+        print(f"\n{'Command (wall time, fresh interpreter)':<44}{'Median':>9}{'Min':>9}{'':<14}Heavy modules loaded")
+        all_within = True
+        for label, command in commands.items():
+            _, _, loaded = run_python(command)
+            timings = [run_python(command, importtime=False)[0] for _ in range(args.rounds)]
+            all_within &= summarize(label, timings, args.budget_ms, heavy_modules(loaded))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"\nBudget: {args.budget_ms:.0f} ms per command ({'met' if all_within else 'exceeded'})")
+    sys.exit(0 if all_within else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union, get_args, get_origin, get_type_hints
+
+import numpy as np
+
+from document_chunk import DocumentChunk
+
+# Azure Search document keys may only contain letters, digits, '_', '-' and '='
+_UNSAFE_KEY_CHARS = re.compile(r'[^A-Za-z0-9_\-=]')
+
+# Integer metrics that fit in Edm.Int32; other integers are stored as Edm.Int64
+INT32_FIELDS = {'filing_year', 'chunk_count'}
+
+# Sections whose chunk embeddings are averaged into one vector per filing, stored as "<section>_vector"
+CENTROID_SECTIONS = ('business_overview', 'risk_factors')
+
+
+# Ticker used when a filing does not state one
+UNKNOWN_TICKER = "UNK"
+
+# Requested companies that may be tickers, looked up exactly in one search.in filter
+_TICKER_LIKE = re.compile(r'[A-Za-z][A-Za-z0-9.\-]{0,9}')
+
+# Filings fetched per requested company in a batched lookup (one per filing year)
+FILINGS_PER_COMPANY = 10
+
+
+def company_key(ticker: Optional[str], filing_year: Optional[int], filing_id: Optional[str] = None) -> str:
+    """Key of one filing in the company index, e.g. "GOOGL_2023" ("na" when the year is unknown).
+
+    Filings without a ticker are told apart by their fingerprint
+    ("UNK-3f2a9c01d4e5_2023"), so they do not overwrite each other.
+    """
+    if (not ticker or ticker == UNKNOWN_TICKER) and filing_id:
+        ticker = f"{UNKNOWN_TICKER}-{filing_id[:12]}"
+    return f"{_UNSAFE_KEY_CHARS.sub('-', ticker or UNKNOWN_TICKER)}_{filing_year or 'na'}"
+
+
+def centroid_field(section: str) -> str:
+    return f"{section}_vector"
+
+
+class SectionCentroids:
+    """Section centroids accumulated batch by batch, so a filing's chunk vectors need not all be kept.
+
+    Each batch adds the sum of its (unit-length) chunk embeddings per
+    section; ``centroids()`` scales the sums to unit length, which is the
+    unit-length mean.
+    """
+
+    def __init__(self, sections: Sequence[str] = CENTROID_SECTIONS):
+        self.sections = tuple(sections)
+        self._sums: Dict[str, np.ndarray] = {}
+
+    def add(self, chunks: Sequence[DocumentChunk], embeddings: Sequence[Optional[Sequence[float]]]):
+        rows: Dict[str, List[Sequence[float]]] = {section: [] for section in self.sections}
+        for chunk, embedding in zip(chunks, embeddings):
+            if embedding is not None and chunk.section_type in rows:
+                rows[chunk.section_type].append(embedding)
+
+        for section, vectors in rows.items():
+            if not vectors:
+                continue
+            matrix = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            total = (matrix / np.where(norms > 0, norms, 1.0)).sum(axis=0, dtype=np.float64)
+            self._sums[section] = self._sums[section] + total if section in self._sums else total
+
+    def centroids(self) -> Dict[str, List[float]]:
+        """Unit-length mean of each section's chunk embeddings, for sections that have any"""
+        centroids = {}
+        for section, total in self._sums.items():
+            norm = np.linalg.norm(total)
+            if norm > 0:
+                centroids[section] = (total / norm).astype(np.float32).tolist()
+        return centroids
+
+
+def section_centroids(chunks: Sequence[DocumentChunk], embeddings: Sequence[Optional[Sequence[float]]],
+                      sections: Sequence[str] = CENTROID_SECTIONS) -> Dict[str, List[float]]:
+    """Unit-length mean of the (unit-length) chunk embeddings of each section, for sections that have any"""
+    accumulator = SectionCentroids(sections)
+    accumulator.add(chunks, embeddings)
+    return accumulator.centroids()
+
+
+def _field_type(hint) -> type:
+    """Concrete type behind Optional[...] annotations"""
+    if get_origin(hint) is Union:
+        return next(arg for arg in get_args(hint) if arg is not type(None))
+    return hint
+
+
+def company_index_fields(metrics_class, vector_dimensions: int = 1536,
+                         vector_profile: str = "vector-profile") -> List:
+    """Company index schema derived from a FinancialMetrics dataclass, so both stay in sync.
+
+    Text fields are searchable and filterable, numeric fields filterable and
+    sortable, plus the ``company_key`` key, ``chunk_count``,
+    ``ingestion_timestamp`` and one centroid vector per CENTROID_SECTIONS
+    (searchable with ``vector_profile``).
+    """
+    from azure.search.documents.indexes.models import SearchableField, SearchField, SearchFieldDataType, SimpleField
+    
+    index_fields = [SimpleField(name="company_key", type=SearchFieldDataType.String, key=True, filterable=True)]
+
+    hints = get_type_hints(metrics_class)
+    for field in fields(metrics_class):
+        field_type = _field_type(hints[field.name])
+        if field_type is str:
+            index_fields.append(SearchableField(name=field.name, type=SearchFieldDataType.String,
+                                                filterable=True, sortable=True, facetable=True))
+        elif field_type is int:
+            data_type = SearchFieldDataType.Int32 if field.name in INT32_FIELDS else SearchFieldDataType.Int64
+            index_fields.append(SimpleField(name=field.name, type=data_type,
+                                            filterable=True, sortable=True, facetable=field.name == 'filing_year'))
+        else:
+            index_fields.append(SimpleField(name=field.name, type=SearchFieldDataType.Double,
+                                            filterable=True, sortable=True))
+
+    index_fields.extend([
+        SimpleField(name="chunk_count", type=SearchFieldDataType.Int32, filterable=True, sortable=True),
+        SimpleField(name="ingestion_timestamp", type=SearchFieldDataType.DateTimeOffset,
+                    filterable=True, sortable=True)
+    ])
+    index_fields.extend(
+        SearchField(
+            name=centroid_field(section),
+            type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+            searchable=True,
+            vector_search_dimensions=vector_dimensions,
+            vector_search_profile_name=vector_profile
+        )
+        for section in CENTROID_SECTIONS
+    )
+    return index_fields
+
+
+def company_record(metrics: Dict[str, Any], key: str, chunk_count: int, ingestion_time: str,
+                   centroids: Optional[Dict[str, List[float]]] = None) -> Dict[str, Any]:
+    """Company index document for one filing: every known metric and the section centroids, stored once"""
+    record = {"company_key": key}
+    record.update({name: value for name, value in metrics.items() if value is not None})
+    record["chunk_count"] = chunk_count
+    record["ingestion_timestamp"] = ingestion_time
+    for section, centroid in (centroids or {}).items():
+        record[centroid_field(section)] = centroid
+    return record
+
+
+def filing_company(record: Dict[str, Any]) -> Optional[str]:
+    """Company a filing record belongs to: its company_key without the year ("GOOGL", "UNK-3f2a9c01d4e5")"""
+    key = record.get('company_key')
+    if key:
+        return key.rsplit('_', 1)[0]
+    ticker = record.get('ticker')
+    return ticker if ticker and ticker != UNKNOWN_TICKER else None
+
+
+def latest_filings(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One record per company (its most recent filing year), in the order companies first appear.
+
+    Companies are told apart by company_key (see filing_company), so filings
+    without a ticker are not merged into one "UNK" company; select
+    company_key along with the other fields.
+    """
+    latest: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        company = filing_company(record)
+        if not company:
+            continue
+        current = latest.get(company)
+        if current is None or (record.get('filing_year') or 0) > (current.get('filing_year') or 0):
+            latest[company] = record
+    return list(latest.values())
+
+
+def _odata_list(values: Iterable[str], delimiter: str) -> str:
+    """search.in value list as an OData string literal (quotes doubled)"""
+    return "'" + delimiter.join(values).replace("'", "''") + "'"
+
+
+def find_latest_filings(company_client, companies: Sequence[str], select: Sequence[str],
+                        max_workers: int = 8) -> Dict[str, Dict[str, Any]]:
+    """Latest filing record for each requested ticker or company name; companies not found are left out.
+
+    Tickers and exact company names are resolved together by one filtered
+    query (``search.in`` on ticker and on company_name), fetching only the
+    ``select`` fields. The remaining names fall back to a full-text search
+    each, run concurrently rather than one after another.
+    """
+    fields = list(dict.fromkeys(list(select) + ['company_key', 'company_name', 'ticker', 'filing_year']))
+    wanted = list(dict.fromkeys(company.strip() for company in companies if company and company.strip()))
+    found: Dict[str, Dict[str, Any]] = {}
+    if not wanted:
+        return found
+
+    tickers = [company.upper() for company in wanted if _TICKER_LIKE.fullmatch(company)]
+    names = [company for company in wanted if '|' not in company]
+    clauses = []
+    if tickers:
+        clauses.append(f"search.in(ticker, {_odata_list(tickers, ',')}, ',')")
+    if names:
+        clauses.append(f"search.in(company_name, {_odata_list(names, '|')}, '|')")
+    records = latest_filings(company_client.search(
+        search_text="*",
+        filter=" or ".join(clauses),
+        select=",".join(fields),
+        top=min(1000, len(wanted) * FILINGS_PER_COMPANY)
+    ))
+    by_ticker = {record['ticker'].upper(): record for record in records}
+    by_name = {(record.get('company_name') or '').lower(): record for record in records}
+    for company in wanted:
+        record = by_ticker.get(company.upper()) or by_name.get(company.lower())
+        if record is not None:
+            found[company] = record
+
+    def full_text(company: str) -> Optional[Dict[str, Any]]:
+        results = latest_filings(company_client.search(
+            search_text=f"company_name:{company} OR ticker:{company}",
+            select=",".join(fields),
+            top=5
+        ))
+        return results[0] if results else None
+
+    remaining = [company for company in wanted if company not in found]
+    if remaining:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(remaining))) as executor:
+            for company, record in zip(remaining, executor.map(full_text, remaining)):
+                if record is not None:
+                    found[company] = record
+    return found
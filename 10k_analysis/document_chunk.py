@@ -0,0 +1,88 @@
+from typing import Dict, Optional
+
+from ingest_manifest import chunk_document_id
+
+
+class FilingSource:
+    """Filing-level fields shared by every chunk of one filing (set once it is known who filed it)"""
+    __slots__ = ('filing_id', 'company_name', 'ticker', 'source_file')
+
+    def __init__(self, filing_id: str, company_name: str, ticker: str, source_file: Optional[str] = None):
+        self.filing_id = filing_id
+        self.company_name = company_name
+        self.ticker = ticker
+        self.source_file = source_file  # PDF file name, without its local directory
+
+
+class DocumentChunk:
+    """One chunk of a filing, traceable to the PDF pages and the characters it came from.
+
+    Slotted rather than a dict: a 300-page filing has thousands of chunks,
+    and the company name, ticker and filing id live once in the shared
+    ``filing`` (a FilingSource) instead of in every chunk.
+
+    ``char_start``/``char_end`` are offsets in the join_pages text,
+    ``page_start``/``page_end`` the 1-based PDF pages (None when chunking
+    plain text) and ``extraction_method`` how those pages were read
+    ("PyPDF2", "pdfplumber", or both joined with "+").
+    """
+    __slots__ = ('content', 'section_type', 'chunk_index', 'token_count', 'char_start', 'char_end',
+                 'page_start', 'page_end', 'extraction_method', 'filing')
+
+    def __init__(self, content: str, section_type: str, chunk_index: int, token_count: int,
+                 char_start: int, char_end: int, page_start: Optional[int] = None,
+                 page_end: Optional[int] = None, extraction_method: Optional[str] = None,
+                 filing: Optional[FilingSource] = None):
+        self.content = content
+        self.section_type = section_type
+        self.chunk_index = chunk_index
+        self.token_count = token_count  # estimate from the chunker's token counter
+        self.char_start = char_start
+        self.char_end = char_end
+        self.page_start = page_start
+        self.page_end = page_end
+        self.extraction_method = extraction_method
+        self.filing = filing
+
+    @property
+    def id(self) -> Optional[str]:
+        """Search document key, once the chunk is labelled with its filing"""
+        return chunk_document_id(self.filing.filing_id, self.chunk_index) if self.filing else None
+
+    @property
+    def filing_id(self) -> Optional[str]:
+        return self.filing.filing_id if self.filing else None
+
+    @property
+    def company_name(self) -> Optional[str]:
+        return self.filing.company_name if self.filing else None
+
+    @property
+    def ticker(self) -> Optional[str]:
+        return self.filing.ticker if self.filing else None
+
+    @property
+    def source_file(self) -> Optional[str]:
+        return self.filing.source_file if self.filing else None
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'filing_id': self.filing_id,
+            'company_name': self.company_name,
+            'ticker': self.ticker,
+            'source_file': self.source_file,
+            'content': self.content,
+            'section_type': self.section_type,
+            'chunk_index': self.chunk_index,
+            'token_count': self.token_count,
+            'char_start': self.char_start,
+            'char_end': self.char_end,
+            'page_start': self.page_start,
+            'page_end': self.page_end,
+            'extraction_method': self.extraction_method
+        }
+
+    def __repr__(self) -> str:
+        return (f"DocumentChunk({self.chunk_index}, {self.section_type!r}, pages {self.page_start}-{self.page_end}, "
+                f"chars {self.char_start}-{self.char_end}, {self.token_count} tokens)")
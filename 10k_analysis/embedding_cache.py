@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# New cache keys are appended to index.jsonl (one line of key -> row per put_many), so a store costs
+# O(batch) rather than a rewrite of the whole index. The log is folded into index.json once it holds as
+# many keys as the snapshot (and at least this many), which keeps filling the cache linear overall.
+COMPACT_MIN_LOGGED = 10_000
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so reflowed copies of the same paragraph share a cache entry"""
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Cache key for a (model, normalized text) pair"""
+    return hashlib.sha256(f"{model}\n{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """Local embedding store: float32 vectors in a memory-mapped .npy plus a JSON index.
+
+    Vectors for each model live in their own directory as ``vectors.npy``
+    (rows appended as new embeddings arrive) and ``index.json`` (cache key ->
+    row number) plus ``index.jsonl``, the keys stored since index.json was
+    written (see COMPACT_MIN_LOGGED). A row's vector is flushed before its
+    key is logged, so a crash loses at most the batch being stored. Lookups
+    resolve all keys first and then read the matching rows in one
+    fancy-indexing call.
+
+    One instance is safe to share between threads (lookups and stores take
+    the same lock, so a lookup never sees the vector file while it grows).
+    The directory must not be shared between processes: each process keeps
+    its own copy of the index and writes the index files and vectors.npy as
+    if it were the only writer, so concurrent processes lose or mix up entries.
+    Give each worker process its own cache_dir.
+    """
+
+    def __init__(self, cache_dir: str = ".embedding_cache", model: str = "text-embedding-ada-002",
+                 dimensions: int = 1536, initial_capacity: int = 4096):
+        self.model = model
+        self.dimensions = dimensions
+        self.directory = os.path.join(cache_dir, re.sub(r'[^\w.-]', '_', model))
+        self.vectors_path = os.path.join(self.directory, "vectors.npy")
+        self.index_path = os.path.join(self.directory, "index.json")
+        self.index_log_path = os.path.join(self.directory, "index.jsonl")
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.index: Dict[str, int] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        self._snapshot_keys = len(self.index)
+        self._logged = 0  # keys appended to index.jsonl since index.json was written
+        self._replay_index_log()
+
+        if os.path.exists(self.vectors_path):
+            self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+            if self._vectors.shape[1] != dimensions:
+                raise ValueError(f"Embedding cache at {self.directory} holds {self._vectors.shape[1]}-dim "
+                                 f"vectors, expected {dimensions}")
+        else:
+            self._vectors = np.lib.format.open_memmap(
+                self.vectors_path, mode='w+', dtype=np.float32,
+                shape=(initial_capacity, dimensions)
+            )
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up embeddings for a batch of texts, None for each miss"""
+        keys = [embedding_key(self.model, text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        with self._lock:
+            rows = [self.index.get(key) for key in keys]
+            hit_positions = [i for i, row in enumerate(rows) if row is not None]
+            if not hit_positions:
+                return results
+            # Copy the rows out while holding the lock, put_many may swap in a grown vector file
+            block = np.array(self._vectors[[rows[i] for i in hit_positions]])
+        for position, vector in zip(hit_positions, block):
+            results[position] = vector.tolist()
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """Store embeddings for a batch of texts and persist the index"""
+        with self._lock:
+            new_rows = {}
+            for text, vector in zip(texts, vectors):
+                key = embedding_key(self.model, text)
+                if key not in self.index and key not in new_rows:
+                    new_rows[key] = vector
+            if not new_rows:
+                return
+
+            start = len(self.index)
+            self._ensure_capacity(start + len(new_rows))
+            self._vectors[start:start + len(new_rows)] = np.asarray(list(new_rows.values()), dtype=np.float32)
+            self._vectors.flush()
+
+            added = {key: start + offset for offset, key in enumerate(new_rows)}
+            with open(self.index_log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(added) + '\n')
+            self.index.update(added)
+            self._logged += len(added)
+            if self._logged >= max(self._snapshot_keys, COMPACT_MIN_LOGGED):
+                self._write_index()
+
+    def _ensure_capacity(self, required_rows: int):
+        """Grow the memory-mapped vector file by doubling when it is full (called with the lock held)"""
+        capacity = self._vectors.shape[0]
+        if required_rows <= capacity:
+            return
+
+        while capacity < required_rows:
+            capacity *= 2
+
+        tmp_path = self.vectors_path + ".tmp"
+        grown = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32,
+                                          shape=(capacity, self.dimensions))
+        used = len(self.index)
+        grown[:used] = self._vectors[:used]
+        grown.flush()
+        del grown
+        # Both maps are closed before the file is replaced (Windows cannot replace a mapped file);
+        # readers take the lock, so none sees the attribute missing in between
+        del self._vectors
+        os.replace(tmp_path, self.vectors_path)
+        self._vectors = np.load(self.vectors_path, mmap_mode='r+')
+
+    def _replay_index_log(self):
+        """Add the keys logged after index.json was written"""
+        if not os.path.exists(self.index_log_path):
+            return
+        torn = False
+        with open(self.index_log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    added = json.loads(line)
+                except ValueError:
+                    torn = True  # interrupted append; its rows are written again by the next put_many
+                    break
+                self.index.update(added)
+                self._logged += len(added)
+        if torn:
+            self._write_index()
+
+    def _write_index(self):
+        """Write the whole index to index.json and drop the log (a crash in between only replays it again)"""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+        if os.path.exists(self.index_log_path):
+            os.remove(self.index_log_path)
+        self._snapshot_keys = len(self.index)
+        self._logged = 0
@@ -0,0 +1,209 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tokenization import estimate_tokens
+
+
+@dataclass
+class EmbeddingResult:
+    """Vectors in input order (None where embedding failed) plus failure details"""
+    vectors: List[Optional[List[float]]]
+    failures: Dict[int, str] = field(default_factory=dict)  # input index -> error message
+    api_calls: int = 0
+    retries: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+class _RetryableError(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AzureEmbeddingClient:
+    """Concurrent Azure OpenAI embeddings client with token-sized batches.
+
+    Texts are packed into batches by estimated token count and up to
+    ``max_in_flight`` batches are sent at once. 429 and 5xx responses are
+    retried with exponential backoff, honouring ``Retry-After``; a 429 pauses
+    every worker, not only the one that received it. A batch rejected as a
+    whole (400) is split so that only the offending items end up failing.
+    Failed items are reported in the result instead of being replaced with
+    placeholder vectors.
+    """
+
+    def __init__(self,
+                 endpoint: str,
+                 api_key: str,
+                 deployment: str = "text-embedding-ada-002",
+                 api_version: str = "2023-05-15",
+                 max_in_flight: int = 8,
+                 max_batch_tokens: int = 8000,
+                 max_batch_items: int = 2048,
+                 max_retries: int = 6,
+                 timeout: float = 60.0,
+                 token_counter: Callable[[str], int] = estimate_tokens,
+                 session: Optional[requests.Session] = None):
+        self.url = f"{endpoint.rstrip('/')}/openai/deployments/{deployment}/embeddings"
+        self.api_version = api_version
+        self.max_in_flight = max_in_flight
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_items = max_batch_items
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.token_counter = token_counter
+
+        # Credentials go on each request, so the session can be one shared with other clients
+        self.headers = {'api-key': api_key, 'Content-Type': 'application/json'}
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+        self._pause_lock = threading.Lock()
+        self._paused_until = 0.0
+        self._stats_lock = threading.Lock()
+
+    def embed(self, texts: Sequence[str]) -> EmbeddingResult:
+        """Embed texts concurrently, returning vectors in input order"""
+        result = EmbeddingResult(vectors=[None] * len(texts))
+        if not texts:
+            return result
+
+        batches = self._make_batches(texts)
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(batches))) as executor:
+            futures = [executor.submit(self._embed_batch, texts, batch, result) for batch in batches]
+            for future in futures:
+                future.result()
+
+        return result
+
+    def _make_batches(self, texts: Sequence[str]) -> List[List[int]]:
+        """Pack input indexes into batches bounded by token count and item count"""
+        batches = []
+        current: List[int] = []
+        current_tokens = 0
+
+        for i, text in enumerate(texts):
+            tokens = self.token_counter(text)
+            if current and (current_tokens + tokens > self.max_batch_tokens
+                            or len(current) >= self.max_batch_items):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _embed_batch(self, texts: Sequence[str], indexes: List[int], result: EmbeddingResult):
+        """Embed one batch with retries, splitting it if the service rejects the batch"""
+        attempt = 0
+        while True:
+            self._wait_for_pause()
+            try:
+                vectors = self._post([texts[i] for i in indexes], result)
+                for i, vector in zip(indexes, vectors):
+                    result.vectors[i] = vector
+                return
+
+            except _RetryableError as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    self._fail(indexes, f"gave up after {self.max_retries} retries: {e}", result)
+                    return
+                with self._stats_lock:
+                    result.retries += 1
+                delay = e.retry_after if e.retry_after is not None else self._backoff(attempt)
+                if e.retry_after is not None:
+                    self._pause(delay)
+                else:
+                    time.sleep(delay)
+
+            except ValueError as e:
+                # The batch was rejected as a whole, retry the halves so only bad items fail
+                if len(indexes) == 1:
+                    self._fail(indexes, str(e), result)
+                    return
+                middle = len(indexes) // 2
+                self._embed_batch(texts, indexes[:middle], result)
+                self._embed_batch(texts, indexes[middle:], result)
+                return
+
+            except Exception as e:
+                self._fail(indexes, str(e), result)
+                return
+
+    def _post(self, batch: List[str], result: EmbeddingResult) -> List[List[float]]:
+        with self._stats_lock:
+            result.api_calls += 1
+
+        try:
+            response = self.session.post(self.url, params={'api-version': self.api_version}, headers=self.headers,
+                                         json={'input': batch}, timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise _RetryableError(str(e))
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise _RetryableError(f"HTTP {response.status_code}", self._retry_after(response))
+        if response.status_code == 400:
+            raise ValueError(f"HTTP 400: {response.text[:200]}")
+        response.raise_for_status()
+
+        data = sorted(response.json()['data'], key=lambda item: item['index'])
+        if len(data) != len(batch):
+            raise ValueError(f"Expected {len(batch)} embeddings, got {len(data)}")
+        return [item['embedding'] for item in data]
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Delay requested by the service, in seconds"""
+        retry_after_ms = response.headers.get('retry-after-ms')
+        if retry_after_ms:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return None
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with jitter, capped at 30 seconds"""
+        return min(30.0, 0.5 * (2 ** (attempt - 1))) * (0.5 + random.random() / 2)
+
+    def _pause(self, seconds: float):
+        """Hold back every worker until the rate limit window has passed"""
+        with self._pause_lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _wait_for_pause(self):
+        while True:
+            with self._pause_lock:
+                remaining = self._paused_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def _fail(self, indexes: List[int], message: str, result: EmbeddingResult):
+        with self._stats_lock:
+            for i in indexes:
+                result.failures[i] = message
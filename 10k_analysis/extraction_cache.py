@@ -0,0 +1,181 @@
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from pdf_text_extractor import PageText, PDFTextExtractor
+
+
+@dataclass
+class CachedExtraction:
+    """Per-page extraction result for one PDF, keyed by the file's SHA-256 and the extractor that produced it"""
+    sha256: str
+    pages: List[PageText]
+    page_offsets: List[Tuple[int, int]]  # (char_start, char_end) of each page in the joined text
+
+
+def file_sha256(pdf_path: str) -> str:
+    """SHA-256 of the PDF contents, used as the cache key"""
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extractor_tag(extractor) -> str:
+    """The extractor's cache_tag, or its class for extractors that do not define one"""
+    return getattr(extractor, 'cache_tag', None) or f"{type(extractor).__module__}.{type(extractor).__qualname__}"
+
+
+def compute_page_offsets(pages: List[PageText]) -> List[Tuple[int, int]]:
+    """Character range of each page in the text produced by join_pages"""
+    offsets = []
+    position = 0
+    for page in pages:
+        start = position
+        if page.text:
+            position += len(page.text) + 1
+        offsets.append((start, start + len(page.text)))
+    return offsets
+
+
+class ExtractionCache:
+    """On-disk cache of extracted PDF pages with a size cap and LRU eviction.
+
+    Each entry is a gzipped JSON file named after the PDF's SHA-256 and a
+    digest of the extractor tag (see PDFTextExtractor.cache_tag), so a
+    renamed or re-downloaded copy of the same filing still hits the cache,
+    while a different extractor, library version or setting extracts afresh.
+    A hit refreshes the entry's mtime, and eviction removes the entries with
+    the oldest mtime first.
+    """
+
+    def __init__(self, cache_dir: str = ".extraction_cache", max_size_mb: int = 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_size_mb * 1024 * 1024
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_path(self, sha256: str, tag: str) -> str:
+        tag_digest = hashlib.sha256(tag.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{sha256}-{tag_digest}.json.gz")
+
+    def get(self, sha256: str, tag: str) -> Optional[CachedExtraction]:
+        """Return the extraction cached for a PDF hash by the extractor with this tag, or None on a miss"""
+        path = self._entry_path(sha256, tag)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path)  # mark as recently used
+        except Exception as e:
+            print(f"Ignoring unreadable extraction cache entry {path}: {e}")
+            return None
+
+        pages = [PageText(**page) for page in data['pages']]
+        page_offsets = [tuple(offset) for offset in data['page_offsets']]
+        return CachedExtraction(sha256=sha256, pages=pages, page_offsets=page_offsets)
+
+    def put(self, sha256: str, tag: str, pages: List[PageText]) -> CachedExtraction:
+        """Store the pages an extractor (by tag) produced for a PDF hash and evict old entries if over the cap"""
+        entry = CachedExtraction(sha256=sha256, pages=pages, page_offsets=compute_page_offsets(pages))
+        data = {
+            'sha256': sha256,
+            'extractor': tag,
+            'pages': [
+                {'page_number': p.page_number, 'text': p.text, 'extraction_method': p.extraction_method}
+                for p in pages
+            ],
+            'page_offsets': entry.page_offsets
+        }
+
+        path = self._entry_path(sha256, tag)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing extraction cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return entry
+
+        self._evict(keep=path)
+        return entry
+
+    def _evict(self, keep: str):
+        """Remove least recently used entries until the cache fits under max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json.gz'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+
+def load_or_extract(pdf_path: str, extractor: PDFTextExtractor,
+                    cache: Optional[ExtractionCache] = None, sha256: Optional[str] = None) -> CachedExtraction:
+    """Per-page text for a PDF, served from the cache when possible (``sha256``: the file's hash, if known)"""
+    sha256 = sha256 or file_sha256(pdf_path)
+    tag = extractor_tag(extractor)
+
+    if cache is not None:
+        cached = cache.get(sha256, tag)
+        if cached:
+            print(f"Using cached extraction for {os.path.basename(pdf_path)} ({len(cached.pages)} pages)")
+            return cached
+
+    pages = extractor.extract_pages(pdf_path)
+
+    if cache is not None and pages:
+        return cache.put(sha256, tag, pages)
+    return CachedExtraction(sha256=sha256, pages=pages, page_offsets=compute_page_offsets(pages))
+
+
+def stream_or_extract(pdf_path: str, extractor: PDFTextExtractor,
+                      cache: Optional[ExtractionCache] = None, sha256: Optional[str] = None) -> Iterator[PageText]:
+    """Pages of a PDF in page order, from the cache or streamed from the extractor.
+
+    On a miss the pages are yielded while extraction is still running and
+    stored in the cache once the last page is in. ``sha256`` is the file's
+    hash, if the caller already has it.
+    """
+    sha256 = sha256 or file_sha256(pdf_path)
+    tag = extractor_tag(extractor)
+
+    if cache is not None:
+        cached = cache.get(sha256, tag)
+        if cached:
+            print(f"Using cached extraction for {os.path.basename(pdf_path)} ({len(cached.pages)} pages)")
+            yield from cached.pages
+            return
+
+    pages = []
+    for page in extractor.iter_pages(pdf_path):
+        pages.append(page)
+        yield page
+
+    if cache is not None and pages:
+        cache.put(sha256, tag, pages)
@@ -0,0 +1,146 @@
+import json
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from section_index import SectionIndex, findall_lowered, item_bodies
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "industry_taxonomy.json")
+
+
+def _trie_pattern(keywords: List[str]) -> str:
+    """Regex alternation shaped like a trie of the keywords, so each position is tried against
+    one branch per distinct next character instead of every keyword"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Longer keywords are tried first (greedy) and give way to a shorter one when the boundary fails
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class IndustryClassifier:
+    """Keyword industry classification in a single pass over the filing.
+
+    All keywords of a taxonomy are compiled once (build the classifier at
+    class level) into one trie-shaped regex over lowercased text, scanned
+    with section_index.findall_lowered (see the note on lowercasing there),
+    instead of one ``str.count`` scan per keyword. Keywords must start and
+    end on a word boundary, so "ai" no longer counts inside "maintain" or
+    "gas" inside "gasoline". The longest keyword at a position
+    wins, and the keywords it contains count as well ("online retail" is
+    also a "retail"), as an Aho-Corasick automaton would report them; only
+    keywords straddling the end of another match are missed.
+
+    Counts are weighted by the 10-K Item they fall in (``section_weights``,
+    by item number), so the business description in Item 1 outweighs
+    exhibits and governance boilerplate. Item ranges come from the filing's
+    SectionIndex when one is passed in. Text outside located Items, or every
+    match when no Item headings are found, gets ``default_section_weight``.
+
+    ``taxonomy`` maps industry -> {"sector": ..., "keywords": [...]}; ties
+    go to the industry listed first.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict], section_weights: Optional[Dict[str, float]] = None,
+                 default_section_weight: float = 1.0):
+        self.industries = list(taxonomy)
+        self.sectors = {industry: entry.get('sector', "Other") for industry, entry in taxonomy.items()}
+        self.keywords = {industry: [keyword.lower() for keyword in entry.get('keywords', [])]
+                         for industry, entry in taxonomy.items()}
+        self.section_weights = {item.upper(): weight for item, weight in (section_weights or {}).items()}
+        self.default_section_weight = default_section_weight
+
+        # keyword -> industries it scores for (one entry per occurrence in the taxonomy)
+        owners: Dict[str, List[str]] = {}
+        for industry, keywords in self.keywords.items():
+            for keyword in keywords:
+                owners.setdefault(keyword, []).append(industry)
+
+        # A match consumes the longest keyword at its position; the whole-word keywords
+        # inside it ("retail" in "online retail") are counted from this table instead
+        self._scores_for: Dict[str, List[str]] = {}
+        for keyword in owners:
+            self._scores_for[keyword] = [
+                industry for other, industries in owners.items()
+                for _ in range(self._occurrences(other, keyword))
+                for industry in industries
+            ]
+
+        self.pattern = re.compile(
+            r'(?<![a-z0-9])(' + _trie_pattern(list(owners)) + r')(?![a-z0-9])'
+        ) if owners else None
+
+    @staticmethod
+    def _occurrences(keyword: str, text: str) -> int:
+        """Whole-word occurrences of a keyword in another keyword"""
+        count = 0
+        start = text.find(keyword)
+        while start >= 0:
+            end = start + len(keyword)
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                count += 1
+            start = text.find(keyword, start + 1)
+        return count
+
+    @classmethod
+    def from_config(cls, taxonomy: str = "generic", path: Optional[str] = None) -> "IndustryClassifier":
+        """Classifier for one named taxonomy of a JSON config (industry_taxonomy.json by default)"""
+        with open(path or DEFAULT_TAXONOMY_PATH, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if taxonomy not in config.get('taxonomies', {}):
+            raise ValueError(f"Taxonomy {taxonomy!r} not found in {path or DEFAULT_TAXONOMY_PATH}")
+        return cls(
+            config['taxonomies'][taxonomy],
+            section_weights=config.get('section_weights'),
+            default_section_weight=config.get('default_section_weight', 1.0)
+        )
+
+    def _segments(self, text: str, bodies: Dict[str, Tuple[int, int]]) -> List[Tuple[int, int, float]]:
+        """(start, end, weight) ranges covering the whole text"""
+        segments = []
+        position = 0
+        for item, (start, end) in sorted(bodies.items(), key=lambda entry: entry[1][0]):
+            if start < position:
+                continue
+            if start > position:
+                segments.append((position, start, self.default_section_weight))
+            segments.append((start, end, self.section_weights.get(item, self.default_section_weight)))
+            position = end
+        if position < len(text):
+            segments.append((position, len(text), self.default_section_weight))
+        return segments
+
+    def scores(self, text: str, sections: Optional[SectionIndex] = None) -> Dict[str, float]:
+        """Weighted keyword count per industry"""
+        scores = {industry: 0.0 for industry in self.industries}
+        if self.pattern is None:
+            return scores
+
+        bodies = sections.items() if sections is not None else item_bodies(text)
+        for start, end, weight in self._segments(text, bodies):
+            if weight <= 0:
+                continue
+            for keyword, count in Counter(findall_lowered(self.pattern, text, start, end)).items():
+                for industry in self._scores_for[keyword]:
+                    scores[industry] += count * weight
+        return scores
+
+    def classify(self, text: str, sections: Optional[SectionIndex] = None) -> Tuple[str, str]:
+        """(industry, sector) with the highest score, ("Other", "Other") when no keyword matches"""
+        scores = self.scores(text, sections)
+        if not scores or max(scores.values()) <= 0:
+            return "Other", "Other"
+        industry = max(scores, key=scores.get)
+        return industry, self.sectors.get(industry, "Other")
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+
+def text_fingerprint(text: str) -> str:
+    """Filing fingerprint for text that did not come from a PDF file"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def chunk_document_id(filing_id: str, chunk_index: int) -> str:
+    """Search document key of a chunk: filing fingerprint (128-bit prefix) and chunk position.
+
+    The key depends only on the filing's contents, so re-ingesting the same
+    PDF overwrites its documents in place, and different filings never
+    collide (whatever their ticker or year).
+    """
+    return f"{filing_id[:32]}_{chunk_index}"
+
+
+@dataclass
+class IngestedFiling:
+    """One filing in the index: its fingerprint, where it came from and the documents it produced"""
+    filing_id: str  # SHA-256 of the PDF (or of the text for filings ingested from text)
+    company_key: str
+    chunk_count: int  # chunks produced; their keys are chunk_document_id(filing_id, 0..chunk_count-1)
+    source: Optional[str] = None
+    ingested_at: Optional[str] = None
+
+    def document_ids(self, start: int = 0) -> List[str]:
+        """Keys of the filing's chunks from chunk ``start`` on"""
+        return [chunk_document_id(self.filing_id, index) for index in range(start, self.chunk_count)]
+
+
+class IngestManifest:
+    """JSON record of the filings ingested into an index, keyed by filing fingerprint.
+
+    Used to skip filings that are already indexed and to find the filings a
+    new one supersedes: an earlier version of the same PDF path, or another
+    filing for the same company and year. The file is rewritten atomically
+    after every change.
+    """
+
+    def __init__(self, path: str = ".ingest_manifest.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.filings: Dict[str, IngestedFiling] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.filings = {entry['filing_id']: IngestedFiling(**entry) for entry in data.get('filings', [])}
+            except Exception as e:
+                print(f"Ignoring unreadable ingest manifest {path}: {e}")
+
+    def get(self, filing_id: str) -> Optional[IngestedFiling]:
+        return self.filings.get(filing_id)
+
+    def __contains__(self, filing_id: str) -> bool:
+        return filing_id in self.filings
+
+    def superseded_by(self, filing: IngestedFiling) -> List[IngestedFiling]:
+        """Other filings replaced by ``filing``: same source path, or same company and year.
+
+        A previous entry for the same filing_id is not included; its chunks
+        are overwritten in place, see ``trailing_document_ids``.
+        """
+        source = os.path.abspath(filing.source) if filing.source else None
+        with self._lock:
+            return [
+                entry for entry in self.filings.values()
+                if entry.filing_id != filing.filing_id and (
+                    entry.company_key == filing.company_key
+                    or (source is not None and entry.source is not None and os.path.abspath(entry.source) == source)
+                )
+            ]
+
+    def trailing_document_ids(self, filing: IngestedFiling) -> List[str]:
+        """Chunks of an earlier ingest of the same filing beyond ``filing.chunk_count``.
+
+        Re-ingesting a filing overwrites chunks 0..chunk_count-1, so when it
+        is now split into fewer chunks (e.g. another chunk_tokens) the rest
+        would be left in the index.
+        """
+        with self._lock:
+            previous = self.filings.get(filing.filing_id)
+        if previous is None or previous.chunk_count <= filing.chunk_count:
+            return []
+        return previous.document_ids(start=filing.chunk_count)
+
+    def record(self, filing: IngestedFiling, replaces: List[IngestedFiling] = ()):
+        """Add a filing and drop the entries it replaces"""
+        with self._lock:
+            for entry in replaces:
+                self.filings.pop(entry.filing_id, None)
+            self.filings[filing.filing_id] = filing
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self.filings = {}
+            self._save()
+
+    def _save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'filings': [asdict(entry) for entry in self.filings.values()]}, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error writing ingest manifest: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,194 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from section_index import SectionIndex, item_bodies
+
+# Digit runs; every value pattern captures a number, so matches are looked for around these
+NUMBER = re.compile(r'\d[\d,.]*')
+
+SCALES = (('billion', 1_000_000_000), ('million', 1_000_000), ('thousand', 1_000))
+
+
+def locate_financial_region(text: str) -> Optional[Tuple[int, int]]:
+    """Character range covering Item 7 (MD&A) through the end of Item 8 (financial statements)"""
+    bodies = item_bodies(text)
+    sections = [bodies[item] for item in ('7', '7A', '8') if item in bodies]
+    if not sections:
+        return None
+    return min(start for start, _ in sections), max(end for _, end in sections)
+
+
+class MetricExtractionEngine:
+    """Financial metric extraction from precompiled, combined patterns.
+
+    All patterns are compiled once (build the engine at class level) into two
+    alternation regexes instead of being re-scanned one by one:
+
+    - ``search_patterns`` (filing year, employee count, ...) are scanned over
+      the full text, and the scan stops as soon as every field has a match
+      from its first-choice pattern.
+    - ``value_patterns`` (revenue, net income, ...) are scanned over the
+      Item 7/Item 8 region when it can be located (from the filing's
+      SectionIndex when one is passed in); fields not found there are looked
+      up in the rest of the text.
+
+    Value patterns start with optional words, which gives the regex engine
+    nothing to skip ahead on, so they are only tried near numbers: a match
+    must start at most ``lead_window`` characters before the first digit it
+    captures and end within ``tail_window`` characters after it.
+
+    For each field the first valid match of the earliest pattern in its list
+    wins, as with the previous pattern-by-pattern scans. Every alternative is
+    wrapped in a lookahead so matches of different fields may overlap, and
+    matches must start at the beginning of a word (so "1234 employees" no
+    longer yields 234).
+
+    A value pattern captures the number and, optionally, a scale word
+    ("million"). Patterns without a scale group can take the scale from the
+    text around the match via ``scale_window``.
+    """
+
+    def __init__(self, value_patterns: Dict[str, List[str]], search_patterns: Dict[str, List[str]],
+                 scale_window: int = 0, lead_window: int = 96, tail_window: int = 64,
+                 min_value: float = 1_000, max_value: float = 10_000_000_000_000):
+        self.scale_window = scale_window
+        self.lead_window = lead_window
+        self.tail_window = tail_window
+        self.min_value = min_value
+        self.max_value = max_value
+        self.value_patterns = value_patterns
+        self.search_patterns = search_patterns
+        self.value_fields = list(value_patterns)
+        self.search_fields = list(search_patterns)
+        self._value_regex, self._value_alternatives = self._compile(value_patterns)
+        self._search_regex, self._search_alternatives = self._compile(search_patterns)
+
+    @staticmethod
+    def _compile(patterns: Dict[str, List[str]]):
+        """Combine pattern lists into one regex; map each wrapper group to (field, priority, inner groups)"""
+        parts = []
+        alternatives: Dict[int, Tuple[str, int, List[int]]] = {}
+        group_number = 0
+        for field, field_patterns in patterns.items():
+            for priority, pattern in enumerate(field_patterns):
+                inner_groups = re.compile(pattern).groups
+                group_number += 1
+                alternatives[group_number] = (
+                    field, priority, list(range(group_number + 1, group_number + 1 + inner_groups))
+                )
+                group_number += inner_groups
+                parts.append(f"({pattern})")
+        if not parts:
+            return None, alternatives
+        # Anchoring at word starts lets most positions fail before any alternative is tried
+        return re.compile(r"\b(?=\w)(?=" + "|".join(parts) + ")", re.IGNORECASE), alternatives
+
+    def extract(self, text: str, sections: Optional[SectionIndex] = None,
+                skip_fields: Iterable[str] = ()) -> Dict[str, Any]:
+        """Return {field: value} for every field found in the text (value fields in ``skip_fields`` are not looked up)"""
+        results: Dict[str, Any] = self._scan_search_fields(text)
+
+        skip = set(skip_fields)
+        value_fields = [field for field in self.value_fields if field not in skip]
+        if not value_fields:
+            return results
+
+        region = sections.financial_region() if sections is not None else locate_financial_region(text)
+        if not region:
+            values = self._scan_value_fields(text, 0, len(text), value_fields)
+        else:
+            start, end = region
+            values = self._scan_value_fields(text, start, end, value_fields)
+            missing = [field for field in value_fields if field not in values]
+            if missing:
+                before = self._scan_value_fields(text, 0, start, missing)
+                after = self._scan_value_fields(text, end, len(text), missing)
+                for field in missing:
+                    # Earlier pattern wins; on a tie the match before the region comes first
+                    candidates = [c for c in (before.get(field), after.get(field)) if c is not None]
+                    if candidates:
+                        values[field] = min(candidates, key=lambda c: c[0])
+
+        results.update({field: value for field, (_, value) in values.items()})
+        return results
+
+    def _scan_search_fields(self, text: str) -> Dict[str, int]:
+        """First match per field in pattern order, stopping once every field has its first choice"""
+        if self._search_regex is None:
+            return {}
+
+        best: Dict[str, Tuple[int, int]] = {}  # field -> (priority, value)
+        for match in self._search_regex.finditer(text):
+            field, priority, groups = self._search_alternatives[match.lastindex]
+            if field in best and best[field][0] <= priority:
+                continue
+            try:
+                best[field] = (priority, int(match.group(groups[0]).replace(',', '')))
+            except (ValueError, TypeError, IndexError):
+                continue
+            if len(best) == len(self.search_fields) and all(p == 0 for p, _ in best.values()):
+                break
+
+        return {field: value for field, (_, value) in best.items()}
+
+    def _number_windows(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Merged ranges of text[start:end] that could hold a value match, in text order"""
+        window_start = window_end = None
+        for number in NUMBER.finditer(text, start, end):
+            lo = max(start, number.start() - self.lead_window)
+            hi = min(end, number.start() + self.tail_window)
+            if window_end is not None and lo <= window_end:
+                window_end = hi
+                continue
+            if window_end is not None:
+                yield window_start, window_end
+            window_start, window_end = lo, hi
+        if window_end is not None:
+            yield window_start, window_end
+
+    def _scan_value_fields(self, text: str, start: int, end: int, fields: List[str]) -> Dict[str, Tuple[int, float]]:
+        """First valid value per field in pattern order within text[start:end]"""
+        if self._value_regex is None or start >= end:
+            return {}
+
+        wanted = set(fields)
+        best: Dict[str, Tuple[int, float]] = {}
+        for window_start, window_end in self._number_windows(text, start, end):
+            for match in self._value_regex.finditer(text, window_start, window_end):
+                field, priority, groups = self._value_alternatives[match.lastindex]
+                if field not in wanted or (field in best and best[field][0] <= priority):
+                    continue
+
+                number_str = match.group(groups[0]) if groups else None
+                scale_str = match.group(groups[1]) if len(groups) > 1 else None
+                if scale_str is None and self.scale_window:
+                    position = match.start(groups[0])
+                    scale_str = text[max(0, position - self.scale_window):position + self.scale_window]
+
+                value = self._parse_value(number_str, scale_str)
+                if value is not None:
+                    best[field] = (priority, value)
+                    if len(best) == len(wanted) and all(p == 0 for p, _ in best.values()):
+                        return best
+
+        return best
+
+    def _parse_value(self, number_str: Optional[str], scale_str: Optional[str]) -> Optional[float]:
+        if not number_str:
+            return None
+        try:
+            value = float(re.sub(r'[^\d.]', '', number_str))
+        except ValueError:
+            return None
+
+        if scale_str:
+            scale_lower = scale_str.lower()
+            for word, multiplier in SCALES:
+                if word in scale_lower:
+                    value *= multiplier
+                    break
+
+        # Validation: reasonable business values
+        if self.min_value <= value <= self.max_value:
+            return value
+        return None
@@ -0,0 +1,213 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+
+@dataclass
+class PageText:
+    """Text extracted from a single PDF page"""
+    page_number: int  # 1-based page number in the source PDF
+    text: str
+    extraction_method: str  # PyPDF2, pdfplumber or none
+
+
+@lru_cache(maxsize=None)
+def _library_version(name: str) -> str:
+    """Installed version of a PDF library, from its package metadata (without importing it)"""
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "missing"
+
+
+# PyPDF2 and pdfplumber are imported where pages are read (mostly in worker processes), so the
+# tools and CLIs that import this module only pay for them once a PDF is actually extracted
+def _count_pages(pdf_path: str) -> int:
+    """Return the number of pages in a PDF"""
+    import PyPDF2
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def _extract_pypdf2_range(pdf_path: str, start: int, end: int) -> List[Tuple[int, Optional[str]]]:
+    """Extract pages [start, end) with PyPDF2 (0-based, runs in worker processes)"""
+    import PyPDF2
+    results = []
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page_index in range(start, end):
+            try:
+                results.append((page_index, pdf_reader.pages[page_index].extract_text() or ""))
+            except Exception:
+                results.append((page_index, None))
+    return results
+
+
+def _extract_pdfplumber_pages(pdf_path: str, page_indexes: List[int]) -> List[Tuple[int, Optional[str]]]:
+    """Extract selected pages with pdfplumber (0-based, runs in worker processes)"""
+    import pdfplumber
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_index in page_indexes:
+            try:
+                results.append((page_index, pdf.pages[page_index].extract_text() or ""))
+            except Exception:
+                results.append((page_index, None))
+    return results
+
+
+class PDFTextExtractor:
+    """Per-page PDF text extraction that fans pages out across a process pool.
+
+    Pages are extracted with PyPDF2 first. Only the pages PyPDF2 could not
+    read (errors or fewer than ``min_page_chars`` characters) are re-extracted
+    with pdfplumber, instead of re-walking the whole document.
+    """
+
+    # Bump when a change here alters the extracted text, so cached extractions are redone
+    EXTRACTION_VERSION = 1
+
+    def __init__(self, workers: Optional[int] = None, min_page_chars: int = 20,
+                 min_pages_per_task: int = 8):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.min_page_chars = min_page_chars
+        self.min_pages_per_task = min_pages_per_task
+
+    @property
+    def cache_tag(self) -> str:
+        """Everything that changes the extracted text, part of the extraction cache key.
+
+        Worker count and task size are left out: serial and pooled extraction
+        produce the same pages, so they share cache entries.
+        """
+        return (f"{type(self).__name__}-v{self.EXTRACTION_VERSION}"
+                f"-PyPDF2-{_library_version('PyPDF2')}-pdfplumber-{_library_version('pdfplumber')}"
+                f"-min{self.min_page_chars}")
+
+    def extract_pages(self, pdf_path: str) -> List[PageText]:
+        """Extract every page of the PDF, returned in page order"""
+        return list(self.iter_pages(pdf_path))
+
+    def iter_pages(self, pdf_path: str) -> Iterator[PageText]:
+        """Yield pages in page order as soon as each page range (and its fallback) is done.
+
+        All ranges are submitted up front, so later pages keep extracting in
+        the pool while the caller works on the pages already yielded.
+        """
+        try:
+            page_count = _count_pages(pdf_path)
+        except Exception as e:
+            print(f"PyPDF2 extraction failed: {e}")
+            page_count = 0
+
+        if page_count == 0:
+            # PyPDF2 could not open the file at all, let pdfplumber try every page
+            yield from self._extract_all_with_pdfplumber(pdf_path)
+            return
+
+        ranges = self._split_ranges(page_count)
+        if self.workers <= 1 or len(ranges) <= 1:
+            for start, end in ranges:
+                results = _extract_pypdf2_range(pdf_path, start, end)
+                fallback = []
+                retry_pages = self._retry_pages(results)
+                if retry_pages:
+                    try:
+                        fallback = _extract_pdfplumber_pages(pdf_path, retry_pages)
+                    except Exception as e:
+                        print(f"pdfplumber extraction failed: {e}")
+                yield from self._merge_fallback(results, fallback)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as executor:
+            range_futures = {
+                executor.submit(_extract_pypdf2_range, pdf_path, start, end): index
+                for index, (start, end) in enumerate(ranges)
+            }
+            finished = {}  # range index -> (PyPDF2 results, pdfplumber future or None)
+            next_index = 0
+            for future in as_completed(range_futures):
+                results = future.result()
+                # Per-page fallback: only re-extract pages PyPDF2 got wrong, as soon as the range is in
+                retry_pages = self._retry_pages(results)
+                fallback = executor.submit(_extract_pdfplumber_pages, pdf_path, retry_pages) if retry_pages else None
+                finished[range_futures[future]] = (results, fallback)
+
+                while next_index in finished:
+                    results, fallback = finished.pop(next_index)
+                    try:
+                        fallback_results = fallback.result() if fallback else []
+                    except Exception as e:
+                        print(f"pdfplumber extraction failed: {e}")
+                        fallback_results = []
+                    yield from self._merge_fallback(results, fallback_results)
+                    next_index += 1
+
+    def _retry_pages(self, results: List[Tuple[int, Optional[str]]]) -> List[int]:
+        return [i for i, t in results if t is None or len(t.strip()) < self.min_page_chars]
+
+    @staticmethod
+    def _merge_fallback(results: List[Tuple[int, Optional[str]]],
+                        fallback: List[Tuple[int, Optional[str]]]) -> Iterator[PageText]:
+        """PageText objects for one range, preferring pdfplumber text where it found more"""
+        fallback_texts = dict(fallback)
+        for page_index, text in results:
+            method = "PyPDF2"
+            fallback_text = fallback_texts.get(page_index)
+            if fallback_text and len(fallback_text.strip()) > len((text or "").strip()):
+                text, method = fallback_text, "pdfplumber"
+            yield PageText(page_number=page_index + 1,
+                           text=text or "",
+                           extraction_method=method if text else "none")
+
+    def _extract_all_with_pdfplumber(self, pdf_path: str) -> List[PageText]:
+        """Whole-document pdfplumber extraction when PyPDF2 cannot open the file"""
+        import pdfplumber
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                page_count = len(pdf.pages)
+        except Exception as e:
+            print(f"pdfplumber extraction failed: {e}")
+            return []
+
+        texts: List[Optional[str]] = [None] * page_count
+        groups = self._split_list(list(range(page_count)))
+        for page_index, page_text in self._run(_extract_pdfplumber_pages,
+                                                [(pdf_path, group) for group in groups]):
+            texts[page_index] = page_text
+
+        return [
+            PageText(page_number=i + 1,
+                     text=texts[i] or "",
+                     extraction_method="pdfplumber" if texts[i] else "none")
+            for i in range(page_count)
+        ]
+
+    def _split_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        """Split pages into contiguous ranges, a few per worker for load balancing"""
+        per_task = max(self.min_pages_per_task, -(-page_count // (max(self.workers, 1) * 4)))
+        return [(start, min(start + per_task, page_count)) for start in range(0, page_count, per_task)]
+
+    def _split_list(self, page_indexes: List[int]) -> List[List[int]]:
+        per_task = max(self.min_pages_per_task, -(-len(page_indexes) // (max(self.workers, 1) * 4)))
+        return [page_indexes[i:i + per_task] for i in range(0, len(page_indexes), per_task)]
+
+    def _run(self, func, task_args: List[tuple]) -> Iterator[Tuple[int, Optional[str]]]:
+        """Run extraction tasks serially or in a process pool, yielding (page_index, text)"""
+        if self.workers <= 1 or len(task_args) <= 1:
+            for args in task_args:
+                yield from func(*args)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(task_args))) as executor:
+            futures = [executor.submit(func, *args) for args in task_args]
+            for future in futures:
+                yield from future.result()
+
+
+def join_pages(pages: List[PageText]) -> str:
+    """Merge page texts in page order, one newline after each non-empty page"""
+    return "".join(page.text + "\n" for page in pages if page.text)
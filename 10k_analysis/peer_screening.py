@@ -0,0 +1,231 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from company_index import centroid_field
+
+# Numeric screening features: name -> (company record field, log10 scaled)
+FEATURES = {
+    'size': ('revenue', True),
+    'headcount': ('employees', True),
+    'growth': ('revenue_growth', False),
+    'gross_margin': ('gross_margin', False),
+    'operating_margin': ('operating_margin', False),
+    'net_margin': ('net_margin', False),
+}
+
+# Embedding features: name -> section whose per-filing centroid is compared (cosine distance)
+CENTROID_FEATURES = {
+    'business': 'business_overview',
+    'risks': 'risk_factors',
+}
+
+DEFAULT_WEIGHTS = {
+    'size': 2.0,
+    'headcount': 0.5,
+    'growth': 1.0,
+    'gross_margin': 1.0,
+    'operating_margin': 1.0,
+    'net_margin': 0.5,
+    'business': 2.0,
+    'risks': 1.0,
+}
+
+# z-scores are clipped so a single extreme ratio cannot dominate a distance
+Z_CLIP = 4.0
+
+
+@dataclass
+class PeerMatch:
+    """One ranked peer: weighted distance to the reference and how each feature contributed to it"""
+    company_key: str
+    ticker: str
+    company_name: str
+    distance: float
+    contributions: Dict[str, float] = field(default_factory=dict)  # feature -> weighted squared difference
+    record: Dict[str, Any] = field(default_factory=dict)
+
+    def main_differences(self, count: int = 2) -> List[str]:
+        """Features that add the most to the distance, largest first"""
+        ranked = sorted(self.contributions.items(), key=lambda item: item[1], reverse=True)
+        return [name for name, value in ranked[:count] if value > 0]
+
+
+class PeerScreener:
+    """Vectorized comparable-company screening over every company at once.
+
+    Company records (one per company, e.g. the latest filing of each ticker
+    from the company index) are loaded into a dense float64 matrix with one
+    column per feature in FEATURES: size and headcount on a log10 scale,
+    growth and margins as-is. Each column is z-scored, ignoring missing
+    values, and clipped to +-Z_CLIP.
+
+    Screening a reference company computes the weighted squared z-score
+    differences against all rows in one NumPy pass. Per-company embedding
+    centroids (``centroids``: feature -> {company_key: vector}, see
+    CENTROID_FEATURES) add one feature each: the squared Euclidean distance
+    between unit vectors (2 * cosine distance), i.e. an exact kNN over the
+    centroid matrix as part of the same pass.
+
+    Features missing for either company are left out. The remaining sum is
+    scaled up by total weight / available weight, so companies with sparse
+    metrics are not ranked closer than they really are.
+    """
+
+    def __init__(self, records: Sequence[Mapping[str, Any]], weights: Optional[Dict[str, float]] = None,
+                 centroids: Optional[Mapping[str, Mapping[str, Sequence[float]]]] = None):
+        self.records = [dict(record) for record in records]
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.feature_names = list(FEATURES)
+
+        self.keys = [record.get('company_key') or record.get('ticker') for record in self.records]
+        self.tickers = [record.get('ticker') for record in self.records]
+        self._ticker_codes, self._ticker_ids = self._encode(self.tickers)
+        self._positions = {}
+        for row, (key, ticker) in enumerate(zip(self.keys, self.tickers)):
+            self._positions.setdefault(key, row)
+            self._positions.setdefault(ticker, row)
+        self.sectors = [record.get('sector') for record in self.records]
+        self._sector_codes, _ = self._encode(self.sectors)
+
+        self.raw = np.column_stack([
+            self._column(record_field, log_scale) for record_field, log_scale in FEATURES.values()
+        ]) if self.records else np.empty((0, len(FEATURES)))
+        self.z = self._zscore(self.raw)
+        self.feature_weights = np.array([self.weights.get(name, 0.0) for name in self.feature_names])
+
+        # feature -> (unit vectors, one row per company, and which rows have one)
+        self.centroids: Dict[str, tuple] = {}
+        for name, vectors in (centroids or {}).items():
+            if vectors:
+                self.centroids[name] = self._centroid_matrix(vectors)
+
+    @classmethod
+    def from_company_records(cls, records: Sequence[Mapping[str, Any]],
+                             weights: Optional[Dict[str, float]] = None) -> "PeerScreener":
+        """Screener over company index records, taking centroids from their "<section>_vector" fields"""
+        records = [dict(record) for record in records]
+        centroids = {name: {} for name in CENTROID_FEATURES}
+        for record in records:
+            for name, section in CENTROID_FEATURES.items():
+                vector = record.pop(centroid_field(section), None)
+                if vector:
+                    centroids[name][record.get('company_key') or record.get('ticker')] = vector
+        return cls(records, weights=weights, centroids=centroids)
+
+    @staticmethod
+    def _encode(values: List[Any]):
+        """Integer code per row (so filters compare ints, not Python objects) and the value -> code map"""
+        ids: Dict[Any, int] = {}
+        codes = np.fromiter((ids.setdefault(value, len(ids)) for value in values), dtype=np.int64, count=len(values))
+        return codes, ids
+
+    def _column(self, record_field: str, log_scale: bool) -> np.ndarray:
+        values = np.array([
+            value if isinstance(value, (int, float)) else np.nan
+            for value in (record.get(record_field) for record in self.records)
+        ], dtype=np.float64)
+        if log_scale:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values = np.where(values > 0, np.log10(values), np.nan)
+        return values
+
+    @staticmethod
+    def _zscore(matrix: np.ndarray) -> np.ndarray:
+        if matrix.shape[0] == 0:
+            return matrix
+        present = ~np.isnan(matrix)
+        counts = present.sum(axis=0)
+        filled = np.where(present, matrix, 0.0)
+        means = filled.sum(axis=0) / np.maximum(counts, 1)
+        variances = (np.where(present, matrix - means, 0.0) ** 2).sum(axis=0) / np.maximum(counts, 1)
+        stds = np.sqrt(variances)
+        stds[stds == 0] = 1.0
+        return np.clip((matrix - means) / stds, -Z_CLIP, Z_CLIP)
+
+    def _centroid_matrix(self, vectors: Mapping[str, Sequence[float]]):
+        dimensions = len(next(iter(vectors.values())))
+        matrix = np.zeros((len(self.records), dimensions), dtype=np.float32)
+        present = np.zeros(len(self.records), dtype=bool)
+        for row, key in enumerate(self.keys):
+            vector = vectors.get(key)
+            if vector is None or len(vector) != dimensions:
+                continue
+            vector = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            if norm > 0:
+                matrix[row] = vector / norm
+                present[row] = True
+        return matrix, present
+
+    def index_of(self, company: str) -> Optional[int]:
+        """Row of a company by company_key or ticker"""
+        return self._positions.get(company)
+
+    def distances(self, row: int) -> Dict[str, np.ndarray]:
+        """Weighted squared difference per feature between one row and every row (NaN when not comparable)"""
+        contributions = {}
+        with np.errstate(invalid='ignore'):
+            squared = (self.z - self.z[row]) ** 2 * self.feature_weights
+        for column, name in enumerate(self.feature_names):
+            contributions[name] = squared[:, column]
+
+        for name, (matrix, present) in self.centroids.items():
+            weight = self.weights.get(name, 0.0)
+            if weight <= 0:
+                continue
+            if present[row]:
+                similarity = matrix @ matrix[row]
+                distance = np.where(present, 2.0 * (1.0 - similarity) * weight, np.nan)
+            else:
+                distance = np.full(len(self.records), np.nan)
+            contributions[name] = distance.astype(np.float64)
+        return contributions
+
+    def screen(self, reference: str, top: int = 10, same_sector: bool = True,
+               exclude_tickers: Sequence[str] = ()) -> List[PeerMatch]:
+        """Closest companies to ``reference`` (company_key or ticker), nearest first"""
+        row = self.index_of(reference)
+        if row is None:
+            return []
+
+        contributions = self.distances(row)
+        names = list(contributions)
+        stacked = np.column_stack([contributions[name] for name in names])
+        weights = np.array([self.weights.get(name, 0.0) for name in names])
+
+        available = ~np.isnan(stacked)
+        available_weight = (available * weights).sum(axis=1)
+        total = np.where(available, stacked, 0.0).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            distance = np.sqrt(total * weights.sum() / available_weight)
+
+        candidates = available_weight > 0
+        candidates[row] = False
+        for ticker in set(exclude_tickers) | {self.tickers[row]}:
+            if ticker in self._ticker_ids:
+                candidates &= self._ticker_codes != self._ticker_ids[ticker]
+        if same_sector and self.sectors[row] is not None:
+            candidates &= self._sector_codes == self._sector_codes[row]
+
+        indexes = np.flatnonzero(candidates)
+        if len(indexes) > top:
+            indexes = indexes[np.argpartition(distance[indexes], top)[:top]]
+        indexes = indexes[np.argsort(distance[indexes], kind='stable')]
+
+        return [
+            PeerMatch(
+                company_key=self.keys[i],
+                ticker=self.tickers[i],
+                company_name=self.records[i].get('company_name'),
+                distance=float(distance[i]),
+                contributions={
+                    name: float(stacked[i, column])
+                    for column, name in enumerate(names) if not math.isnan(stacked[i, column])
+                },
+                record=self.records[i]
+            )
+            for i in indexes
+        ]
@@ -0,0 +1,236 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+# Pipeline stages in processing order (used to order reports)
+STAGES = ('extract', 'chunk', 'analyze', 'embed', 'upload')
+
+
+@dataclass
+class StageMetrics:
+    """Time spent in one stage of one filing and what it processed"""
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0  # CPU time of the thread (or extraction worker process) running the stage
+    calls: int = 0
+    counters: Dict[str, int] = field(default_factory=dict)  # pages, bytes, chunks, tokens, api_calls, retries...
+
+    def to_dict(self) -> Dict:
+        return {
+            'wall_seconds': round(self.wall_seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'calls': self.calls,
+            **self.counters
+        }
+
+
+class _StageTimer:
+    """Context manager adding its wall and thread CPU time to a stage of a FilingTrace"""
+
+    __slots__ = ('trace', 'name', 'wall_start', 'cpu_start')
+
+    def __init__(self, trace: "FilingTrace", name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.trace.add(self.name, time.perf_counter() - self.wall_start, time.thread_time() - self.cpu_start)
+        return False
+
+
+class FilingTrace:
+    """Stage timings and counters for one filing.
+
+    Stages may run on several threads at once (e.g. embedding overlaps
+    extraction), so wall times are per-stage busy time and can add up to more
+    than the filing's total wall time.
+    """
+
+    enabled = True
+
+    def __init__(self, source: str):
+        self.source = source
+        self.started_at = datetime.utcnow().isoformat() + "Z"
+        self._start = time.perf_counter()
+        self.wall_seconds: Optional[float] = None
+        self.status: Optional[str] = None
+        self.error: Optional[str] = None
+        self.fields: Dict[str, object] = {}  # filing_id, company_key, ...
+        self.stages: Dict[str, StageMetrics] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> _StageTimer:
+        """Time a block of work as part of stage ``name``"""
+        return _StageTimer(self, name)
+
+    def add(self, name: str, wall_seconds: float, cpu_seconds: float = 0.0, **counters: int):
+        """Add time (and counters) measured elsewhere, e.g. in a worker process"""
+        with self._lock:
+            stage = self.stages.setdefault(name, StageMetrics())
+            stage.wall_seconds += wall_seconds
+            stage.cpu_seconds += cpu_seconds
+            stage.calls += 1
+            for counter, value in counters.items():
+                stage.counters[counter] = stage.counters.get(counter, 0) + value
+
+    def count(self, name: str, **counters: int):
+        """Add to the counters of stage ``name`` without timing anything"""
+        with self._lock:
+            stage = self.stages.setdefault(name, StageMetrics())
+            for counter, value in counters.items():
+                stage.counters[counter] = stage.counters.get(counter, 0) + value
+
+    def annotate(self, **fields):
+        self.fields.update(fields)
+
+    def finish(self, status: str, error: Optional[str] = None):
+        self.wall_seconds = time.perf_counter() - self._start
+        self.status = status
+        self.error = error
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.stages.items(), key=lambda item: STAGES.index(item[0]) if item[0] in STAGES else len(STAGES))
+        record = {
+            'source': self.source,
+            'started_at': self.started_at,
+            'status': self.status,
+            'wall_seconds': round(self.wall_seconds or 0.0, 6),
+            **self.fields,
+            'stages': {name: stage.to_dict() for name, stage in ordered}
+        }
+        if self.error:
+            record['error'] = self.error
+        return record
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _NullTrace:
+    """Stand-in used when instrumentation is disabled: every call is a no-op"""
+
+    enabled = False
+    _timer = _NullTimer()
+
+    def stage(self, name: str) -> _NullTimer:
+        return self._timer
+
+    def add(self, name: str, wall_seconds: float, cpu_seconds: float = 0.0, **counters: int):
+        pass
+
+    def count(self, name: str, **counters: int):
+        pass
+
+    def annotate(self, **fields):
+        pass
+
+    def finish(self, status: str, error: Optional[str] = None):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class PipelineMetrics:
+    """Collects one FilingTrace per ingested filing.
+
+    Finished traces are appended as one JSON line each to ``records_path``
+    (when set) and summed into per-stage totals, which ``prometheus_text``
+    renders in the Prometheus text exposition format for batch runs. When
+    disabled, ``start_filing`` returns NULL_TRACE and nothing is recorded.
+    """
+
+    def __init__(self, enabled: bool = True, records_path: Optional[str] = None, prefix: str = "tenk_ingest"):
+        self.enabled = enabled
+        self.records_path = records_path
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.filings: Dict[str, int] = defaultdict(int)  # status -> filings
+        self.filing_seconds = 0.0
+        self.stage_totals: Dict[str, StageMetrics] = {}
+
+    def start_filing(self, source: str):
+        return FilingTrace(source) if self.enabled else NULL_TRACE
+
+    def finish_filing(self, trace, status: str, error: Optional[str] = None):
+        """Close a trace ("ok", "failed" or "skipped"), write its JSON record and add it to the totals"""
+        if not trace.enabled:
+            return
+        trace.finish(status, error)
+        record = trace.to_dict()
+
+        with self._lock:
+            self.filings[status] += 1
+            self.filing_seconds += trace.wall_seconds
+            for name, stage in trace.stages.items():
+                total = self.stage_totals.setdefault(name, StageMetrics())
+                total.wall_seconds += stage.wall_seconds
+                total.cpu_seconds += stage.cpu_seconds
+                total.calls += stage.calls
+                for counter, value in stage.counters.items():
+                    total.counters[counter] = total.counters.get(counter, 0) + value
+
+            if self.records_path:
+                try:
+                    with open(self.records_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(record, default=str) + "\n")
+                except OSError as e:
+                    print(f"Error writing pipeline metrics record: {e}")
+
+    def prometheus_text(self) -> str:
+        """Totals so far in the Prometheus text exposition format"""
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_filings_total Filings processed, by outcome.",
+            f"# TYPE {p}_filings_total counter",
+        ]
+        with self._lock:
+            for status, count in sorted(self.filings.items()):
+                lines.append(f'{p}_filings_total{{status="{status}"}} {count}')
+            lines += [
+                f"# HELP {p}_filing_seconds_total Wall time spent on filings.",
+                f"# TYPE {p}_filing_seconds_total counter",
+                f"{p}_filing_seconds_total {self.filing_seconds:.6f}",
+            ]
+
+            stages = sorted(self.stage_totals.items(),
+                            key=lambda item: STAGES.index(item[0]) if item[0] in STAGES else len(STAGES))
+            for metric, help_text, value in (
+                ('stage_wall_seconds_total', 'Wall (busy) time per pipeline stage.', lambda s: f"{s.wall_seconds:.6f}"),
+                ('stage_cpu_seconds_total', 'CPU time per pipeline stage.', lambda s: f"{s.cpu_seconds:.6f}"),
+                ('stage_calls_total', 'Timed sections per pipeline stage.', lambda s: str(s.calls)),
+            ):
+                lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} counter"]
+                lines += [f'{p}_{metric}{{stage="{name}"}} {value(stage)}' for name, stage in stages]
+
+            lines += [
+                f"# HELP {p}_stage_units_total Units processed per pipeline stage (pages, bytes, chunks, tokens, API calls, retries...).",
+                f"# TYPE {p}_stage_units_total counter",
+            ]
+            for name, stage in stages:
+                for unit, value in sorted(stage.counters.items()):
+                    lines.append(f'{p}_stage_units_total{{stage="{name}",unit="{unit}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write prometheus_text() atomically (e.g. for the node exporter textfile collector)"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
@@ -1,27 +1,41 @@
 import os
-import sys
+import argparse
 from dotenv import load_dotenv
 from Generic10KIngestionTool import Generic10KIngestionTool
 
 load_dotenv()
 
 def main():
+    parser = argparse.ArgumentParser(description="Ingest a single 10-K PDF")
+    parser.add_argument("pdf_file", help="Path to the 10-K PDF")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-extract the PDF instead of using the extraction cache")
+    parser.add_argument("--local-search", action="store_true",
+                        help="Use the in-process local search index instead of Azure Search")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip PDFs that are already indexed unchanged (per the ingest manifest)")
+    parser.add_argument("--statement-tables", action="store_true",
+                        help="Read income statement and balance sheet values from the PDF's tables")
+    parser.add_argument("--metrics-jsonl", default=None,
+                        help="Append a JSON record of per-stage timings and counters to this file")
+    args = parser.parse_args()
+    
     config = {
         "azure_search_endpoint": os.getenv("AZURE_SEARCH_ENDPOINT"),
         "azure_search_key": os.getenv("AZURE_SEARCH_KEY"),
         "azure_openai_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
-        "azure_openai_key": os.getenv("AZURE_OPENAI_KEY")
+        "azure_openai_key": os.getenv("AZURE_OPENAI_KEY"),
+        "use_extraction_cache": not args.no_cache,
+        "search_backend": "local" if args.local_search else "azure",
+        "pipeline_metrics_path": args.metrics_jsonl,
+        "statement_tables": args.statement_tables
     }
     
     tool = Generic10KIngestionTool(**config)
     
-    if len(sys.argv) > 1:
-        pdf_file = sys.argv[1]
-        print(f"Ingesting {pdf_file}...")
-        success = tool.ingest_10k_pdf(pdf_file)
-        print(f"Result: {'Success' if success else 'Failed'}")
-    else:
-        print("Usage: python quick_ingest.py <pdf_filename>")
+    print(f"Ingesting {args.pdf_file}...")
+    success = tool.ingest_10k_pdf(args.pdf_file, incremental=args.incremental)
+    print(f"Result: {'Success' if success else 'Failed'}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,29 +1,46 @@
 import os
+import argparse
 from dotenv import load_dotenv
 from Generic10KIngestionTool import Generic10KIngestionTool
 
 load_dotenv()
 
 def main():
+    parser = argparse.ArgumentParser(description="Ingest 10-K PDFs and find comparable companies")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-extract PDFs instead of using the extraction cache")
+    parser.add_argument("--local-search", action="store_true",
+                        help="Use the in-process local search index instead of Azure Search")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip PDFs that are already indexed unchanged (per the ingest manifest)")
+    parser.add_argument("--recreate-index", action="store_true",
+                        help="Delete and recreate the search indexes instead of adding to them")
+    parser.add_argument("--statement-tables", action="store_true",
+                        help="Read income statement and balance sheet values from the PDF's tables")
+    args = parser.parse_args()
+    
     config = {
         "azure_search_endpoint": os.getenv("AZURE_SEARCH_ENDPOINT"),
         "azure_search_key": os.getenv("AZURE_SEARCH_KEY"),
         "azure_openai_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
-        "azure_openai_key": os.getenv("AZURE_OPENAI_KEY")
+        "azure_openai_key": os.getenv("AZURE_OPENAI_KEY"),
+        "use_extraction_cache": not args.no_cache,
+        "search_backend": "local" if args.local_search else "azure",
+        "statement_tables": args.statement_tables
     }
     
     tool = Generic10KIngestionTool(**config)
     
     # Create index
     print("Creating search index...")
-    tool.create_search_index()
+    tool.create_search_index(recreate=args.recreate_index)
     
     # Ingest files
     pdf_files = ["10K_SEC_GOOGLE.pdf"]  # Add more as you get them
     
     for pdf_file in pdf_files:
         if os.path.exists(pdf_file):
-            success = tool.ingest_10k_pdf(pdf_file)
+            success = tool.ingest_10k_pdf(pdf_file, incremental=args.incremental)
             print(f"{'✓' if success else '✗'} {pdf_file}")
     
     # Find comparable companies
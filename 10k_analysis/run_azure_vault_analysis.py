@@ -1,6 +1,8 @@
 import os
+import argparse
 from dotenv import load_dotenv
 from AzureVault10KIngestionTool import AzureVault10KIngestionTool, FinancialAnalysisReports
+from secret_providers import CACHE_KEY_ENV, EnvSecretProvider
 
 # Load environment variables
 load_dotenv()
@@ -8,6 +10,21 @@ load_dotenv()
 def main():
     """Main execution function with Azure Key Vault authentication"""
     
+    parser = argparse.ArgumentParser(description="Ingest 10-K PDFs using Azure Key Vault credentials")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-extract PDFs instead of using the extraction cache")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip PDFs that are already indexed unchanged (per the ingest manifest)")
+    parser.add_argument("--recreate-index", action="store_true",
+                        help="Delete and recreate the search indexes instead of adding to them")
+    parser.add_argument("--statement-tables", action="store_true",
+                        help="Read income statement and balance sheet values from the PDF's tables")
+    parser.add_argument("--env-secrets", action="store_true",
+                        help="Read the OpenAI and search secrets from environment variables instead of Key Vault (local runs)")
+    parser.add_argument("--secret-cache", default=None,
+                        help=f"Encrypted file caching Key Vault secrets between runs (key in {CACHE_KEY_ENV})")
+    args = parser.parse_args()
+    
     # Configuration using Azure Key Vault
     config = {
         "tenant_id": os.getenv("AZURE_TENANT_ID"),
@@ -18,7 +35,8 @@ def main():
     }
     
     # Validate configuration
-    missing_configs = [k for k, v in config.items() if not v]
+    required = ["azure_search_endpoint"] if args.env_secrets else list(config)
+    missing_configs = [k for k in required if not config[k]]
     if missing_configs:
         print(f"Missing required environment variables: {missing_configs}")
         print("Please set the following in your .env file:")
@@ -32,11 +50,14 @@ def main():
     try:
         # Initialize tool with Key Vault authentication
         print("Initializing Azure services with Key Vault authentication...")
-        tool = AzureVault10KIngestionTool(**config)
+        tool = AzureVault10KIngestionTool(**config, use_extraction_cache=not args.no_cache,
+                                          statement_tables=args.statement_tables,
+                                          secret_provider=EnvSecretProvider() if args.env_secrets else None,
+                                          secret_cache_path=args.secret_cache)
         
         # Create enhanced search index
         print("Creating enhanced search index...")
-        tool.create_enhanced_search_index()
+        tool.create_enhanced_search_index(recreate=args.recreate_index)
         
         # Process 10-K PDFs
         pdf_files = [
@@ -49,7 +70,7 @@ def main():
         for pdf_file in pdf_files:
             if os.path.exists(pdf_file):
                 print(f"\nProcessing {pdf_file}...")
-                success = tool.ingest_10k_pdf(pdf_file)
+                success = tool.ingest_10k_pdf(pdf_file, incremental=args.incremental)
                 if success:
                     print(f"✓ Successfully ingested {pdf_file}")
                 else:
@@ -0,0 +1,788 @@
+import json
+import math
+import os
+import re
+import shutil
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NUMERIC_TYPES = {'Edm.Int32', 'Edm.Int64', 'Edm.Double', 'Edm.Single'}
+INTEGER_TYPES = {'Edm.Int32', 'Edm.Int64'}
+VECTOR_TYPE = 'Collection(Edm.Single)'
+
+# Azure Search's BM25 defaults and reciprocal rank fusion constant for hybrid queries
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+
+# The local index keeps a snapshot (documents.json and one <field>.npy per vector field) and appends every
+# later write to log.jsonl (its vectors to <field>.f32), so a write costs O(batch) rather than a rewrite of
+# the whole index. The log is folded into a new snapshot once it holds as many documents as the snapshot
+# (and at least this many), which keeps ingestion linear overall, and on flush() / close().
+COMPACT_MIN_LOGGED = 10_000
+LOG_FILE = 'log.jsonl'
+
+_WORD = re.compile(r'\w+')
+_QUERY_TERM = re.compile(r'(\w+):("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+_FILTER_TOKEN = re.compile(r"\s*(?:('(?:[^']|'')*')|(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)|(\()|(\))|(,)|([A-Za-z_][\w./]*))")
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _type_name(field_type) -> str:
+    return str(getattr(field_type, 'value', field_type))
+
+
+@dataclass
+class LocalIndexingResult:
+    """Per-document outcome of a write, shaped like the SDK's IndexingResult"""
+    key: str
+    succeeded: bool
+    status_code: int
+    error_message: Optional[str] = None
+
+
+class _FilterParser:
+    """Recursive-descent evaluator for the OData filter subset the tools use.
+
+    Supports ``eq ne gt ge lt le`` against string/number/boolean/null
+    literals, ``and``/``or``/``not``, parentheses and
+    ``search.in(field, 'a,b', ',')``. Each comparison evaluates to a boolean
+    mask over all rows at once.
+    """
+
+    def __init__(self, expression: str, column: Callable[[str], np.ndarray], rows: int):
+        self.tokens = self._tokenize(expression)
+        self.position = 0
+        self.column = column
+        self.rows = rows
+
+    @staticmethod
+    def _tokenize(expression: str) -> List[Tuple[str, Any]]:
+        tokens = []
+        position = 0
+        expression = expression.strip()
+        while position < len(expression):
+            match = _FILTER_TOKEN.match(expression, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Invalid filter near: {expression[position:position + 20]!r}")
+            string, number, lparen, rparen, comma, name = match.groups()
+            if string is not None:
+                tokens.append(('literal', string[1:-1].replace("''", "'")))
+            elif number is not None:
+                tokens.append(('literal', float(number)))
+            elif lparen:
+                tokens.append(('(', None))
+            elif rparen:
+                tokens.append((')', None))
+            elif comma:
+                tokens.append((',', None))
+            else:
+                keyword = name.lower()
+                if keyword in ('null', 'true', 'false'):
+                    tokens.append(('literal', {'null': None, 'true': True, 'false': False}[keyword]))
+                elif keyword in ('and', 'or', 'not', 'eq', 'ne', 'gt', 'ge', 'lt', 'le', 'search.in'):
+                    tokens.append((keyword, None))
+                else:
+                    tokens.append(('name', name))
+            position = match.end()
+        return tokens
+
+    def parse(self) -> np.ndarray:
+        mask = self._or()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected token in filter: {self.tokens[self.position]}")
+        return mask
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def _take(self, kind: str):
+        if self._peek() != kind:
+            raise ValueError(f"Expected {kind} in filter, got {self._peek()}")
+        value = self.tokens[self.position][1]
+        self.position += 1
+        return value
+
+    def _or(self) -> np.ndarray:
+        mask = self._and()
+        while self._peek() == 'or':
+            self.position += 1
+            mask = mask | self._and()
+        return mask
+
+    def _and(self) -> np.ndarray:
+        mask = self._unary()
+        while self._peek() == 'and':
+            self.position += 1
+            mask = mask & self._unary()
+        return mask
+
+    def _unary(self) -> np.ndarray:
+        if self._peek() == 'not':
+            self.position += 1
+            return ~self._unary()
+        if self._peek() == '(':
+            self.position += 1
+            mask = self._or()
+            self._take(')')
+            return mask
+        if self._peek() == 'search.in':
+            return self._search_in()
+        if self._peek() == 'literal':
+            value = self._take('literal')
+            return np.full(self.rows, bool(value))
+        return self._comparison()
+
+    def _search_in(self) -> np.ndarray:
+        self._take('search.in')
+        self._take('(')
+        field = self._take('name')
+        self._take(',')
+        values = self._take('literal')
+        separators = ' ,'
+        if self._peek() == ',':
+            self.position += 1
+            separators = self._take('literal')
+        self._take(')')
+        wanted = {v for v in re.split('[' + re.escape(separators) + ']', values) if v}
+        column = self.column(field)
+        return np.fromiter((value in wanted for value in column), dtype=bool, count=len(column))
+
+    def _comparison(self) -> np.ndarray:
+        field = self._take('name')
+        operator = self._peek()
+        if operator not in ('eq', 'ne', 'gt', 'ge', 'lt', 'le'):
+            raise ValueError(f"Expected comparison operator after {field}, got {operator}")
+        self.position += 1
+        value = self._take('literal')
+        column = self.column(field)
+
+        if value is None:
+            missing = np.isnan(column) if column.dtype.kind == 'f' else np.array([v is None for v in column], dtype=bool)
+            if operator == 'eq':
+                return missing
+            if operator == 'ne':
+                return ~missing
+            raise ValueError(f"null can only be compared with eq/ne ({field})")
+
+        if column.dtype.kind == 'f':
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise ValueError(f"Field {field} is numeric, got {value!r}")
+            with np.errstate(invalid='ignore'):
+                return {
+                    'eq': lambda: column == value,
+                    'ne': lambda: ~(column == value),
+                    'gt': lambda: column > value,
+                    'ge': lambda: column >= value,
+                    'lt': lambda: column < value,
+                    'le': lambda: column <= value,
+                }[operator]()
+
+        compare = {
+            'eq': lambda a: a == value,
+            'ne': lambda a: a != value,
+            'gt': lambda a: a is not None and a > value,
+            'ge': lambda a: a is not None and a >= value,
+            'lt': lambda a: a is not None and a < value,
+            'le': lambda a: a is not None and a <= value,
+        }[operator]
+        return np.fromiter((compare(v) for v in column), dtype=bool, count=len(column))
+
+
+class LocalSearchClient:
+    """In-process stand-in for ``azure.search.documents.SearchClient``.
+
+    Documents live in a columnar store: one Python list per field, plus
+    lazily built NumPy arrays (float64 for numeric fields, float32 matrices
+    for vector fields) that filters, sorting and vector search run on, built
+    on the first query after a write. Each write is appended to a log under
+    ``<directory>/`` before it returns (see COMPACT_MIN_LOGGED); deleted rows
+    are dropped from the columns on the next query.
+
+    Supported: ``upload_documents``, ``merge_documents``,
+    ``merge_or_upload_documents``, ``delete_documents``, ``get_document``,
+    ``get_document_count`` and ``search`` with ``search_text`` (BM25 over
+    searchable fields, ``field:term`` and quoted terms), ``filter`` (see
+    _FilterParser), ``vector_queries`` (exact cosine kNN, pre-filtered),
+    ``select``, ``order_by``, ``top`` and ``skip``. Text plus vector queries
+    are combined with reciprocal rank fusion, as Azure does for hybrid search.
+    """
+
+    def __init__(self, directory: str, index_name: str):
+        self.directory = directory
+        self.index_name = index_name
+        self._lock = threading.RLock()
+        self._reset()
+        if os.path.exists(os.path.join(directory, 'schema.json')):
+            self._load()
+
+    # Schema and persistence
+
+    def _reset(self, schema: Optional[List[Dict]] = None):
+        """Drop every document and field (the index does not exist until a schema is set)"""
+        self.schema: Dict[str, Dict] = {}
+        self.key_field = None
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[str, List[Any]] = {}
+        self._vectors: Dict[str, List[Optional[np.ndarray]]] = {}
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self._postings: Optional[Dict[str, Dict[str, Dict[int, int]]]] = None
+        self._field_lengths: Dict[str, np.ndarray] = {}
+        self._deleted: set = set()  # rows of deleted documents, dropped from the columns before the next read
+        self._logged = 0  # documents written to the log since the snapshot
+        self._snapshot_rows = 0
+        if schema:
+            self._set_schema(schema)
+
+    def _require_index(self):
+        if not self.schema:
+            # The SDK's error, so callers handle both backends alike (imported here: azure.core is slow to load)
+            from azure.core.exceptions import ResourceNotFoundError
+            raise ResourceNotFoundError(f"Local index '{self.index_name}' does not exist")
+
+    def _set_schema(self, schema: List[Dict]):
+        for field in schema:
+            self.schema[field['name']] = field
+            if field.get('key'):
+                self.key_field = field['name']
+            if field['type'] == VECTOR_TYPE:
+                self._vectors.setdefault(field['name'], [None] * len(self._keys))
+            else:
+                self._columns.setdefault(field['name'], [None] * len(self._keys))
+
+    def _infer_field(self, name: str, value: Any) -> Dict:
+        """Schema for a field that was not declared when the index was created"""
+        if isinstance(value, np.ndarray) or (isinstance(value, list) and value and isinstance(value[0], float)):
+            field_type = VECTOR_TYPE
+        elif isinstance(value, bool):
+            field_type = 'Edm.Boolean'
+        elif isinstance(value, int):
+            field_type = 'Edm.Int64'
+        elif isinstance(value, float):
+            field_type = 'Edm.Double'
+        else:
+            field_type = 'Edm.String'
+        return {'name': name, 'type': field_type, 'key': False, 'searchable': False}
+
+    def _load(self):
+        with open(os.path.join(self.directory, 'schema.json'), 'r', encoding='utf-8') as f:
+            self._set_schema(json.load(f))
+
+        documents_path = os.path.join(self.directory, 'documents.json')
+        if os.path.exists(documents_path):
+            with open(documents_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._keys = data['keys']
+            self._rows = {key: row for row, key in enumerate(self._keys)}
+            for name, values in data['columns'].items():
+                self._columns[name] = values
+            for name in self._vectors:
+                path = os.path.join(self.directory, f"{name}.npy")
+                present = data['vectors_present'].get(name, [])
+                matrix = np.load(path) if os.path.exists(path) else None
+                self._vectors[name] = [
+                    matrix[row] if matrix is not None and has_vector else None
+                    for row, has_vector in enumerate(present)
+                ] + [None] * (len(self._keys) - len(present))
+        self._snapshot_rows = len(self._keys)
+        self._replay_log()
+
+    def _replay_log(self):
+        """Apply the writes logged after the snapshot"""
+        log_path = os.path.join(self.directory, LOG_FILE)
+        if not os.path.exists(log_path):
+            return
+        vector_data: Dict[str, np.ndarray] = {}
+        torn = False
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    torn = True  # interrupted append; nothing after it was acknowledged
+                    break
+                if entry['op'] == 'delete':
+                    self._delete_keys(entry['keys'])
+                    continue
+                documents = entry['documents']
+                for name, references in entry['vectors'].items():
+                    if name not in vector_data:
+                        vector_data[name] = np.fromfile(os.path.join(self.directory, f"{name}.f32"), dtype=np.float32)
+                    for position, offset, length in references:
+                        documents[position][name] = vector_data[name][offset:offset + length]
+                self._apply_write(documents, entry['merge'], entry['must_exist'])
+                self._logged += len(documents)
+        if torn:
+            self._save()
+
+    def _append_log(self, entry: Dict, documents: Sequence[Dict] = ()):
+        """Append one write (vectors of ``documents`` to <field>.f32, the rest as a line of log.jsonl)"""
+        os.makedirs(self.directory, exist_ok=True)
+        if documents:
+            vector_files = {}
+            references: Dict[str, List[List[int]]] = defaultdict(list)
+            records = []
+            try:
+                for position, document in enumerate(documents):
+                    record = {}
+                    for name, value in document.items():
+                        if name not in self._vectors or value is None:
+                            record[name] = value
+                            continue
+                        if name not in vector_files:
+                            vector_files[name] = open(os.path.join(self.directory, f"{name}.f32"), 'ab')
+                            vector_files[name].seek(0, os.SEEK_END)
+                        vector = np.asarray(value, dtype=np.float32)
+                        references[name].append([position, vector_files[name].tell() // 4, len(vector)])
+                        vector_files[name].write(vector.tobytes())
+                    records.append(record)
+            finally:
+                for handle in vector_files.values():
+                    handle.close()
+            entry = dict(entry, documents=records, vectors=references)
+        with open(os.path.join(self.directory, LOG_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+        self._logged += len(documents)
+        if self._logged >= max(self._snapshot_rows, COMPACT_MIN_LOGGED):
+            self._save()
+
+    def flush(self):
+        """Fold the write log into a new snapshot"""
+        with self._lock:
+            if self.schema and (self._logged or self._deleted):
+                self._save()
+
+    def close(self):
+        self.flush()
+
+    def _save(self):
+        """Write a snapshot of the whole index and drop the write log"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._compact_rows()
+        self._write_json('schema.json', list(self.schema.values()))
+
+        arrays = self._materialize()
+        for name, vectors in self._vectors.items():
+            tmp_path = os.path.join(self.directory, f"{name}.tmp.npy")
+            np.save(tmp_path, arrays[name])
+            os.replace(tmp_path, os.path.join(self.directory, f"{name}.npy"))
+
+        self._write_json('documents.json', {
+            'keys': self._keys,
+            'columns': self._columns,
+            'vectors_present': {name: [v is not None for v in vectors] for name, vectors in self._vectors.items()}
+        })
+        for name in os.listdir(self.directory):
+            if name == LOG_FILE or name.endswith('.f32'):
+                os.remove(os.path.join(self.directory, name))
+        self._logged = 0
+        self._snapshot_rows = len(self._keys)
+
+    def _write_json(self, name: str, data: Any):
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    # Columnar views
+
+    def _materialize(self) -> Dict[str, np.ndarray]:
+        """NumPy arrays for numeric and vector fields, rebuilt after writes"""
+        self._compact_rows()
+        if self._arrays is not None:
+            return self._arrays
+
+        arrays = {}
+        for name, values in self._columns.items():
+            if self.schema[name]['type'] in NUMERIC_TYPES:
+                arrays[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+                arrays[name] = column
+        for name, vectors in self._vectors.items():
+            dimensions = self.schema[name].get('dimensions') or next(
+                (len(v) for v in vectors if v is not None), 0)
+            matrix = np.zeros((len(vectors), dimensions), dtype=np.float32)
+            for row, vector in enumerate(vectors):
+                if vector is not None:
+                    matrix[row] = vector
+            arrays[name] = matrix
+        self._arrays = arrays
+        return arrays
+
+    def _column(self, name: str) -> np.ndarray:
+        arrays = self._materialize()
+        if name not in arrays:
+            raise ValueError(f"Unknown field in filter: {name}")
+        return arrays[name]
+
+    def _build_postings(self):
+        """Inverted index (field -> term -> {row: term frequency}) over searchable fields"""
+        self._compact_rows()
+        if self._postings is not None:
+            return
+        postings: Dict[str, Dict[str, Dict[int, int]]] = {}
+        lengths: Dict[str, np.ndarray] = {}
+        for name, field in self.schema.items():
+            if not field.get('searchable') or field['type'] == VECTOR_TYPE:
+                continue
+            field_postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+            field_lengths = np.zeros(len(self._keys), dtype=np.float64)
+            for row, value in enumerate(self._columns[name]):
+                if not value:
+                    continue
+                counts = Counter(tokenize(str(value)))
+                field_lengths[row] = sum(counts.values())
+                for term, count in counts.items():
+                    field_postings[term][row] = count
+            postings[name] = dict(field_postings)
+            lengths[name] = field_lengths
+        self._postings = postings
+        self._field_lengths = lengths
+
+    def _invalidate(self):
+        self._arrays = None
+        self._postings = None
+
+    def _compact_rows(self):
+        """Drop the rows of deleted documents (once per batch of deletes, before the next read)"""
+        if not self._deleted:
+            return
+        keep = [row for row in range(len(self._keys)) if row not in self._deleted]
+        self._keys = [self._keys[row] for row in keep]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._columns = {name: [values[row] for row in keep] for name, values in self._columns.items()}
+        self._vectors = {name: [values[row] for row in keep] for name, values in self._vectors.items()}
+        self._deleted = set()
+        self._invalidate()
+
+    # Writes
+
+    def upload_documents(self, documents: Sequence[Dict], **kwargs) -> List[LocalIndexingResult]:
+        return self._write(documents, merge=False, must_exist=False)
+
+    def merge_documents(self, documents: Sequence[Dict], **kwargs) -> List[LocalIndexingResult]:
+        return self._write(documents, merge=True, must_exist=True)
+
+    def merge_or_upload_documents(self, documents: Sequence[Dict], **kwargs) -> List[LocalIndexingResult]:
+        return self._write(documents, merge=True, must_exist=False)
+
+    def delete_documents(self, documents: Sequence[Dict], **kwargs) -> List[LocalIndexingResult]:
+        with self._lock:
+            self._require_index()
+            keys = [document[self.key_field] for document in documents]
+            if self._delete_keys(keys):
+                self._append_log({'op': 'delete', 'keys': keys})
+        return [LocalIndexingResult(key=document[self.key_field], succeeded=True, status_code=200)
+                for document in documents]
+
+    def _delete_keys(self, keys: Iterable[str]) -> bool:
+        deleted = False
+        for key in keys:
+            row = self._rows.pop(key, None)
+            if row is not None:
+                self._deleted.add(row)
+                deleted = True
+        if deleted:
+            self._invalidate()
+        return deleted
+
+    def _write(self, documents: Sequence[Dict], merge: bool, must_exist: bool) -> List[LocalIndexingResult]:
+        with self._lock:
+            self._require_index()
+            results = self._apply_write(documents, merge, must_exist)
+            self._append_log({'op': 'write', 'merge': merge, 'must_exist': must_exist}, documents)
+        return results
+
+    def _apply_write(self, documents: Sequence[Dict], merge: bool, must_exist: bool) -> List[LocalIndexingResult]:
+        results = []
+        for document in documents:
+            key = document.get(self.key_field)
+            if key is None:
+                results.append(LocalIndexingResult(key=None, succeeded=False, status_code=400,
+                                                   error_message=f"Missing key field '{self.key_field}'"))
+                continue
+
+            row = self._rows.get(key)
+            if row is None:
+                if must_exist:
+                    results.append(LocalIndexingResult(key=key, succeeded=False, status_code=404,
+                                                       error_message="Document not found"))
+                    continue
+                row = self._append_row(key)
+            elif not merge:
+                self._clear_row(row)
+
+            for name, value in document.items():
+                if name not in self.schema:
+                    self._set_schema([self._infer_field(name, value)])
+                if name in self._vectors:
+                    self._vectors[name][row] = None if value is None else np.asarray(value, dtype=np.float32)
+                else:
+                    self._columns[name][row] = value
+            results.append(LocalIndexingResult(key=key, succeeded=True, status_code=200 if merge else 201))
+
+        self._invalidate()
+        return results
+
+    def _append_row(self, key: str) -> int:
+        row = len(self._keys)
+        self._keys.append(key)
+        self._rows[key] = row
+        for values in self._columns.values():
+            values.append(None)
+        for values in self._vectors.values():
+            values.append(None)
+        return row
+
+    def _clear_row(self, row: int):
+        for name, values in self._columns.items():
+            if name != self.key_field:
+                values[row] = None
+        for values in self._vectors.values():
+            values[row] = None
+
+    # Reads
+
+    def get_document_count(self) -> int:
+        return len(self._rows)
+
+    def get_document(self, key: str, selected_fields: Optional[List[str]] = None, **kwargs) -> Dict:
+        with self._lock:
+            self._require_index()
+            row = self._rows.get(key)
+            if row is None:
+                from azure.core.exceptions import ResourceNotFoundError
+                raise ResourceNotFoundError(f"Document '{key}' not found")
+            return self._document(row, self._selected(selected_fields))
+
+    def _selected(self, select) -> List[str]:
+        if select is None or select == '*' or select == ['*']:
+            return list(self.schema)
+        if isinstance(select, str):
+            select = select.split(',')
+        return [name.strip() for name in select if name.strip() in self.schema]
+
+    def _document(self, row: int, fields: List[str]) -> Dict:
+        document = {}
+        for name in fields:
+            if name in self._vectors:
+                vector = self._vectors[name][row]
+                document[name] = vector.tolist() if vector is not None else None
+            else:
+                document[name] = self._columns[name][row]
+        return document
+
+    def search(self, search_text: Optional[str] = None, *, filter: Optional[str] = None, select=None,
+               top: Optional[int] = None, skip: int = 0, vector_queries=None,
+               order_by: Optional[List[str]] = None, search_fields=None, **kwargs) -> Iterator[Dict]:
+        """Filter, then score by text and/or vectors; yields documents with '@search.score'"""
+        with self._lock:
+            self._require_index()
+            self._compact_rows()
+            rows = len(self._keys)
+            if rows == 0:
+                return iter([])
+
+            mask = _FilterParser(filter, self._column, rows).parse() if filter else np.ones(rows, dtype=bool)
+
+            rankings = []
+            if search_text and search_text.strip() not in ('', '*'):
+                if isinstance(search_fields, str):
+                    search_fields = [f.strip() for f in search_fields.split(',')]
+                text_scores = self._text_scores(search_text, search_fields)
+                candidates = np.flatnonzero(mask & (text_scores > 0))
+                rankings.append((candidates[np.argsort(-text_scores[candidates], kind='stable')],
+                                 text_scores))
+
+            for query in vector_queries or []:
+                vector_scores = self._vector_scores(query)
+                candidates = np.flatnonzero(mask & ~np.isnan(vector_scores))
+                ranked = candidates[np.argsort(-vector_scores[candidates], kind='stable')]
+                rankings.append((ranked[:query.k_nearest_neighbors or 50], vector_scores))
+
+            if not rankings:
+                ranked = np.flatnonzero(mask)
+                scores = {int(row): 1.0 for row in ranked}
+            elif len(rankings) == 1:
+                ranked, row_scores = rankings[0]
+                scores = {int(row): float(row_scores[row]) for row in ranked}
+            else:
+                # Hybrid: reciprocal rank fusion across the text and vector rankings
+                fused: Dict[int, float] = defaultdict(float)
+                for ranking, _ in rankings:
+                    for rank, row in enumerate(ranking):
+                        fused[int(row)] += 1.0 / (RRF_K + rank + 1)
+                ranked = np.array(sorted(fused, key=fused.get, reverse=True), dtype=np.int64)
+                scores = dict(fused)
+
+            ordered = [int(row) for row in ranked]
+            if order_by:
+                ordered = self._sort(ordered, order_by)
+
+            fields = self._selected(select)
+            results = []
+            for row in ordered[skip:skip + (50 if top is None else top)]:
+                document = self._document(row, fields)
+                document['@search.score'] = scores.get(row, 1.0)
+                results.append(document)
+            return iter(results)
+
+    def _text_scores(self, search_text: str, search_fields: Optional[List[str]]) -> np.ndarray:
+        """BM25 score per row; unfielded terms are scored against every searchable field"""
+        self._build_postings()
+        rows = len(self._keys)
+        scores = np.zeros(rows, dtype=np.float64)
+        fields = [f for f in (search_fields or self._postings) if f in self._postings]
+
+        for match in _QUERY_TERM.finditer(search_text):
+            field_name, field_value, phrase, bare = match.groups()
+            if bare is not None and bare.upper() in ('AND', 'OR', 'NOT', '*', '+', '-', '|'):
+                continue
+            if field_name is not None and field_name in self._postings:
+                targets, text = [field_name], field_value.strip('"')
+            elif field_name is not None:
+                targets, text = fields, f"{field_name} {field_value.strip(chr(34))}"
+            else:
+                targets, text = fields, phrase if phrase is not None else bare
+
+            for term in tokenize(text):
+                for name in targets:
+                    postings = self._postings[name].get(term)
+                    if not postings:
+                        continue
+                    lengths = self._field_lengths[name]
+                    average_length = lengths[lengths > 0].mean() if np.any(lengths > 0) else 1.0
+                    idf = math.log(1 + (rows - len(postings) + 0.5) / (len(postings) + 0.5))
+                    matched = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                    tf = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[matched] / average_length)
+                    scores[matched] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def _vector_scores(self, query) -> np.ndarray:
+        """Cosine similarity per row for a VectorizedQuery (NaN where the row has no vector)"""
+        field = query.fields.split(',')[0].strip() if isinstance(query.fields, str) else query.fields[0]
+        matrix = self._materialize()[field]
+        vector = np.asarray(query.vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(vector) or 1.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scores = (matrix @ vector) / norms
+        scores[norms == 0] = np.nan
+        return scores.astype(np.float64)
+
+    def _sort(self, rows: List[int], order_by: List[str]) -> List[int]:
+        """Stable multi-key sort (missing values last), applied after relevance ranking"""
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        for clause in reversed(order_by):
+            parts = clause.split()
+            name, descending = parts[0], len(parts) > 1 and parts[1].lower() == 'desc'
+            column = self._column(name)
+            present = [row for row in rows if not _is_missing(column[row])]
+            missing = [row for row in rows if _is_missing(column[row])]
+            present.sort(key=lambda row: column[row], reverse=descending)
+            rows = present + missing
+        return rows
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class LocalSearchIndexClient:
+    """In-process stand-in for ``SearchIndexClient``: manages local indexes under one directory"""
+
+    def __init__(self, directory: str = ".local_search_index"):
+        self.directory = directory
+        self._clients: Dict[str, LocalSearchClient] = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _index_dir(self, index_name: str) -> str:
+        return os.path.join(self.directory, index_name)
+
+    @staticmethod
+    def _schema(index) -> List[Dict]:
+        return [
+            {
+                'name': field.name,
+                'type': _type_name(field.type),
+                'key': bool(field.key),
+                'searchable': bool(field.searchable),
+                'dimensions': getattr(field, 'vector_search_dimensions', None)
+            }
+            for field in index.fields
+        ]
+
+    def create_index(self, index):
+        """Create an index from a SearchIndex definition"""
+        client = self.get_search_client(index.name)
+        with client._lock:
+            if client.schema:
+                raise ValueError(f"Local index '{index.name}' already exists")
+            client._reset(self._schema(index))
+            client._save()
+        return index
+
+    def create_or_update_index(self, index):
+        """Create the index, or add the fields it does not have yet"""
+        client = self.get_search_client(index.name)
+        with client._lock:
+            client._set_schema([field for field in self._schema(index) if field['name'] not in client.schema])
+            client._invalidate()
+            client._save()
+        return index
+
+    def delete_index(self, index_name) -> None:
+        index_name = getattr(index_name, 'name', index_name)
+        client = self.get_search_client(index_name)
+        with client._lock:
+            client._require_index()
+            shutil.rmtree(client.directory, ignore_errors=True)
+            client._reset()
+
+    def list_index_names(self) -> Iterable[str]:
+        return [name for name in sorted(os.listdir(self.directory))
+                if os.path.exists(os.path.join(self._index_dir(name), 'schema.json'))]
+
+    def close(self):
+        """Fold every index's write log into its snapshot"""
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.flush()
+
+    def get_search_client(self, index_name: str, **kwargs) -> LocalSearchClient:
+        """Shared client for one index; every caller (and later re-creations of the index) see the same store"""
+        with self._lock:
+            if index_name not in self._clients:
+                self._clients[index_name] = LocalSearchClient(self._index_dir(index_name), index_name)
+            return self._clients[index_name]
+
+
+def create_search_index_client(backend: str = "azure", endpoint: Optional[str] = None, credential=None,
+                               local_dir: str = ".local_search_index", registry=None):
+    """Index client for the configured search backend ("azure" or "local").
+
+    Azure clients come from ``registry`` (an azure_clients.AzureClientRegistry,
+    the process-wide one by default), so every tool and report talking to the
+    same service shares its pooled connections.
+    """
+    if backend == "local":
+        return LocalSearchIndexClient(local_dir)
+    if backend == "azure":
+        from azure_clients import get_client_registry
+        return (registry or get_client_registry()).search_index_client(endpoint, credential)
+    raise ValueError(f"Unknown search backend: {backend!r} (expected 'azure' or 'local')")
@@ -0,0 +1,186 @@
+import json
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Per-document statuses worth resending: version conflicts (409/422), throttling (429/503) and server errors
+RETRYABLE_STATUS = {409, 422, 429, 500, 502, 503, 504}
+
+# Statuses of a failed request worth resending: timeouts, throttling and server errors (5xx). Anything
+# else (400 for a malformed batch, 401/403, 404 for a missing index) fails the same way every time.
+RETRYABLE_REQUEST_STATUS = {408, 429}
+
+
+@dataclass
+class UploadResult:
+    """Outcome of streaming a set of documents into the index"""
+    uploaded: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)  # document key -> last error
+    batches: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def estimate_document_bytes(document: Dict) -> int:
+    """Approximate JSON payload size of a document without serializing its vectors"""
+    size = 2
+    for key, value in document.items():
+        size += len(key) + 4
+        if isinstance(value, list) and value and isinstance(value[0], float):
+            size += len(value) * 22  # "-0.012345678901234567," upper bound per float
+        else:
+            size += len(json.dumps(value, default=str))
+    return size
+
+
+def request_retry(error: Exception) -> Tuple[bool, Optional[float]]:
+    """Whether a request that raised ``error`` is worth resending, and the delay the service asked for"""
+    # Imported here: azure.core is slow to load and only needed once a request has failed
+    from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+    if isinstance(error, (ServiceRequestError, ServiceResponseError, ConnectionError, TimeoutError)):
+        return True, None  # connection failures and timeouts
+    status = getattr(error, 'status_code', None)
+    if status is None or not (status in RETRYABLE_REQUEST_STATUS or status >= 500):
+        return False, None
+    return True, retry_after(getattr(getattr(error, 'response', None), 'headers', None))
+
+
+def retry_after(headers) -> Optional[float]:
+    """Delay requested with retry-after-ms or Retry-After response headers, in seconds"""
+    if not headers:
+        return None
+    for name, scale in (('retry-after-ms', 0.001), ('Retry-After', 1.0)):
+        value = headers.get(name)
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                pass
+    return None
+
+
+class SearchUploader:
+    """Streaming, bounded-memory document upload to an Azure Search index.
+
+    Documents are read from any iterable (typically a generator), packed into
+    batches capped by estimated payload bytes and document count, and sent
+    with ``merge_or_upload`` on one shared ``SearchClient`` from a small thread
+    pool. At most ``max_in_flight`` batches exist at any time, so memory does
+    not grow with the number of documents.
+
+    Azure Search reports success per document. Only the documents that failed
+    with a retryable status are resent (with exponential backoff); a
+    non-retryable failure is recorded against that document alone instead of
+    aborting the rest of the upload. A request that fails as a whole is only
+    resent for connection errors, timeouts, throttling and server errors
+    (after the service's Retry-After, when it gives one); any other error
+    fails the batch at once.
+    """
+
+    def __init__(self, search_client, key_field: str = "id", max_batch_bytes: int = 4 * 1024 * 1024,
+                 max_batch_documents: int = 1000, max_in_flight: int = 4, max_retries: int = 3,
+                 retry_delay: float = 1.0):
+        self.search_client = search_client
+        self.key_field = key_field
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_documents = max_batch_documents
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def upload(self, documents: Iterable[Dict]) -> UploadResult:
+        """Upload every document; returns counts and the keys that could not be indexed"""
+        result = UploadResult()
+        pending = set()
+
+        def collect(done):
+            for future in done:
+                uploaded, failures, retries, sent = future.result()
+                result.uploaded += uploaded
+                result.failed.update(failures)
+                result.retries += retries
+                result.bytes_sent += sent
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            for batch, batch_bytes in self._batches(documents):
+                if len(pending) >= self.max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                result.batches += 1
+                pending.add(executor.submit(self._send_batch, batch, batch_bytes))
+
+            collect(wait(pending).done)
+
+        return result
+
+    def _batches(self, documents: Iterable[Dict]) -> Iterable[Tuple[List[Dict], int]]:
+        batch: List[Dict] = []
+        batch_bytes = 0
+        for document in documents:
+            size = estimate_document_bytes(document)
+            if batch and (batch_bytes + size > self.max_batch_bytes or len(batch) >= self.max_batch_documents):
+                yield batch, batch_bytes
+                batch, batch_bytes = [], 0
+            batch.append(document)
+            batch_bytes += size
+        if batch:
+            yield batch, batch_bytes
+
+    def _send_batch(self, batch: List[Dict], batch_bytes: int) -> Tuple[int, Dict[str, str], int, int]:
+        """Send one batch, resending only failed documents; returns (uploaded, failures, retries, bytes)"""
+        uploaded = 0
+        retries = 0
+        sent = 0
+        failures: Dict[str, str] = {}  # permanent failures
+        retry_errors: Dict[str, str] = {}  # errors of documents still waiting for a retry
+        remaining = batch
+        delay: Optional[float] = None  # Retry-After of the last failed request
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                retries += 1
+                time.sleep(delay if delay is not None
+                           else self.retry_delay * (2 ** (attempt - 1)) * (0.5 + random.random()))
+
+            sent += batch_bytes if remaining is batch else sum(map(estimate_document_bytes, remaining))
+            try:
+                results = self.search_client.merge_or_upload_documents(documents=remaining)
+            except Exception as e:
+                errors = {document[self.key_field]: str(e) for document in remaining}
+                retryable, delay = request_retry(e)
+                if not retryable:
+                    # Same error on every attempt (bad request, authentication, ...): fail the batch now
+                    failures.update(errors)
+                    retry_errors = {}
+                    break
+                # Network error, throttling or server error: every remaining document is retried
+                retry_errors = errors
+                continue
+
+            delay = None
+
+            by_key = {document[self.key_field]: document for document in remaining}
+            remaining = []
+            retry_errors = {}
+            for item in results:
+                if item.succeeded:
+                    uploaded += 1
+                    continue
+                error = f"{item.status_code}: {item.error_message}"
+                if item.status_code in RETRYABLE_STATUS:
+                    remaining.append(by_key[item.key])
+                    retry_errors[item.key] = error
+                else:
+                    failures[item.key] = error
+
+            if not remaining:
+                break
+
+        failures.update(retry_errors)
+        return uploaded, failures, retries, sent
@@ -0,0 +1,259 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Environment variable holding the Fernet key of the on-disk secret cache (Fernet.generate_key())
+CACHE_KEY_ENV = "TENK_SECRET_CACHE_KEY"
+
+# Seconds before retrying a secret whose refresh failed, doubled after each failure in a row (up to the TTL)
+REFRESH_RETRY_DELAY = 5.0
+
+
+def env_name(secret_name: str) -> str:
+    """Environment variable for a Key Vault secret name: "azure-openai-key" -> "AZURE_OPENAI_KEY" """
+    return secret_name.replace('-', '_').upper()
+
+
+class SecretProvider:
+    """Source of named secrets (Key Vault names, e.g. "azure-openai-key")"""
+
+    def get(self, name: str) -> str:
+        raise NotImplementedError
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, str]:
+        return {name: self.get(name) for name in names}
+
+
+class EnvSecretProvider(SecretProvider):
+    """Secrets from environment variables (AZURE_OPENAI_KEY for "azure-openai-key"), for local runs"""
+
+    def get(self, name: str) -> str:
+        value = os.getenv(env_name(name))
+        if value is None:
+            raise KeyError(f"Secret {name!r} not set (environment variable {env_name(name)})")
+        return value
+
+
+class _Secret:
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name: str, value: str):
+        self.name = name
+        self.value = value
+
+
+class LocalSecretClient:
+    """In-process stand-in for Key Vault's ``SecretClient`` (get_secret/set_secret), for tests and offline runs.
+
+    Secrets live in memory, loaded from a JSON file of {name: value} when
+    ``path`` is given. ``latency`` simulates the Key Vault round-trip and
+    ``calls`` counts get_secret requests.
+    """
+
+    def __init__(self, secrets: Optional[Dict[str, str]] = None, path: Optional[str] = None, latency: float = 0.0):
+        self.secrets: Dict[str, str] = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.secrets.update(json.load(f))
+        self.secrets.update(secrets or {})
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_secret(self, name: str, **kwargs) -> _Secret:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if name not in self.secrets:
+            # The SDK's error, so callers handle both clients alike (imported here: azure.core is slow to load)
+            from azure.core.exceptions import ResourceNotFoundError
+            raise ResourceNotFoundError(f"Secret not found: {name}")
+        return _Secret(name, self.secrets[name])
+
+    def set_secret(self, name: str, value: str, **kwargs) -> _Secret:
+        self.secrets[name] = value
+        return _Secret(name, value)
+
+
+class KeyVaultSecretProvider(SecretProvider):
+    """Secrets read through a Key Vault ``SecretClient`` (or LocalSecretClient), one round-trip each"""
+
+    def __init__(self, secret_client):
+        self.secret_client = secret_client
+
+    def get(self, name: str) -> str:
+        return self.secret_client.get_secret(name).value
+
+
+class CachedSecretProvider(SecretProvider):
+    """Secrets cached for ``ttl`` seconds, fetched concurrently and refreshed before they expire.
+
+    - Secrets missing from the cache (or expired) are fetched from ``source``
+      concurrently, one request each, instead of one after another.
+    - With ``cache_path`` and an encryption key (``encryption_key`` or the
+      TENK_SECRET_CACHE_KEY environment variable), resolved secrets are also
+      kept in a Fernet-encrypted file, so short-lived CLI runs and worker
+      processes skip Key Vault, and the credential's token fetch, while the
+      file is fresh. Without a key nothing is written to disk.
+    - With ``background_refresh``, a daemon thread re-fetches each secret
+      once ``refresh_margin`` of its TTL is left, so callers never wait on an
+      expiry.
+    - A secret the source cannot return comes from ``fallback`` (environment
+      variables by default); an expired value whose refresh fails is still
+      served, with a warning, rather than failing the caller. The secret is
+      not fetched again until REFRESH_RETRY_DELAY has passed, doubling with
+      each failure in a row up to ``ttl``, so an outage costs a few requests
+      rather than one per second (or per call).
+    """
+
+    def __init__(self, source: SecretProvider, ttl: float = 3600.0, refresh_margin: float = 0.2,
+                 cache_path: Optional[str] = None, encryption_key: Optional[str] = None,
+                 fallback: Optional[SecretProvider] = None, background_refresh: bool = True,
+                 max_workers: int = 8):
+        self.source = source
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.fallback = fallback if fallback is not None else EnvSecretProvider()
+        self.background_refresh = background_refresh
+        self.max_workers = max_workers
+
+        key = encryption_key or os.getenv(CACHE_KEY_ENV)
+        self.cache_path = cache_path if cache_path and key else None
+        self._fernet = None
+        if self.cache_path:
+            # Imported only for the file cache, so processes that never write one do not load cryptography
+            from cryptography.fernet import Fernet
+            self._fernet = Fernet(key)
+        if cache_path and not key:
+            print(f"Secret cache file disabled: no encryption key (set {CACHE_KEY_ENV})")
+
+        self._secrets: Dict[str, Tuple[str, float]] = {}  # name -> (value, fetched at, epoch seconds)
+        self._retry_at: Dict[str, Tuple[int, float]] = {}  # name -> (failed refreshes in a row, next attempt)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self._load()
+
+    def get(self, name: str) -> str:
+        return self.get_many([name])[name]
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, str]:
+        names = list(dict.fromkeys(names))
+        now = time.time()
+        with self._lock:
+            # An expired secret whose refresh failed is served as it is until its next attempt is due
+            stale = [name for name in names if name not in self._secrets or (
+                now - self._secrets[name][1] >= self.ttl and self._retry_at.get(name, (0, 0.0))[1] <= now)]
+        if stale:
+            self._fetch(stale, required=True)
+        self._start_refresher()
+        with self._lock:
+            return {name: self._secrets[name][0] for name in names}
+
+    def _fetch(self, names: List[str], required: bool = False):
+        """Fetch secrets from the source concurrently and store them; ``required`` ones must resolve"""
+        def fetch(name: str) -> Tuple[str, Optional[str], Optional[Exception]]:
+            try:
+                return name, self.source.get(name), None
+            except Exception as e:
+                return name, None, e
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(names))) as executor:
+            results = list(executor.map(fetch, names))
+
+        fetched_at = time.time()
+        with self._lock:
+            for name, value, error in results:
+                if value is not None:
+                    self._secrets[name] = (value, fetched_at)
+                    self._retry_at.pop(name, None)
+                elif name in self._secrets:
+                    failures = self._retry_at.get(name, (0, 0.0))[0] + 1
+                    delay = min(self.ttl, REFRESH_RETRY_DELAY * 2 ** (failures - 1))
+                    self._retry_at[name] = (failures, fetched_at + delay)
+                    print(f"Warning: could not refresh secret {name!r} ({error}), "
+                          f"using the cached value (next attempt in {delay:.0f}s)")
+                elif required:
+                    try:
+                        self._secrets[name] = (self.fallback.get(name), fetched_at)
+                    except Exception:
+                        raise KeyError(f"Secret {name!r} could not be resolved: {error}") from error
+        if any(value is not None for _, value, _ in results):
+            self._save()
+
+    def _refresh_due(self) -> Dict[str, float]:
+        """When each cached secret is next due for a refresh: its refresh window, or the retry after a failure"""
+        window = self.ttl * (1 - self.refresh_margin)
+        with self._lock:
+            return {name: max(fetched_at + window, self._retry_at.get(name, (0, 0.0))[1])
+                    for name, (_, fetched_at) in self._secrets.items()}
+
+    def _refresh_delay(self) -> float:
+        """Seconds until the first cached secret is due for a refresh"""
+        due = self._refresh_due().values()
+        return max(1.0, min(due, default=time.time() + self.ttl * (1 - self.refresh_margin)) - time.time())
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self._refresh_delay()):
+            now = time.time()
+            due = [name for name, due_at in self._refresh_due().items() if due_at <= now]
+            if due:
+                self._fetch(due)
+
+    def _start_refresher(self):
+        if not self.background_refresh or self._refresher is not None:
+            return
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name="secret-refresh", daemon=True)
+                self._refresher.start()
+
+    def close(self):
+        """Stop the background refresh"""
+        self._stop.set()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        from cryptography.fernet import InvalidToken
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = json.loads(self._fernet.decrypt(f.read()))
+            now = time.time()
+            self._secrets.update({name: (value, fetched_at) for name, (value, fetched_at) in data.items()
+                                  if now - fetched_at < self.ttl})
+        except (InvalidToken, ValueError, OSError) as e:
+            print(f"Ignoring unreadable secret cache {self.cache_path}: {type(e).__name__}")
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            payload = self._fernet.encrypt(json.dumps(self._secrets).encode('utf-8'))
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error writing secret cache: {e}")
+
+
+_providers: Dict[Tuple, CachedSecretProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def key_vault_secret_provider(vault_url: str, secret_client, ttl: float = 3600.0,
+                              cache_path: Optional[str] = None) -> CachedSecretProvider:
+    """Process-wide cached provider for one vault, so every tool built in a process shares its secrets"""
+    key = (vault_url.rstrip('/').lower(), ttl, cache_path)
+    with _providers_lock:
+        if key not in _providers:
+            _providers[key] = CachedSecretProvider(KeyVaultSecretProvider(secret_client), ttl=ttl,
+                                                   cache_path=cache_path)
+        return _providers[key]
@@ -0,0 +1,227 @@
+import re
+from bisect import bisect_right
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from pdf_text_extractor import PageText
+from tokenization import estimate_tokens
+from document_chunk import DocumentChunk
+
+# End of a sentence: terminal punctuation (and closing quotes or brackets), then whitespace
+SENTENCE_END = re.compile(r'(?<=[.!?])["\'”’)\]]*\s+')
+
+# Characters per token of chunk budget held back waiting for a blank line. Text that has none (extractors
+# that emit single line breaks only) is cut at the last line break past this, instead of buffering the rest
+# of the filing: at under 8 characters per token such a run is over the budget and would be split anyway.
+MAX_BUFFER_CHARS_PER_TOKEN = 8
+
+
+class _Paragraph:
+    """One stripped paragraph and its position in the joined filing text"""
+    __slots__ = ('text', 'start', 'end', 'tokens', 'section')
+
+    def __init__(self, text: str, start: int, tokens: int, section: str):
+        self.text = text
+        self.start = start
+        self.end = start + len(text)
+        self.tokens = tokens
+        self.section = section
+
+
+class SectionChunker:
+    """Streaming, section-aware chunker for 10-K text.
+
+    Consumes pages one at a time and yields chunks as soon as they are full,
+    so the caller can embed early chunks while later pages are still being
+    extracted, and the filing never has to be held as a list of paragraphs.
+
+    - Paragraphs are split on blank lines, across page boundaries, exactly as
+      if the pages had been joined with ``join_pages``. A run of text with no
+      blank line is cut at a line break once it is well past the chunk
+      budget (see MAX_BUFFER_CHARS_PER_TOKEN), so memory stays bounded and
+      chunks keep coming for such filings too.
+    - Section headings are found with one precompiled alternation per
+      paragraph; only paragraphs that hit it are checked pattern by pattern
+      (the first pattern in list order wins).
+    - Chunk size is a token budget (``token_counter``, e.g. a memoized
+      tokenization.TokenCounter, so each paragraph is tokenized once), not a
+      character count. Paragraphs larger than the budget are split at
+      whitespace into pieces that each fit it.
+    - A new chunk starts with the last whole sentences of the previous
+      chunk's last paragraph, up to ``overlap_tokens`` (words only when the
+      final sentence alone is longer than that).
+
+    Each chunk is a DocumentChunk with ``content``, ``section_type`` (section
+    in effect at the chunk's last paragraph), ``chunk_index``,
+    ``token_count``, ``char_start``/``char_end`` (offsets in the joined
+    text), and the ``page_start``/``page_end`` and ``extraction_method`` of
+    the pages it spans, from a per-page offset table (None when chunking
+    plain text).
+    """
+
+    def __init__(self, section_patterns: List[Tuple[str, str]], chunk_tokens: int = 375,
+                 overlap_tokens: int = 50, min_paragraph_chars: int = 1,
+                 token_counter: Callable[[str], int] = estimate_tokens):
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = min(overlap_tokens, chunk_tokens // 2)
+        self.min_paragraph_chars = min_paragraph_chars
+        self.token_counter = token_counter
+        self.max_buffer_chars = max(1, chunk_tokens) * MAX_BUFFER_CHARS_PER_TOKEN
+        self._sections = [(re.compile(pattern, re.IGNORECASE), name) for pattern, name in section_patterns]
+        self._any_section = re.compile("|".join(f"(?:{pattern})" for pattern, _ in section_patterns),
+                                       re.IGNORECASE) if section_patterns else None
+
+    def iter_chunks(self, pages: Iterable[PageText]) -> Iterator[DocumentChunk]:
+        """Chunks for a stream of extracted pages, offsets match join_pages(pages)"""
+        return self._chunk_segments((page.page_number, page.extraction_method, page.text + "\n")
+                                    for page in pages if page.text)
+
+    def chunk_text(self, text: str) -> Iterator[DocumentChunk]:
+        """Chunks for already-joined text (no page numbers)"""
+        return self._chunk_segments([(None, None, text)])
+
+    def detect_section(self, paragraph: str) -> Optional[str]:
+        """Section name whose heading pattern occurs in the paragraph, or None"""
+        if self._any_section is None or not self._any_section.search(paragraph):
+            return None
+        for pattern, name in self._sections:
+            if pattern.search(paragraph):
+                return name
+        return None
+
+    def _chunk_segments(self, segments: Iterable[Tuple[Optional[int], Optional[str], str]]) -> Iterator[DocumentChunk]:
+        # Per-page offset table: char offset where each page begins, its number and extraction method
+        page_starts: List[int] = []
+        page_numbers: List[Optional[int]] = []
+        page_methods: List[Optional[str]] = []
+
+        def page_index(position: int) -> int:
+            return bisect_right(page_starts, position) - 1
+
+        current: List[_Paragraph] = []
+        current_tokens = 0
+        chunk_index = 0
+
+        def emit() -> DocumentChunk:
+            first, last = page_index(current[0].start), page_index(current[-1].end - 1)
+            methods = list(dict.fromkeys(m for m in page_methods[max(first, 0):last + 1] if m))
+            return DocumentChunk(
+                content="\n\n".join(p.text for p in current),
+                section_type=current[-1].section,
+                chunk_index=chunk_index,
+                token_count=current_tokens,
+                char_start=current[0].start,
+                char_end=current[-1].end,
+                page_start=page_numbers[first] if first >= 0 else None,
+                page_end=page_numbers[last] if last >= 0 else None,
+                extraction_method="+".join(methods) or None
+            )
+
+        def add_page(position: int, page_number: Optional[int], method: Optional[str]):
+            page_starts.append(position)
+            page_numbers.append(page_number)
+            page_methods.append(method)
+
+        for paragraph in self._iter_paragraphs(segments, add_page):
+            if current and current_tokens + paragraph.tokens > self.chunk_tokens:
+                yield emit()
+                chunk_index += 1
+                overlap = self._overlap(current[-1]) if self.overlap_tokens > 0 else None
+                if overlap is not None and overlap.tokens + paragraph.tokens <= self.chunk_tokens:
+                    current, current_tokens = [overlap], overlap.tokens
+                else:
+                    current, current_tokens = [], 0
+            current.append(paragraph)
+            current_tokens += paragraph.tokens
+
+        if current:
+            yield emit()
+
+    def _iter_paragraphs(self, segments: Iterable[Tuple[Optional[int], Optional[str], str]],
+                         add_page: Callable[[int, Optional[int], Optional[str]], None]) -> Iterator[_Paragraph]:
+        """Stripped paragraphs in text order, with section and token count; handles paragraphs spanning pages"""
+        section = 'general'
+        buffer = ""
+        buffer_start = 0  # offset of buffer[0] in the joined text
+        consumed = 0  # total characters seen so far
+
+        def paragraphs_in(block: str, block_start: int) -> Iterator[_Paragraph]:
+            nonlocal section
+            position = block_start
+            for piece in block.split('\n\n'):
+                stripped = piece.strip()
+                if len(stripped) >= self.min_paragraph_chars:
+                    start = position + len(piece) - len(piece.lstrip())
+                    section = self.detect_section(stripped) or section
+                    yield from self._fit(stripped, start, section)
+                position += len(piece) + 2
+
+        for page_number, method, segment in segments:
+            add_page(consumed, page_number, method)
+            consumed += len(segment)
+            # The buffer holds no blank line, so only the new text (and the character before it) is searched
+            searched = max(0, len(buffer) - 1)
+            buffer += segment
+
+            # Everything before the last blank line is complete; the remainder may continue on the next page
+            cut, separator = buffer.rfind('\n\n', searched), 2
+            if cut == -1 and len(buffer) > self.max_buffer_chars:
+                cut, separator = buffer.rfind('\n'), 1
+            if cut == -1:
+                continue
+            yield from paragraphs_in(buffer[:cut], buffer_start)
+            buffer_start += cut + separator
+            buffer = buffer[cut + separator:]
+
+        if buffer:
+            yield from paragraphs_in(buffer, buffer_start)
+
+    def _fit(self, text: str, start: int, section: str) -> Iterator[_Paragraph]:
+        """The paragraph itself, or whitespace-bounded pieces of it when it exceeds the chunk budget"""
+        tokens = self.token_counter(text)
+        if tokens <= self.chunk_tokens:
+            yield _Paragraph(text, start, tokens, section)
+            return
+
+        pieces = -(-tokens // self.chunk_tokens)
+        target = max(1, len(text) // pieces)
+        position = 0
+        while position < len(text):
+            end = min(len(text), position + target)
+            if end < len(text):
+                space = text.rfind(' ', position + target // 2, end)
+                end = space if space != -1 else end
+            piece = text[position:end].strip()
+            if piece:
+                # Pieces are sized by characters, so one can still run over the token budget: split it again
+                yield from self._fit(piece, start + text.index(piece, position), section)
+            position = end
+
+    def _overlap(self, paragraph: _Paragraph) -> Optional[_Paragraph]:
+        """Tail of a paragraph that fits in overlap_tokens, starting at a sentence (or else word) boundary"""
+        if paragraph.tokens <= self.overlap_tokens:
+            return paragraph
+
+        # Shortest tails first: the last sentence, then the last two, ... while they fit
+        best = None
+        for boundary in reversed([m.end() for m in SENTENCE_END.finditer(paragraph.text)]):
+            tail = paragraph.text[boundary:]
+            if not tail:
+                continue
+            tokens = self.token_counter(tail)
+            if tokens > self.overlap_tokens:
+                break
+            best = _Paragraph(tail, paragraph.end - len(tail), tokens, paragraph.section)
+        if best is not None:
+            return best
+
+        length = len(paragraph.text) * self.overlap_tokens // max(paragraph.tokens, 1)
+        while length > 0:
+            tail = paragraph.text[-length:]
+            space = tail.find(' ')
+            if space != -1:
+                tail = tail[space + 1:]
+            tokens = self.token_counter(tail)
+            if tail and tokens <= self.overlap_tokens:
+                return _Paragraph(tail, paragraph.end - len(tail), tokens, paragraph.section)
+            length = length * 4 // 5
+        return None
@@ -0,0 +1,297 @@
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from pdf_text_extractor import PageText
+
+# Item headings, e.g. "ITEM 7. MANAGEMENT'S DISCUSSION" or "Item 8. Financial Statements".
+# Matched against lowercased text (see LOWERED_WINDOW_CHARS below for why); the word boundary
+# before "item" is checked on the few hits instead of in the pattern.
+ITEM_HEADING = re.compile(r'item\s+(1a|1b|1|2|3|4|5|6|7a|7|8|9a|9b|9|10|11|12|13|14|15)\.')
+
+# Landmark kind -> pattern over lowercased text (group 1, when present: item number or Exchange Act section).
+# Each one starts with a literal, which the regex engine finds with a fast substring search; one
+# alternation of them all has no common literal and is tried at every position, about 15x slower.
+LANDMARKS = {
+    'item': ITEM_HEADING,
+    'securities': re.compile(r'securities\s+registered\s+pursuant\s+to\s+section\s+12\((b|g)\)'),
+    'classes': re.compile(r'title\s+of\s+each\s+class'),
+    'balance_sheet': re.compile(r'consolidated\s+balance\s+sheets?'),
+    'income_statement': re.compile(r'consolidated\s+statements?\s+of\s+(?:comprehensive\s+)?(?:income|operations|earnings)'),
+    'cash_flows': re.compile(r'consolidated\s+statements?\s+of\s+cash\s+flows?'),
+}
+
+STATEMENTS = ('balance_sheet', 'income_statement', 'cash_flows')
+
+# The cover page ends at the first Item heading (the table of contents), and at most here
+COVER_CHARS = 20_000
+
+# Characters after a statement title in which its figures are counted, to tell the
+# statement itself from references to it in the notes, MD&A or the auditor's report
+STATEMENT_PROBE_CHARS = 4_000
+STATEMENT_MAX_CHARS = 12_000
+SECURITIES_TABLE_CHARS = 3_000
+
+NUMBER = re.compile(r'\d[\d,.]*')
+
+# Why patterns are written for lowercased text, used by every caller of iter_lowered_matches and
+# findall_lowered: compiling them with re.IGNORECASE instead loses the regex engine's literal-prefix
+# search (about 10x slower for LANDMARKS, 2x for keyword tries), so the filing is lowercased one
+# window at a time here, never as a lowercased copy of the whole multi-MB text.
+# A match may run up to LOWERED_OVERLAP_CHARS past the end of its window, and lookbehinds see
+# LOWERED_CONTEXT_CHARS before its start.
+LOWERED_WINDOW_CHARS = 1 << 16
+LOWERED_OVERLAP_CHARS = 1024
+LOWERED_CONTEXT_CHARS = 64
+
+
+def iter_lowered_matches(text: str, patterns: Sequence[Pattern], start: int = 0,
+                         end: Optional[int] = None) -> Iterator[Tuple[int, int, int, re.Match]]:
+    """(pattern number, start, end, match) of each non-overlapping match of each pattern in
+    ``text[start:end]`` as if scanned over ``text.lower()``, in order of position per pattern.
+
+    Offsets are into ``text``; the match's groups hold lowercased text. A
+    window whose lowercase form changes length (rare non-ASCII cases) is
+    scanned case-insensitively as it is instead.
+    """
+    end = len(text) if end is None else min(end, len(text))
+    resume = [start] * len(patterns)  # where each pattern's scan continues (after its last match)
+    for window_start in range(start, end, LOWERED_WINDOW_CHARS):
+        window_end = min(window_start + LOWERED_WINDOW_CHARS, end)
+        base = max(0, window_start - LOWERED_CONTEXT_CHARS)
+        chunk = text[base:min(end, window_end + LOWERED_OVERLAP_CHARS)]
+        lowered = chunk.lower()
+        for number, pattern in enumerate(patterns):
+            if len(lowered) == len(chunk):
+                matches = pattern.finditer(lowered, resume[number] - base, len(chunk))
+            else:
+                matches = re.compile(pattern.pattern, pattern.flags | re.IGNORECASE).finditer(
+                    chunk, resume[number] - base, len(chunk))
+            for m in matches:
+                if base + m.start() >= window_end:
+                    break
+                resume[number] = base + max(m.end(), m.start() + 1)
+                yield number, base + m.start(), base + m.end(), m
+            resume[number] = max(resume[number], window_end)
+
+
+def findall_lowered(pattern: Pattern, text: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """``pattern.findall(text.lower(), start, end)`` for a pattern with at most one group that
+    neither matches nor looks across a line break (keyword tries), lowercasing a window at a time.
+
+    Windows end after a line break, so each one is scanned with findall as
+    it is and nothing straddles two windows.
+    """
+    end = len(text) if end is None else min(end, len(text))
+    found: List[str] = []
+    position = start
+    while position < end:
+        limit = position + LOWERED_WINDOW_CHARS
+        if limit >= end:
+            cut = end
+        else:
+            cut = text.rfind('\n', position, limit) + 1
+            if cut == 0:
+                line_end = text.find('\n', limit, end)
+                cut = line_end + 1 if line_end >= 0 else end
+        base = max(0, position - LOWERED_CONTEXT_CHARS)
+        chunk = text[base:cut]
+        lowered = chunk.lower()
+        if len(lowered) == len(chunk):
+            found += pattern.findall(lowered, position - base)
+        else:
+            insensitive = re.compile(pattern.pattern, pattern.flags | re.IGNORECASE)
+            found += [match.lower() for match in insensitive.findall(chunk, position - base)]
+        position = cut
+    return found
+
+
+def item_bodies(text: str) -> Dict[str, Tuple[int, int]]:
+    """Character range of each Item's body in the filing text, by item number ("1", "1A", ...).
+
+    Item headings appear twice in a 10-K, once in the table of contents and
+    once as the real section header, so for each item the occurrence followed
+    by the longest stretch of text is taken as the section body.
+    """
+    headings = [
+        (start, m.group(1).upper()) for _, start, _, m in iter_lowered_matches(text, (ITEM_HEADING,))
+        if start == 0 or not text[start - 1].isalnum()
+    ]
+    return _longest_bodies(headings, len(text))
+
+
+def _longest_bodies(headings: List[Tuple[int, str]], length: int) -> Dict[str, Tuple[int, int]]:
+    bodies: Dict[str, Tuple[int, int]] = {}
+    for (start, item), next_heading in zip(headings, headings[1:] + [(length, None)]):
+        if item not in bodies or next_heading[0] - start > bodies[item][1] - bodies[item][0]:
+            bodies[item] = (start, next_heading[0])
+    return bodies
+
+
+@dataclass
+class Section:
+    """One located part of a filing: character range in the joined text and the pages it spans"""
+    name: str  # cover, securities_table, item_1, item_1a, ..., balance_sheet, income_statement, cash_flows
+    start: int
+    end: int
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
+
+
+class SectionIndex:
+    """Where the landmarks of one filing are, located once per filing.
+
+    Built once per filing (``SectionIndex.build``), then queried by every
+    extractor so each one reads only the part of the text it needs instead
+    of scanning the whole filing again:
+
+    - ``cover``: start of the filing up to the table of contents (at most
+      COVER_CHARS), with the registrant name, trading symbols and file numbers
+    - ``securities_table``: the Section 12(b) registration table on the cover
+    - ``item_1`` ... ``item_15``: Item bodies, taking for each Item the
+      heading followed by the most text (the others are table of contents)
+    - ``balance_sheet``, ``income_statement``, ``cash_flows``: the statement
+      titles followed by the most figures, preferring those inside Item 8,
+      up to the next landmark of another kind
+
+    Page ranges are filled in when the filing's pages are given.
+    """
+
+    def __init__(self, text: str, sections: List[Section]):
+        self.text = text
+        self.sections = sorted(sections, key=lambda section: section.start)
+        self._by_name = {section.name: section for section in self.sections}
+
+    @classmethod
+    def build(cls, text: str, pages: Optional[List[PageText]] = None) -> "SectionIndex":
+        """Locate every landmark of ``text`` (the join_pages text of ``pages``, when given)"""
+        kinds = list(LANDMARKS)
+        patterns = list(LANDMARKS.values())
+        hits: List[Tuple[int, int, str, Optional[str]]] = []  # (start, end, kind, item number or act)
+        for number, start, end, m in iter_lowered_matches(text, patterns):
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            hits.append((start, end, kinds[number], m.group(1).upper() if patterns[number].groups else None))
+        hits.sort()
+
+        sections = []
+        bodies = _longest_bodies([(start, item) for start, _, kind, item in hits if kind == 'item'], len(text))
+        for item, (start, end) in bodies.items():
+            sections.append(Section(f"item_{item.lower()}", start, end))
+
+        first_item = min((start for start, _, kind, _ in hits if kind == 'item'), default=len(text))
+        cover_end = min(first_item if first_item > 0 else len(text), COVER_CHARS, len(text))
+        if cover_end > 0:
+            sections.append(Section('cover', 0, cover_end))
+
+        securities = cls._securities_table(hits, cover_end)
+        if securities:
+            sections.append(securities)
+
+        financial = bodies.get('8')
+        for kind in STATEMENTS:
+            statement = cls._statement(text, hits, kind, financial)
+            if statement:
+                sections.append(statement)
+
+        if pages is not None:
+            cls._add_pages(sections, pages)
+        return cls(text, sections)
+
+    @staticmethod
+    def _securities_table(hits: List[Tuple[int, int, str, Optional[str]]], cover_end: int) -> Optional[Section]:
+        """Section 12(b) table on the cover, up to the Section 12(g) line or the next Item heading"""
+        starts = [start for start, _, kind, act in hits
+                  if start < cover_end and ((kind == 'securities' and act == 'B') or kind == 'classes')]
+        if not starts:
+            return None
+        start = starts[0]
+        end = min([s for s, _, kind, _ in hits if s > start and kind in ('item', 'securities')]
+                  + [start + SECURITIES_TABLE_CHARS])
+        return Section('securities_table', start, end)
+
+    @staticmethod
+    def _statement(text: str, hits: List[Tuple[int, int, str, Optional[str]]], kind: str,
+                   financial: Optional[Tuple[int, int]]) -> Optional[Section]:
+        """Statement title followed by the most figures (inside Item 8 when it was found)"""
+        candidates = [(start, end) for start, end, hit_kind, _ in hits if hit_kind == kind]
+        if financial:
+            candidates = [c for c in candidates if financial[0] <= c[0] < financial[1]] or candidates
+        if not candidates:
+            return None
+
+        def figures(candidate: Tuple[int, int]) -> int:
+            return sum(1 for _ in NUMBER.finditer(text, candidate[1], candidate[1] + STATEMENT_PROBE_CHARS))
+
+        start, title_end = max(candidates, key=figures)
+        limit = financial[1] if financial and financial[0] <= start < financial[1] else len(text)
+        limit = min(limit, start + STATEMENT_MAX_CHARS)
+        # Running page headers repeat the same title, so only another kind of landmark ends the statement
+        end = min([s for s, _, hit_kind, _ in hits if s >= title_end and hit_kind != kind] + [limit])
+        return Section(kind, start, end)
+
+    @staticmethod
+    def _add_pages(sections: List[Section], pages: List[PageText]):
+        starts, numbers = [], []
+        position = 0
+        for page in pages:
+            if page.text:
+                starts.append(position)
+                numbers.append(page.page_number)
+                position += len(page.text) + 1
+
+        def page_at(offset: int) -> Optional[int]:
+            index = bisect_right(starts, offset) - 1
+            return numbers[index] if index >= 0 else None
+
+        for section in sections:
+            section.page_start = page_at(section.start)
+            section.page_end = page_at(max(section.start, section.end - 1))
+
+    def get(self, name: str) -> Optional[Section]:
+        return self._by_name.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def item(self, number: str) -> Optional[Section]:
+        """Body of an Item by number ("1", "1A", "7")"""
+        return self._by_name.get(f"item_{number.lower()}")
+
+    def items(self) -> Dict[str, Tuple[int, int]]:
+        """Item number -> character range, as item_bodies returns them"""
+        return {section.name[5:].upper(): (section.start, section.end)
+                for section in self.sections if section.name.startswith('item_')}
+
+    def span(self, *names: str) -> Optional[Tuple[int, int]]:
+        """Character range covering every named section that was found"""
+        found = [self._by_name[name] for name in names if name in self._by_name]
+        if not found:
+            return None
+        return min(section.start for section in found), max(section.end for section in found)
+
+    def financial_region(self) -> Optional[Tuple[int, int]]:
+        """Item 7 (MD&A) through the end of Item 8 (financial statements)"""
+        return self.span('item_7', 'item_7a', 'item_8')
+
+    def text_of(self, name: str, default: str = "") -> str:
+        section = self._by_name.get(name)
+        return self.text[section.start:section.end] if section else default
+
+    def section_at(self, position: int) -> Optional[str]:
+        """Innermost (latest starting) section containing a character offset"""
+        found = None
+        for section in self.sections:
+            if section.start > position:
+                break
+            if position < section.end:
+                found = section.name
+        return found
+
+    def to_list(self) -> List[Dict]:
+        return [
+            {'section': s.name, 'char_start': s.start, 'char_end': s.end,
+             'page_start': s.page_start, 'page_end': s.page_end}
+            for s in self.sections
+        ]
@@ -0,0 +1,182 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from section_index import SectionIndex
+
+# Statement -> (FinancialMetrics field -> row labels, first match wins), matched against the
+# whole normalized row label, so notes and prose lines that merely mention an item never match
+STATEMENT_ROWS: Dict[str, Dict[str, List[str]]] = {
+    'income_statement': {
+        'revenue': [r'total (?:net )?revenues?', r'(?:net )?revenues?', r'revenues?, net',
+                    r'total net sales', r'net sales'],
+        'gross_profit': [r'gross (?:profit|margin)'],
+        'operating_income': [r'(?:total )?(?:income|earnings) from operations', r'operating income(?: \(loss\))?',
+                             r'income \(loss\) from operations'],
+        'net_income': [r'net (?:income|earnings)(?: \(loss\))?', r'net income attributable to .*'],
+    },
+    'balance_sheet': {
+        'cash_and_equivalents': [r'cash and cash equivalents', r'cash and equivalents'],
+        'total_assets': [r'total assets'],
+        'total_liabilities': [r'total liabilities'],
+        'shareholders_equity': [r"total (?:stockholders|shareholders)['’]? equity"],
+    },
+}
+
+# Pages read per statement: statements rarely run longer, and a wrong page range stays cheap
+MAX_PAGES_PER_STATEMENT = 3
+
+# Statements printed from HTML usually have no ruling lines, so when pdfplumber's default
+# (line-based) table finder gets nothing, columns and rows are inferred from word alignment
+TEXT_TABLE_SETTINGS = {"vertical_strategy": "text", "horizontal_strategy": "text"}
+
+TITLES = {
+    'income_statement': re.compile(r'consolidated\s+statements?\s+of\s+(?:comprehensive\s+)?(?:income|operations|earnings)', re.IGNORECASE),
+    'balance_sheet': re.compile(r'consolidated\s+balance\s+sheets?', re.IGNORECASE),
+}
+
+SCALE = re.compile(r'in\s+(thousands|millions|billions)', re.IGNORECASE)
+SCALES = {'thousands': 1_000, 'millions': 1_000_000, 'billions': 1_000_000_000}
+YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+# Optional '$' before or inside the parentheses: "$ 1,234", "(1,234)", "$ (1,234)", "($1,234)", "-1,234"
+AMOUNT = re.compile(r'^\$?\s*\(?\s*-?\$?\s*\d[\d,]*(?:\.\d+)?\s*\)?$')
+
+
+@dataclass
+class StatementPage:
+    """Tables found on one statement page, with the scale and column order stated in its header"""
+    statement: str
+    page_number: int
+    tables: List[List[List[Optional[str]]]] = field(default_factory=list)
+    scale: int = 1
+    latest_first: bool = True  # most recent fiscal year in the first value column
+
+
+def _read_statement_pages(pdf_path: str, requests: List[Tuple[str, int]]) -> List[StatementPage]:
+    """Extract the tables of (statement, 1-based page) pairs with pdfplumber (runs in worker processes)"""
+    import pdfplumber
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for statement, page_number in requests:
+            result = StatementPage(statement, page_number)
+            results.append(result)
+            try:
+                page = pdf.pages[page_number - 1]
+                text = page.extract_text() or ""
+
+                # Start at the statement's title when it is on the page, leaving out text above it
+                title = TITLES[statement]
+                heading = title.search(text)
+                if heading:
+                    text = text[heading.start():]
+                    line = next((line for line in page.extract_text_lines() if title.search(line['text'])), None)
+                    if line is not None:
+                        page = page.crop((0, max(0, line['top'] - 1), page.width, page.height))
+
+                scale = SCALE.search(text)
+                if scale:
+                    result.scale = SCALES[scale.group(1).lower()]
+                for line in text.split('\n'):
+                    years = [int(year) for year in YEAR.findall(line)]
+                    if len(years) >= 2:
+                        result.latest_first = years[0] >= years[-1]
+                        break
+
+                result.tables = page.extract_tables() or page.extract_tables(TEXT_TABLE_SETTINGS)
+            except Exception as e:
+                print(f"Table extraction failed on page {page_number}: {e}")
+    return results
+
+
+def parse_amount(cell: Optional[str]) -> Optional[float]:
+    """Statement amount: "$ 1,234", "1,234.5", "(123)" or "$ (123)" (negative) or a dash for zero"""
+    if cell is None:
+        return None
+    cell = cell.strip()
+    if cell in ('-', '—', '–'):
+        return 0.0
+    if not AMOUNT.match(cell):
+        return None
+    value = float(re.sub(r'[^\d.]', '', cell))
+    return -value if '(' in cell or '-' in cell else value
+
+
+def normalize_label(cell: Optional[str]) -> str:
+    return re.sub(r'\s+', ' ', (cell or "").replace('\n', ' ')).strip(' :.$').lower()
+
+
+class StatementTableExtractor:
+    """Financial metrics from the income statement and balance sheet tables of a 10-K PDF.
+
+    The statement pages come from the filing's SectionIndex, so only those
+    few pages are opened with pdfplumber, spread over worker processes. On
+    each page the table below the statement title is extracted and each row
+    is matched by its label against STATEMENT_ROWS. The value is taken from
+    the most recent fiscal year's column and scaled by the header's "(in
+    millions)" note, instead of taking the first number that follows a
+    keyword anywhere in 300 pages of flattened text.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_pages_per_pool: int = 3):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.min_pages_per_pool = min_pages_per_pool  # fewer pages are read in-process (pool startup costs more)
+        self._rows = {
+            statement: {name: [re.compile(f"(?:{label})$") for label in labels] for name, labels in fields.items()}
+            for statement, fields in STATEMENT_ROWS.items()
+        }
+
+    def statement_pages(self, sections: SectionIndex) -> List[Tuple[str, int]]:
+        """(statement, page number) pairs to read, from the section index's page ranges"""
+        requests = []
+        for statement in STATEMENT_ROWS:
+            section = sections.get(statement)
+            if section is None or section.page_start is None:
+                continue
+            last = min(section.page_end or section.page_start, section.page_start + MAX_PAGES_PER_STATEMENT - 1)
+            requests += [(statement, page) for page in range(section.page_start, last + 1)]
+        return requests
+
+    def read_pages(self, pdf_path: str, requests: List[Tuple[str, int]]) -> List[StatementPage]:
+        if self.workers <= 1 or len(requests) < self.min_pages_per_pool:
+            return _read_statement_pages(pdf_path, requests)
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(requests))) as executor:
+            futures = [executor.submit(_read_statement_pages, pdf_path, [request]) for request in requests]
+            return [page for future in futures for page in future.result()]
+
+    def extract(self, pdf_path: str, sections: SectionIndex) -> Dict[str, float]:
+        """{FinancialMetrics field: value} for the statement rows found (empty when no statement is located)"""
+        requests = self.statement_pages(sections)
+        if not requests:
+            return {}
+        try:
+            pages = self.read_pages(pdf_path, requests)
+        except Exception as e:
+            print(f"Statement table extraction failed: {e}")
+            return {}
+
+        best: Dict[str, Tuple[int, float]] = {}  # field -> (label priority, value)
+        for page in pages:
+            for table in page.tables:
+                for row in table:
+                    self._match_row(page, row, best)
+        return {name: value for name, (_, value) in best.items()}
+
+    def _match_row(self, page: StatementPage, row: List[Optional[str]], best: Dict[str, Tuple[int, float]]):
+        # The label is the first cell with text (tables often start with an empty or indent column),
+        # and only the cells after it are read as amounts
+        column = next((i for i, cell in enumerate(row) if cell and re.search(r'[A-Za-z]', cell)), None)
+        if column is None:
+            return
+        label = normalize_label(row[column])
+        for name, patterns in self._rows[page.statement].items():
+            for priority, pattern in enumerate(patterns):
+                if name in best and best[name][0] <= priority:
+                    break
+                if pattern.match(label):
+                    amounts = [amount for amount in map(parse_amount, row[column + 1:]) if amount is not None]
+                    if amounts:
+                        value = amounts[0] if page.latest_first else amounts[-1]
+                        best[name] = (priority, value * page.scale)
+                    break
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+import numpy as np
+
+
+def stub_embedding(text: str, dimensions: int = 1536) -> List[float]:
+    """Deterministic unit vector derived from the text, so equal texts embed equally"""
+    seed = int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'little')
+    vector = np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class StubEmbeddingServer:
+    """Local stand-in for the Azure OpenAI embeddings endpoint.
+
+    Serves ``POST /openai/deployments/<name>/embeddings`` on localhost.
+    ``rate_limit_every`` makes every Nth request return 429 with a
+    Retry-After header, and any input containing ``reject_marker`` makes
+    its whole request fail with 400, to exercise client retry paths.
+
+    Usage:
+        with StubEmbeddingServer(rate_limit_every=5) as server:
+            client = AzureEmbeddingClient(server.endpoint, "test-key")
+    """
+
+    def __init__(self, dimensions: int = 1536, rate_limit_every: int = 0,
+                 retry_after: float = 0.05, reject_marker: Optional[str] = "__reject__",
+                 latency: float = 0.0, port: int = 0):
+        self.dimensions = dimensions
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.reject_marker = reject_marker
+        self.latency = latency
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+        self._thread = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubEmbeddingServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubEmbeddingServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                stub._handle_post(self, body)
+
+        return Handler
+
+    def _handle_post(self, handler, body: bytes):
+        if not re.match(r'^/openai/deployments/[^/]+/embeddings', handler.path):
+            handler._send_json(404, {'error': {'message': f'Unknown path {handler.path}'}})
+            return
+
+        with self._lock:
+            self.request_count += 1
+            throttle = self.rate_limit_every and self.request_count % self.rate_limit_every == 0
+            if throttle:
+                self.rate_limited_count += 1
+
+        if throttle:
+            handler._send_json(429, {'error': {'message': 'Rate limit exceeded'}},
+                               {'Retry-After': str(self.retry_after)})
+            return
+
+        inputs = json.loads(body or b'{}').get('input', [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        if self.reject_marker and any(self.reject_marker in text for text in inputs):
+            handler._send_json(400, {'error': {'message': 'Input rejected'}})
+            return
+
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+        handler._send_json(200, {
+            'object': 'list',
+            'data': [
+                {'object': 'embedding', 'index': i, 'embedding': stub_embedding(text, self.dimensions)}
+                for i, text in enumerate(inputs)
+            ],
+            'usage': {'prompt_tokens': sum(len(t) // 4 + 1 for t in inputs)}
+        })
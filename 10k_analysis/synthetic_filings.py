@@ -0,0 +1,230 @@
+import random
+import textwrap
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from pdf_text_extractor import PageText, join_pages
+
+# Every Item of Form 10-K, with the share of the filing's pages it gets
+ITEMS: List[Tuple[str, str, float]] = [
+    ("1", "Business", 0.10),
+    ("1A", "Risk Factors", 0.16),
+    ("1B", "Unresolved Staff Comments", 0.005),
+    ("1C", "Cybersecurity", 0.01),
+    ("2", "Properties", 0.01),
+    ("3", "Legal Proceedings", 0.01),
+    ("4", "Mine Safety Disclosures", 0.005),
+    ("5", "Market for Registrant's Common Equity, Related Stockholder Matters and Issuer Purchases of Equity Securities", 0.02),
+    ("6", "[Reserved]", 0.005),
+    ("7", "Management's Discussion and Analysis of Financial Condition and Results of Operations", 0.20),
+    ("7A", "Quantitative and Qualitative Disclosures About Market Risk", 0.02),
+    ("8", "Financial Statements and Supplementary Data", 0.30),
+    ("9", "Changes in and Disagreements With Accountants on Accounting and Financial Disclosure", 0.005),
+    ("9A", "Controls and Procedures", 0.02),
+    ("9B", "Other Information", 0.005),
+    ("10", "Directors, Executive Officers and Corporate Governance", 0.02),
+    ("11", "Executive Compensation", 0.02),
+    ("12", "Security Ownership of Certain Beneficial Owners and Management and Related Stockholder Matters", 0.01),
+    ("13", "Certain Relationships and Related Transactions, and Director Independence", 0.01),
+    ("14", "Principal Accountant Fees and Services", 0.005),
+    ("15", "Exhibits and Financial Statement Schedules", 0.015),
+]
+
+# Sector vocabularies, using the keywords the tools classify industries by
+SECTOR_WORDS: Dict[str, List[str]] = {
+    "Technology": ["software", "cloud", "platform", "digital", "artificial intelligence", "data centers", "subscriptions"],
+    "Healthcare": ["pharmaceutical", "medical", "healthcare", "biotech", "clinical trials", "patients", "therapies"],
+    "Energy": ["oil", "gas", "energy", "renewable", "utilities", "pipelines", "refining"],
+    "Financial Services": ["banking", "insurance", "financial services", "investment", "deposits", "loans", "underwriting"],
+    "Consumer": ["retail", "consumer goods", "food", "beverage", "stores", "brands", "merchandise"],
+}
+
+COMMON_WORDS = ("the company operates services customers markets growth competition regulatory risk products "
+                "segment operations results liquidity capital fiscal net cash assets sales revenue earnings "
+                "management believes future may could adversely affect our business financial condition").split()
+
+LINE_WIDTH = 90
+LINES_PER_PAGE = 40
+
+
+@dataclass
+class SyntheticCompany:
+    """Company a synthetic filing is written for; amounts in millions"""
+    name: str
+    ticker: str
+    sector: str
+    fiscal_year: int
+    revenue: float
+    operating_income: float
+    net_income: float
+    total_assets: float
+    cash: float
+    employees: int
+
+
+def synthetic_company(seed: int = 7) -> SyntheticCompany:
+    rng = random.Random(seed)
+    sector = rng.choice(sorted(SECTOR_WORDS))
+    revenue = round(10 ** rng.uniform(3, 5.5))
+    operating_margin = rng.uniform(0.05, 0.35)
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return SyntheticCompany(
+        name=f"{rng.choice(['Northwind', 'Contoso', 'Fabrikam', 'Litware', 'Tailspin', 'Adatum'])} "
+             f"{rng.choice(['Holdings', 'Systems', 'Industries', 'Group'])}, Inc.",
+        ticker="".join(rng.choice(letters) for _ in range(rng.randint(3, 4))),
+        sector=sector,
+        fiscal_year=rng.randint(2019, 2024),
+        revenue=revenue,
+        operating_income=round(revenue * operating_margin),
+        net_income=round(revenue * operating_margin * rng.uniform(0.6, 0.85)),
+        total_assets=round(revenue * rng.uniform(0.8, 2.5)),
+        cash=round(revenue * rng.uniform(0.05, 0.3)),
+        employees=int(revenue * rng.uniform(1.5, 6)),
+    )
+
+
+def _money(value: float) -> str:
+    return f"{value:,.0f}"
+
+
+class _FilingWriter:
+    """Fills pages of fixed width and height with headings, prose and tables"""
+
+    def __init__(self, company: SyntheticCompany, rng: random.Random):
+        self.company = company
+        self.rng = rng
+        self.words = COMMON_WORDS + SECTOR_WORDS[company.sector] * 3
+        self.pages: List[List[str]] = [[]]
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def line(self, text: str = ""):
+        if len(self.pages[-1]) >= LINES_PER_PAGE:
+            self.pages.append([])
+        self.pages[-1].append(text)
+
+    def block(self, text: str):
+        for line in textwrap.wrap(text, LINE_WIDTH) or [""]:
+            self.line(line)
+        self.line()
+
+    def paragraph(self):
+        rng = self.rng
+        tokens = [rng.choice(self.words) for _ in range(rng.randint(50, 130))]
+        for _ in range(rng.randint(0, 3)):  # prose mentions years, percentages and small amounts
+            tokens.insert(rng.randrange(len(tokens)), rng.choice((
+                str(self.company.fiscal_year - rng.randint(0, 2)), f"{rng.randint(1, 99)}%",
+                f"${rng.randint(1, 999)} million")))
+        self.block(" ".join(tokens).capitalize() + ".")
+
+    def table(self, title: str, rows: List[Tuple[str, float]], growth: float = 0.08):
+        """Three fiscal years of a statement, most recent first"""
+        year = self.company.fiscal_year
+        self.line(title.upper())
+        self.line(f"(in millions){'':<34}{year:>14}{year - 1:>14}{year - 2:>14}")
+        for label, value in rows:
+            self.line(f"{label:<48}$ {_money(value):>12}  $ {_money(value / (1 + growth)):>12}"
+                      f"  $ {_money(value / (1 + growth) ** 2):>12}")
+        self.line()
+
+    def fill_to(self, pages: int):
+        while self.page_count < pages or len(self.pages[-1]) < LINES_PER_PAGE // 2:
+            self.paragraph()
+            if self.page_count > pages:
+                break
+
+
+def synthetic_10k_pages(pages: int = 100, seed: int = 7,
+                        company: Optional[SyntheticCompany] = None) -> List[PageText]:
+    """Deterministic 10-K text of about ``pages`` pages (about 3,600 characters each).
+
+    Has a cover page (name, trading symbol, fiscal year end), a table of
+    contents, every Item heading in order and, in Items 7 and 8, income
+    statement, balance sheet, cash flow and segment tables with figures
+    consistent with ``company``. The same arguments always give the same text.
+    """
+    company = company or synthetic_company(seed)
+    rng = random.Random(seed)
+    writer = _FilingWriter(company, rng)
+    c = company
+
+    writer.block("UNITED STATES SECURITIES AND EXCHANGE COMMISSION Washington, D.C. 20549")
+    writer.block("FORM 10-K")
+    writer.block(f"ANNUAL REPORT PURSUANT TO SECTION 13 OR 15(d) OF THE SECURITIES EXCHANGE ACT OF 1934 "
+                 f"For the fiscal year ended December 31, {c.fiscal_year}")
+    writer.block(f"Commission File Number: 001-{rng.randint(10000, 99999)}")
+    writer.block(f"{c.name.upper()} (Exact name of registrant as specified in its charter)")
+    writer.line("Title of each class  Trading Symbol(s)  Name of each exchange on which registered")
+    writer.line(f"Common Stock, $0.001 par value  {c.ticker}  The Nasdaq Stock Market LLC")
+    writer.line()
+    writer.block(f"Trading symbol: {c.ticker}")
+    writer.line("TABLE OF CONTENTS")
+    for number, title, _ in ITEMS:
+        writer.line(f"Item {number}. {title[:70]}")
+    writer.line()
+
+    budget = max(pages - writer.page_count, len(ITEMS))
+    target = writer.page_count
+    for number, title, share in ITEMS:
+        target += max(budget * share, 0.2)
+        writer.block(f"ITEM {number}. {title.upper()}")
+
+        if number == "1":
+            writer.block(f"{c.name} is a {c.sector.lower()} company. As of December 31, {c.fiscal_year}, "
+                         f"we had approximately {c.employees:,} full-time employees.")
+            writer.block("Competition. The markets for our products are highly competitive.")
+        elif number == "7":
+            writer.block(f"Total revenues $ {_money(c.revenue)} million increased "
+                         f"{rng.randint(2, 25)}% compared with {c.fiscal_year - 1}.")
+            writer.block("Revenues by segment were as follows.")
+            segments = rng.sample(["Products", "Services", "Subscriptions", "International", "Licensing"], 3)
+            shares = [0.5, 0.3, 0.2]
+            writer.table("Revenue by segment", [(name, c.revenue * share) for name, share in zip(segments, shares)])
+        elif number == "8":
+            writer.table("Consolidated statements of income", [
+                ("Total revenues", c.revenue),
+                ("Cost of revenues", c.revenue * 0.45),
+                ("Income from operations", c.operating_income),
+                ("Net income", c.net_income),
+            ])
+            writer.table("Consolidated balance sheets", [
+                ("Cash and cash equivalents", c.cash),
+                ("Total current assets", c.total_assets * 0.4),
+                ("Total assets", c.total_assets),
+                ("Total liabilities", c.total_assets * 0.55),
+                ("Total stockholders' equity", c.total_assets * 0.45),
+            ], growth=0.05)
+            writer.table("Consolidated statements of cash flows", [
+                ("Net cash provided by operating activities", c.net_income * 1.3),
+                ("Net cash used in investing activities", c.net_income * 0.7),
+                ("Net cash used in financing activities", c.net_income * 0.4),
+            ])
+
+        writer.fill_to(int(target))
+    writer.fill_to(pages)
+
+    return [PageText(page_number=i + 1, text="\n".join(lines), extraction_method="synthetic")
+            for i, lines in enumerate(writer.pages)]
+
+
+def synthetic_10k_text(pages: int = 100, seed: int = 7) -> str:
+    return join_pages(synthetic_10k_pages(pages, seed))
+
+
+def write_synthetic_pdf(path: str, pages: int = 100, seed: int = 7) -> str:
+    """Render a synthetic filing to a text PDF, one page per page of text (needs reportlab)"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(path, pagesize=letter)
+    for page in synthetic_10k_pages(pages, seed):
+        text = pdf.beginText(36, letter[1] - 40)
+        text.setFont("Courier", 7)
+        for line in page.text.split("\n"):
+            text.textLine(line)
+        pdf.drawText(text)
+        pdf.showPage()
+    pdf.save()
+    return path
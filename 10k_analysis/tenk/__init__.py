@@ -0,0 +1,19 @@
+"""10-K ingestion and peer analysis as one pipeline with pluggable parts.
+
+- tenk.tool: TenKIngestionTool, the ingestion pipeline and comparable companies queries
+- tenk.credentials: where the service keys come from (KeyCredentials, KeyVaultCredentials)
+- tenk.profiles: what is extracted from a filing (GENERIC, ENHANCED)
+- tenk.interfaces / tenk.registry: the extractor, chunker, embedder and search backend
+  interfaces, and the named implementations the tool is built from
+- tenk.reports: FinancialAnalysisReports
+
+Generic10KIngestionTool and AzureVault10KIngestionTool are this tool with the
+generic profile and direct keys, and the enhanced profile and Key Vault.
+"""
+from tenk.credentials import CredentialProvider, KeyCredentials, KeyVaultCredentials, ServiceKeys
+from tenk.metrics import FinancialMetrics, ValuationMetrics
+from tenk.profiles import ENHANCED, GENERIC, PROFILES, FilingProfile
+from tenk.registry import ComponentRegistry, components
+from tenk.tool import TenKIngestionTool
+from tenk.reports import FinancialAnalysisReports
+
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+# Azure identity and Key Vault are imported when the Key Vault secrets are first read
+if TYPE_CHECKING:
+    from azure_clients import AzureClientRegistry
+    from secret_providers import SecretProvider
+
+# Key Vault secret names (EnvSecretProvider reads them as AZURE_SEARCH_KEY, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_KEY)
+SEARCH_KEY_SECRET = "azure-search-key"
+OPENAI_ENDPOINT_SECRET = "azure-openai-endpoint"
+OPENAI_KEY_SECRET = "azure-openai-key"
+
+
+@dataclass
+class ServiceKeys:
+    """What the tool needs to reach Azure Search and Azure OpenAI"""
+    search_key: Optional[str]
+    openai_endpoint: Optional[str]
+    openai_key: Optional[str]
+
+
+class CredentialProvider:
+    """Source of the service keys; ``search_key`` is False when the search backend needs none (local index)"""
+
+    def resolve(self, search_key: bool = True) -> ServiceKeys:
+        raise NotImplementedError
+
+
+class KeyCredentials(CredentialProvider):
+    """Keys passed in directly (e.g. from AZURE_SEARCH_KEY, AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_KEY)"""
+
+    def __init__(self, search_key: Optional[str], openai_endpoint: Optional[str], openai_key: Optional[str]):
+        self.keys = ServiceKeys(search_key, openai_endpoint, openai_key)
+
+    def resolve(self, search_key: bool = True) -> ServiceKeys:
+        return self.keys
+
+
+class KeyVaultCredentials(CredentialProvider):
+    """Keys stored as Key Vault secrets, read with a service principal.
+
+    Secrets are cached per process (and in an encrypted file with
+    ``secret_cache_path``) for ``secret_cache_ttl`` seconds and refreshed in
+    the background, see secret_providers.CachedSecretProvider. A
+    ``secret_provider`` (e.g. EnvSecretProvider for local runs) replaces Key
+    Vault entirely. The Key Vault client comes from ``client_registry`` (the
+    process-wide one by default).
+    """
+
+    def __init__(self, tenant_id: Optional[str], client_id: Optional[str], client_secret: Optional[str],
+                 key_vault_url: Optional[str], secret_provider: Optional["SecretProvider"] = None,
+                 secret_cache_ttl: float = 3600.0, secret_cache_path: Optional[str] = None,
+                 client_registry: Optional["AzureClientRegistry"] = None):
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.key_vault_url = key_vault_url
+        self.secret_cache_ttl = secret_cache_ttl
+        self.secret_cache_path = secret_cache_path
+        self.client_registry = client_registry
+        self.credential = None
+        self.key_vault_client = None
+        self._secrets = secret_provider
+
+    @property
+    def secrets(self) -> "SecretProvider":
+        """Key Vault secret provider, shared by every tool reading the same vault (created on first use)"""
+        if self._secrets is None:
+            from azure.identity import ClientSecretCredential
+            from azure_clients import get_client_registry
+            from secret_providers import key_vault_secret_provider
+            self.credential = ClientSecretCredential(
+                tenant_id=self.tenant_id,
+                client_id=self.client_id,
+                client_secret=self.client_secret
+            )
+            registry = self.client_registry or get_client_registry()
+            self.key_vault_client = registry.secret_client(self.key_vault_url, self.credential)
+            self._secrets = key_vault_secret_provider(self.key_vault_url, self.key_vault_client,
+                                                      ttl=self.secret_cache_ttl, cache_path=self.secret_cache_path)
+        return self._secrets
+
+    def resolve(self, search_key: bool = True) -> ServiceKeys:
+        try:
+            # All secrets at once (fetched concurrently on a cache miss)
+            names = [OPENAI_ENDPOINT_SECRET, OPENAI_KEY_SECRET] + ([SEARCH_KEY_SECRET] if search_key else [])
+            secrets = self.secrets.get_many(names)
+            print("Successfully read the Azure service keys with Key Vault authentication")
+            return ServiceKeys(secrets.get(SEARCH_KEY_SECRET), secrets[OPENAI_ENDPOINT_SECRET], secrets[OPENAI_KEY_SECRET])
+        except Exception as e:
+            print(f"Error initializing services from Key Vault: {e}")
+            raise
@@ -0,0 +1,57 @@
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Protocol, Sequence
+
+from document_chunk import DocumentChunk
+from pdf_text_extractor import PageText
+
+if TYPE_CHECKING:
+    from embedding_client import EmbeddingResult
+
+# The interfaces each pluggable stage implements. They are structural (Protocols): the existing
+# classes (PDFTextExtractor, SectionChunker, AzureEmbeddingClient, the search index clients) fit them
+# as they are, and a new implementation only needs the same methods to be registered and benchmarked.
+
+
+class PageExtractor(Protocol):
+    """Per-page text of a PDF, in page order"""
+
+    # Implementation, version and settings that change the text (cached extractions are keyed by it)
+    cache_tag: str
+
+    def iter_pages(self, pdf_path: str) -> Iterator[PageText]:
+        """Pages as they are extracted (the ingestion pipeline chunks them while later pages extract)"""
+        ...
+
+    def extract_pages(self, pdf_path: str) -> List[PageText]:
+        ...
+
+
+class Chunker(Protocol):
+    """DocumentChunks with content, section_type, chunk_index, token_count and offsets"""
+
+    def iter_chunks(self, pages: Iterable[PageText]) -> Iterator[DocumentChunk]:
+        """Chunks for a stream of pages, offsets match join_pages(pages)"""
+        ...
+
+    def chunk_text(self, text: str) -> Iterator[DocumentChunk]:
+        ...
+
+
+class Embedder(Protocol):
+    """Vectors for texts in input order, failed items reported rather than replaced"""
+
+    def embed(self, texts: Sequence[str]) -> "EmbeddingResult":
+        ...
+
+
+class SearchBackend(Protocol):
+    """Index management client (Azure SearchIndexClient, or search_backends.LocalSearchIndexClient)"""
+
+    def create_or_update_index(self, index):
+        ...
+
+    def delete_index(self, index_name) -> None:
+        ...
+
+    def get_search_client(self, index_name: str, **kwargs):
+        """Client with search, upload_documents, merge_or_upload_documents and delete_documents"""
+        ...
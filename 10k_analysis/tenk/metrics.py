@@ -0,0 +1,73 @@
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+
+@dataclass
+class FinancialMetrics:
+    """Financial metrics from any company's 10-K (one company index record per filing)"""
+    company_name: str
+    ticker: str
+    filing_year: Optional[int] = None
+    revenue: Optional[float] = None
+    revenue_growth: Optional[float] = None
+    gross_profit: Optional[float] = None
+    operating_income: Optional[float] = None
+    net_income: Optional[float] = None
+    total_assets: Optional[float] = None
+    total_liabilities: Optional[float] = None
+    shareholders_equity: Optional[float] = None
+    cash_and_equivalents: Optional[float] = None
+    employees: Optional[int] = None
+    industry: Optional[str] = None
+    sector: Optional[str] = None
+
+    # Calculated ratios
+    gross_margin: Optional[float] = None
+    operating_margin: Optional[float] = None
+    net_margin: Optional[float] = None
+    roe: Optional[float] = None  # Return on Equity
+    roa: Optional[float] = None  # Return on Assets
+    revenue_per_employee: Optional[float] = None
+
+    def calculate_ratios(self):
+        """Calculate financial ratios from raw metrics"""
+        if self.revenue and self.revenue > 0:
+            if self.gross_profit:
+                self.gross_margin = (self.gross_profit / self.revenue) * 100
+            if self.operating_income:
+                self.operating_margin = (self.operating_income / self.revenue) * 100
+            if self.net_income:
+                self.net_margin = (self.net_income / self.revenue) * 100
+            if self.employees and self.employees > 0:
+                self.revenue_per_employee = self.revenue / self.employees
+
+        if self.net_income and self.shareholders_equity and self.shareholders_equity > 0:
+            self.roe = (self.net_income / self.shareholders_equity) * 100
+
+        if self.net_income and self.total_assets and self.total_assets > 0:
+            self.roa = (self.net_income / self.total_assets) * 100
+
+    def to_dict(self) -> Dict:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+@dataclass
+class ValuationMetrics(FinancialMetrics):
+    """Financial metrics plus leverage and valuation fields (the Key Vault tool's company index schema)"""
+    debt_to_equity: Optional[float] = None
+    current_ratio: Optional[float] = None
+
+    # Valuation metrics (will be calculated based on market data if available)
+    market_cap: Optional[float] = None
+    enterprise_value: Optional[float] = None
+    ev_revenue: Optional[float] = None
+    ev_ebitda: Optional[float] = None
+    price_to_earnings: Optional[float] = None
+    price_to_book: Optional[float] = None
+
+    def calculate_ratios(self):
+        """Calculate financial ratios and valuation metrics from raw data"""
+        super().calculate_ratios()
+
+        if self.total_liabilities and self.shareholders_equity and self.shareholders_equity > 0:
+            self.debt_to_equity = self.total_liabilities / self.shareholders_equity
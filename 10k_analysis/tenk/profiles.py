@@ -0,0 +1,289 @@
+import re
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from industry_classifier import IndustryClassifier
+from metric_extraction import MetricExtractionEngine
+from peer_screening import PeerMatch
+from tenk.metrics import FinancialMetrics, ValuationMetrics
+
+
+@dataclass(frozen=True)
+class FilingProfile:
+    """Everything the two ingestion flavours used to differ in, so one tool can run either.
+
+    ``metrics_class`` is the company index schema, ``metric_patterns`` the
+    MetricExtractionEngine arguments (compiled into ``metric_engine`` on
+    first use), ``section_patterns`` the section heading patterns,
+    ``industry_taxonomy`` the industry_taxonomy.json taxonomy,
+    ``company_info`` reads (company name, ticker) from a filing's text and
+    ``peer_row`` turns a screened peer into a comparable companies row.
+    Paragraphs of up to ``min_paragraph_chars`` - 1 characters are dropped
+    when chunking.
+    """
+    name: str
+    metrics_class: type
+    metric_patterns: Dict[str, Any]
+    section_patterns: List[Tuple[str, str]]
+    industry_taxonomy: str
+    company_info: Callable[[str], Tuple[str, str]]
+    peer_row: Callable[[PeerMatch], Dict[str, Any]]
+    min_paragraph_chars: int = 1
+
+    @cached_property
+    def metric_engine(self) -> MetricExtractionEngine:
+        """Engine compiled once per profile, shared by every tool (commands that only query never build it)"""
+        return MetricExtractionEngine(**self.metric_patterns)
+
+    def industry_classifier(self, taxonomy_path: Optional[str] = None) -> IndustryClassifier:
+        return industry_classifier(self.industry_taxonomy, taxonomy_path)
+
+
+@lru_cache(maxsize=None)
+def industry_classifier(taxonomy: str, path: Optional[str] = None) -> IndustryClassifier:
+    """Classifier for a taxonomy, compiled once per process and shared by every tool"""
+    return IndustryClassifier.from_config(taxonomy, path)
+
+
+def _first_match(patterns: List["re.Pattern"], text: str, default: str) -> str:
+    """First group of the first pattern that matches, stripped"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(1).strip()
+    return default
+
+
+GENERIC_COMPANY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'(.*?)\s*(?:inc\.?|corp\.?|corporation|company|ltd\.?)',
+    r'registrant[:\s]+(.*?)(?:\n|$)',
+    r'company[:\s]+(.*?)(?:\n|$)'
+]]
+
+GENERIC_TICKER_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'trading symbol[:\s]*([A-Z]{1,5})',
+    r'ticker[:\s]*([A-Z]{1,5})',
+    r'nasdaq[:\s]*([A-Z]{1,5})',
+    r'nyse[:\s]*([A-Z]{1,5})'
+]]
+
+
+def generic_company_info(text: str) -> Tuple[str, str]:
+    """Company name (first 2,000 characters) and ticker (first 5,000) of a 10-K, as written"""
+    return (_first_match(GENERIC_COMPANY_PATTERNS, text[:2000], "Unknown Company"),
+            _first_match(GENERIC_TICKER_PATTERNS, text[:5000], "UNK"))
+
+
+ENHANCED_COMPANY_PATTERNS = [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in [
+    r'(?:company name|registrant)[:\s]+(.*?)(?:\n|$)',
+    r'^(.*?)\s*(?:inc\.?|corp\.?|corporation|company|ltd\.?|llc)',
+    r'(?:^|\n)(.*?)\s+form 10-k',
+    r'(?:^|\n)(.*?)\s+annual report'
+]]
+
+ENHANCED_TICKER_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r'(?:trading symbol|ticker symbol|nasdaq|nyse)[:\s]*([A-Z]{1,5})',
+    r'common stock.*?symbol[:\s]*([A-Z]{1,5})',
+    r'\(([A-Z]{2,5})\)\s*common stock'
+]]
+
+_NAME_JUNK = re.compile(r'[^\w\s&.-]')
+
+
+def enhanced_company_info(text: str) -> Tuple[str, str]:
+    """Company name and ticker from the document header (first 3,000 characters), cleaned up.
+
+    Every line a name pattern matches is tried until one leaves more than
+    three characters (and not only digits) once punctuation is stripped;
+    the ticker is upper-cased.
+    """
+    text_start = text[:3000]
+    company_name = "Unknown Company"
+    for pattern in ENHANCED_COMPANY_PATTERNS:
+        for match in pattern.findall(text_start):
+            clean_name = _NAME_JUNK.sub('', match.strip())
+            if len(clean_name) > 3 and not clean_name.isdigit():
+                company_name = clean_name
+                break
+        if company_name != "Unknown Company":
+            break
+
+    return company_name, _first_match(ENHANCED_TICKER_PATTERNS, text_start, "UNK").upper()
+
+
+def generic_peer_row(peer: PeerMatch) -> Dict[str, Any]:
+    """Comparable companies row with size and margins (0 where a metric is missing)"""
+    result = peer.record
+    return {
+        'Company Name': result.get('company_name', 'N/A'),
+        'Ticker': peer.ticker,
+        'Industry': result.get('industry', 'N/A'),
+        'Sector': result.get('sector', 'N/A'),
+        'Revenue ($B)': round(result.get('revenue', 0) / 1_000_000_000, 2) if result.get('revenue') else 0,
+        'Employees': f"{result.get('employees', 0):,}" if result.get('employees') else '0',
+        'Operating Income ($B)': round(result.get('operating_income', 0) / 1_000_000_000, 2) if result.get('operating_income') else 0,
+        'Net Income ($B)': round(result.get('net_income', 0) / 1_000_000_000, 2) if result.get('net_income') else 0,
+        'Gross Margin (%)': round(result.get('gross_margin', 0), 1) if result.get('gross_margin') else 0,
+        'Operating Margin (%)': round(result.get('operating_margin', 0), 1) if result.get('operating_margin') else 0,
+        'Net Margin (%)': round(result.get('net_margin', 0), 1) if result.get('net_margin') else 0,
+        'Revenue/Employee ($K)': round(result.get('revenue_per_employee', 0) / 1000, 0) if result.get('revenue_per_employee') else 0,
+        'Distance': round(peer.distance, 2),
+        'Main Differences': ", ".join(peer.main_differences())
+    }
+
+
+def valuation_peer_row(peer: PeerMatch) -> Dict[str, Any]:
+    """Comparable companies row with valuation multiples ('N/A' where a metric is missing)"""
+    result = peer.record
+    revenue = result.get('revenue', 0)
+    market_cap = result.get('market_cap', 0)
+    enterprise_value = result.get('enterprise_value', 0)
+
+    # Calculate EBITDA approximation (Operating Income + Depreciation estimate)
+    operating_income = result.get('operating_income', 0)
+    ebitda_approx = operating_income * 1.15 if operating_income else 0  # Rough estimate
+
+    return {
+        'Company Name': result.get('company_name', 'N/A'),
+        'Ticker': peer.ticker,
+        'Industry': result.get('industry', 'N/A'),
+        'Revenue ($B)': round(revenue / 1_000_000_000, 2) if revenue else 0,
+        'Employees': f"{result.get('employees', 0):,}" if result.get('employees') else 'N/A',
+        'Market Cap ($B)': round(market_cap / 1_000_000_000, 2) if market_cap else 'N/A',
+        'Enterprise Value ($B)': round(enterprise_value / 1_000_000_000, 2) if enterprise_value else 'N/A',
+        'EV/Revenue': round(enterprise_value / revenue, 1) if enterprise_value and revenue > 0 else 'N/A',
+        'EV/EBITDA': round(enterprise_value / ebitda_approx, 1) if enterprise_value and ebitda_approx > 0 else 'N/A',
+        'Operating Margin (%)': round(result.get('operating_margin', 0), 1) if result.get('operating_margin') else 'N/A',
+        'Net Margin (%)': round(result.get('net_margin', 0), 1) if result.get('net_margin') else 'N/A',
+        'ROE (%)': round(result.get('roe', 0), 1) if result.get('roe') else 'N/A',
+        'Revenue/Employee ($K)': round(result.get('revenue_per_employee', 0) / 1000, 0) if result.get('revenue_per_employee') else 'N/A',
+        'Distance': round(peer.distance, 2),
+        'Main Differences': ", ".join(peer.main_differences())
+    }
+
+
+# Metrics stated with a scale word ("$1,234 million"), any company's 10-K
+GENERIC = FilingProfile(
+    name="generic",
+    metrics_class=FinancialMetrics,
+    metric_patterns=dict(
+        value_patterns={
+            'revenue': [
+                r'(?:total\s+)?(?:net\s+)?revenues?\s*[:\$]*\s*([\d,]+\.?\d*)\s*(million|billion|thousand)?',
+                r'(?:net\s+)?sales\s*[:\$]*\s*([\d,]+\.?\d*)\s*(million|billion|thousand)?',
+                r'consolidated revenues?\s*[:\$]*\s*([\d,]+\.?\d*)\s*(million|billion|thousand)?'
+            ],
+            'operating_income': [
+                r'(?:income from|operating income)\s*[:\$]*\s*([\d,]+\.?\d*)\s*(million|billion|thousand)?',
+                r'operating earnings\s*[:\$]*\s*([\d,]+\.?\d*)\s*(million|billion|thousand)?'
+            ],
+            'net_income': [
+                r'net (?:income|earnings)\s*[:\$]*\s*([\d,]+\.?\d*)\s*(million|billion|thousand)?'
+            ],
+            'total_assets': [
+                r'total assets\s*[:\$]*\s*([\d,]+\.?\d*)\s*(million|billion|thousand)?'
+            ],
+            'cash_and_equivalents': [
+                r'cash and (?:cash equivalents|equivalents)\s*[:\$]*\s*([\d,]+\.?\d*)\s*(million|billion|thousand)?'
+            ]
+        },
+        search_patterns={
+            'filing_year': [
+                r'(?:fiscal year|year ended).*?december 31,?\s*(\d{4})',
+                r'for the year ended.*?(\d{4})',
+                r'annual report.*?(\d{4})',
+                r'form 10-k.*?(\d{4})'
+            ],
+            'employees': [
+                r'(?:approximately\s+)?(\d{1,3}(?:,\d{3})*)\s+(?:full-time\s+)?employees',
+                r'employees?[:\s]*(?:approximately\s+)?(\d{1,3}(?:,\d{3})*)',
+                r'workforce\s+of\s+(?:approximately\s+)?(\d{1,3}(?:,\d{3})*)'
+            ]
+        }
+    ),
+    # Section headings used for chunking, the first matching pattern wins
+    section_patterns=[
+        (r'ITEM\s+1\.\s+BUSINESS', 'business_overview'),
+        (r'ITEM\s+1A\.\s+RISK\s+FACTORS', 'risk_factors'),
+        (r'ITEM\s+7\.\s+MANAGEMENT.S\s+DISCUSSION', 'financial_analysis'),
+        (r'ITEM\s+8\.\s+FINANCIAL\s+STATEMENTS', 'financial_statements'),
+        (r'consolidated\s+balance\s+sheets', 'balance_sheet'),
+        (r'consolidated\s+statements\s+of\s+income', 'income_statement'),
+        (r'(?:revenues?\s+by|segment)', 'revenue_breakdown'),
+        (r'(?:competition|competitive)', 'competitive_analysis')
+    ],
+    industry_taxonomy="generic",
+    company_info=generic_company_info,
+    peer_row=generic_peer_row
+)
+
+# Statement tables without scale words ("million"/"billion" is read from the surrounding text), with the
+# balance sheet totals and valuation fields, more section types and paragraphs of 20 characters or less dropped
+ENHANCED = FilingProfile(
+    name="enhanced",
+    metrics_class=ValuationMetrics,
+    metric_patterns=dict(
+        value_patterns={
+            'revenue': [
+                r'(?:total\s+)?(?:net\s+)?revenues?\s*(?:\(in millions\))?\s*[\$\s]*([\d,]+\.?\d*)',
+                r'(?:net\s+)?sales\s*(?:\(in millions\))?\s*[\$\s]*([\d,]+\.?\d*)',
+                r'consolidated revenues?\s*[\$\s]*([\d,]+\.?\d*)'
+            ],
+            'gross_profit': [
+                r'gross profit\s*[\$\s]*([\d,]+\.?\d*)',
+                r'cost of revenues?\s*[\$\s]*([\d,]+\.?\d*)'  # Will subtract from revenue
+            ],
+            'operating_income': [
+                r'(?:income from operations|operating income)\s*[\$\s]*([\d,]+\.?\d*)',
+                r'operating earnings\s*[\$\s]*([\d,]+\.?\d*)'
+            ],
+            'net_income': [
+                r'net (?:income|earnings)\s*[\$\s]*([\d,]+\.?\d*)'
+            ],
+            'total_assets': [
+                r'total assets\s*[\$\s]*([\d,]+\.?\d*)'
+            ],
+            'total_liabilities': [
+                r'total liabilities\s*[\$\s]*([\d,]+\.?\d*)'
+            ],
+            'shareholders_equity': [
+                r'(?:shareholders\'?\s*equity|stockholders\'?\s*equity)\s*[\$\s]*([\d,]+\.?\d*)'
+            ],
+            'cash_and_equivalents': [
+                r'cash and (?:cash equivalents|equivalents)\s*[\$\s]*([\d,]+\.?\d*)'
+            ]
+        },
+        search_patterns={
+            'filing_year': [
+                r'(?:fiscal year|year ended).*?december 31,?\s*(\d{4})',
+                r'for the year ended.*?(\d{4})',
+                r'annual report.*?(\d{4})'
+            ],
+            'employees': [
+                r'(?:approximately\s+)?(\d{1,3}(?:,\d{3})*)\s+(?:full-time\s+)?employees',
+                r'employees?[:\s]*(?:approximately\s+)?(\d{1,3}(?:,\d{3})*)',
+                r'workforce\s+of\s+(?:approximately\s+)?(\d{1,3}(?:,\d{3})*)'
+            ]
+        },
+        scale_window=100
+    ),
+    section_patterns=[
+        (r'ITEM\s+1\.\s+BUSINESS', 'business_overview'),
+        (r'ITEM\s+1A\.\s+RISK\s+FACTORS', 'risk_factors'),
+        (r'ITEM\s+7\.\s+MANAGEMENT.S\s+DISCUSSION', 'financial_analysis'),
+        (r'ITEM\s+8\.\s+FINANCIAL\s+STATEMENTS', 'financial_statements'),
+        (r'consolidated\s+balance\s+sheets', 'balance_sheet'),
+        (r'consolidated\s+statements\s+of\s+income', 'income_statement'),
+        (r'consolidated\s+statements\s+of\s+cash\s+flows', 'cash_flow'),
+        (r'(?:revenues?\s+by|segment\s+information)', 'revenue_breakdown'),
+        (r'(?:competition|competitive\s+environment)', 'competitive_analysis'),
+        (r'(?:products\s+and\s+services)', 'products_services')
+    ],
+    industry_taxonomy="enhanced",
+    company_info=enhanced_company_info,
+    peer_row=valuation_peer_row,
+    min_paragraph_chars=21
+)
+
+PROFILES = {profile.name: profile for profile in (GENERIC, ENHANCED)}
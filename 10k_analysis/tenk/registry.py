@@ -0,0 +1,113 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from pdf_text_extractor import PDFTextExtractor
+from section_chunker import SectionChunker
+from search_backends import create_search_index_client
+from tenk.credentials import KeyCredentials, KeyVaultCredentials
+
+
+class ComponentRegistry:
+    """Named factories for each pluggable part of the pipeline.
+
+    The ingestion tool builds its components by name (``extractor="pdf"``,
+    ``chunker="section"``, ...), so a new implementation is registered once
+    and can then be selected by configuration, or timed against the others
+    on the same filing (python bench_components.py). Factories take keyword
+    options only; the tool passes these for each kind:
+
+    - credentials: whatever the provider's constructor takes (the tool is given a built provider)
+    - extractor: ``workers`` -> tenk.interfaces.PageExtractor
+    - chunker: ``profile`` (tenk.profiles.FilingProfile), ``chunk_tokens``,
+      ``overlap_tokens``, ``token_counter`` -> tenk.interfaces.Chunker
+    - embedder: ``endpoint``, ``api_key``, ``deployment``, ``max_in_flight``,
+      ``max_batch_tokens``, ``token_counter``, ``clients`` (AzureClientRegistry)
+      -> tenk.interfaces.Embedder
+    - search_backend: ``endpoint``, ``search_key``, ``local_dir``, ``clients``
+      (None for the process-wide registry) -> tenk.interfaces.SearchBackend
+    """
+
+    KINDS = ('credentials', 'extractor', 'chunker', 'embedder', 'search_backend')
+
+    def __init__(self):
+        self._factories: Dict[str, Dict[str, Callable[..., Any]]] = {kind: {} for kind in self.KINDS}
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, name: str, factory: Optional[Callable[..., Any]] = None):
+        """Register ``factory`` as ``name`` for ``kind`` (replacing any previous one); usable as a decorator"""
+        if kind not in self._factories:
+            raise ValueError(f"Unknown component kind: {kind!r} (expected one of {', '.join(self.KINDS)})")
+
+        def add(factory: Callable[..., Any]) -> Callable[..., Any]:
+            with self._lock:
+                self._factories[kind][name] = factory
+            return factory
+
+        return add(factory) if factory is not None else add
+
+    def create(self, kind: str, name: str, **options) -> Any:
+        factories = self._factories.get(kind)
+        if factories is None:
+            raise ValueError(f"Unknown component kind: {kind!r} (expected one of {', '.join(self.KINDS)})")
+        if name not in factories:
+            raise ValueError(f"Unknown {kind}: {name!r} (registered: {', '.join(self.names(kind)) or 'none'})")
+        return factories[name](**options)
+
+    def names(self, kind: str) -> List[str]:
+        return sorted(self._factories.get(kind, {}))
+
+
+# Process-wide registry the ingestion tool builds its components from
+components = ComponentRegistry()
+
+components.register('credentials', 'key', KeyCredentials)
+components.register('credentials', 'key-vault', KeyVaultCredentials)
+
+
+@components.register('extractor', 'pdf')
+def pdf_extractor(workers: Optional[int] = None) -> PDFTextExtractor:
+    """PyPDF2 with per-page pdfplumber fallback, page ranges fanned out over a process pool"""
+    return PDFTextExtractor(workers=workers)
+
+
+@components.register('extractor', 'pdf-serial')
+def serial_pdf_extractor(workers: Optional[int] = None) -> PDFTextExtractor:
+    """Same extraction in the calling process (no pool start-up, faster for short PDFs)"""
+    return PDFTextExtractor(workers=1)
+
+
+@components.register('chunker', 'section')
+def section_chunker(profile, chunk_tokens: int = 375, overlap_tokens: int = 50, token_counter=None) -> SectionChunker:
+    """Streaming chunker on the profile's section headings, with a token budget per chunk"""
+    options = {'token_counter': token_counter} if token_counter is not None else {}
+    return SectionChunker(profile.section_patterns, chunk_tokens=chunk_tokens, overlap_tokens=overlap_tokens,
+                          min_paragraph_chars=profile.min_paragraph_chars, **options)
+
+
+@components.register('embedder', 'azure-openai')
+def azure_openai_embedder(endpoint: str, api_key: str, deployment: str = "text-embedding-ada-002",
+                          max_in_flight: int = 8, max_batch_tokens: int = 8000, token_counter=None, clients=None):
+    """Concurrent Azure OpenAI embeddings client over the registry's pooled session for the endpoint"""
+    from embedding_client import AzureEmbeddingClient
+    options = {'token_counter': token_counter} if token_counter is not None else {}
+    if clients is not None:
+        options['session'] = clients.session(endpoint, pool_size=max_in_flight)
+    return AzureEmbeddingClient(endpoint, api_key, deployment=deployment, max_in_flight=max_in_flight,
+                                max_batch_tokens=max_batch_tokens, **options)
+
+
+@components.register('search_backend', 'azure')
+def azure_search_backend(endpoint: str, search_key: Optional[str] = None, local_dir: Optional[str] = None,
+                         clients=None):
+    """Azure Search index client, pooled through the client registry"""
+    from azure.core.credentials import AzureKeyCredential
+    return create_search_index_client("azure", endpoint=endpoint,
+                                      credential=AzureKeyCredential(search_key) if search_key else None,
+                                      registry=clients)
+
+
+@components.register('search_backend', 'local')
+def local_search_backend(endpoint: Optional[str] = None, search_key: Optional[str] = None,
+                         local_dir: str = ".local_search_index", clients=None):
+    """In-process local index (numpy), for offline runs and CI"""
+    return create_search_index_client("local", local_dir=local_dir)
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from company_index import find_latest_filings, latest_filings
+from tenk.tool import TenKIngestionTool
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class FinancialAnalysisReports:
+    """Analysis reports over the indexes of an ingestion tool (either profile)"""
+    
+    def __init__(self, search_tool: TenKIngestionTool):
+        self.tool = search_tool
+    
+    def generate_company_analysis(self, company_name: str) -> Dict[str, Any]:
+        """Generate comprehensive analysis for a specific company"""
+        
+        search_client = self.tool.get_search_client()
+        
+        # Company record (metrics) of the most recent filing
+        query = f"company_name:{company_name}"
+        records = latest_filings(self.tool.get_company_client().search(
+            search_text=query,
+            select="company_key,company_name,ticker,industry,sector,filing_year,revenue,operating_income,net_income,"
+                   "employees,gross_margin,operating_margin,net_margin,revenue_per_employee",
+            top=5
+        ))
+        
+        if not records:
+            return {"error": f"Company '{company_name}' not found"}
+        
+        company_data = records[0]
+        
+        # Find key business insights among that filing's chunks
+        def section_chunks(section_type: str, count: int) -> List[Dict]:
+            return list(search_client.search(
+                search_text="*",
+                filter=f"company_key eq '{company_data['company_key']}' and section_type eq '{section_type}'",
+                select="content,page_start",
+                order_by=["chunk_index asc"],
+                top=count
+            ))
+        
+        def excerpt(section: Dict, length: int = 200) -> str:
+            page = f" (p. {section['page_start']})" if section.get('page_start') else ""
+            return section.get('content', '')[:length] + "..." + page
+        
+        # The three section queries are independent, so they run concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            business = executor.submit(section_chunks, 'business_overview', 3)
+            risks = executor.submit(section_chunks, 'risk_factors', 3)
+            financials = executor.submit(section_chunks, 'financial_analysis', 2)
+            business_sections, risk_sections, financial_sections = business.result(), risks.result(), financials.result()
+        
+        analysis = {
+            "company_overview": {
+                "name": company_data.get('company_name'),
+                "ticker": company_data.get('ticker'),
+                "industry": company_data.get('industry'),
+                "sector": company_data.get('sector'),
+                "filing_year": company_data.get('filing_year')
+            },
+            "financial_metrics": {
+                "revenue_billions": round((company_data.get('revenue') or 0) / 1_000_000_000, 2),
+                "operating_income_billions": round((company_data.get('operating_income') or 0) / 1_000_000_000, 2),
+                "net_income_billions": round((company_data.get('net_income') or 0) / 1_000_000_000, 2),
+                "employees": company_data.get('employees'),
+                "gross_margin_percent": company_data.get('gross_margin'),
+                "operating_margin_percent": company_data.get('operating_margin'),
+                "net_margin_percent": company_data.get('net_margin'),
+                "revenue_per_employee": company_data.get('revenue_per_employee')
+            },
+            "business_highlights": [excerpt(section) for section in business_sections[:3]],
+            "key_risks": [excerpt(section) for section in risk_sections[:3]],
+            "financial_analysis": [excerpt(section) for section in financial_sections[:2]]
+        }
+        
+        return analysis
+    
+    def compare_financial_metrics(self, companies: List[str]) -> "pd.DataFrame":
+        """Compare key financial metrics across multiple companies (resolved together, see find_latest_filings)"""
+        import pandas as pd
+        
+        found = find_latest_filings(
+            self.tool.get_company_client(), companies,
+            select=["revenue", "employees", "operating_income", "net_income", "gross_margin",
+                    "operating_margin", "net_margin"]
+        )
+        
+        comparison_data = []
+        
+        for company in companies:
+            result = found.get(company.strip())
+            if result:
+                comparison_data.append({
+                    "Company": result.get('company_name', 'N/A'),
+                    "Ticker": result.get('ticker', 'N/A'),
+                    "Revenue ($B)": round((result.get('revenue') or 0) / 1_000_000_000, 2),
+                    "Operating Income ($B)": round((result.get('operating_income') or 0) / 1_000_000_000, 2),
+                    "Net Income ($B)": round((result.get('net_income') or 0) / 1_000_000_000, 2),
+                    "Employees": f"{result.get('employees') or 0:,}",
+                    "Gross Margin (%)": round((result.get('gross_margin') or 0), 1),
+                    "Operating Margin (%)": round((result.get('operating_margin') or 0), 1),
+                    "Net Margin (%)": round((result.get('net_margin') or 0), 1)
+                })
+        
+        return pd.DataFrame(comparison_data)
+    
+    def generate_valuation_comparison_table(self, companies: List[str]) -> "pd.DataFrame":
+        """Generate comprehensive valuation comparison table (companies resolved together, see find_latest_filings).
+        
+        Needs the valuation fields of the enhanced profile's company index.
+        """
+        import pandas as pd
+        
+        # Only the metric fields the table uses, not the whole record with its centroid vectors
+        found = find_latest_filings(
+            self.tool.get_company_client(), companies,
+            select=["revenue", "net_income", "operating_income", "total_assets", "shareholders_equity",
+                    "employees", "market_cap", "enterprise_value"]
+        )
+        
+        comparison_data = []
+        
+        for company in companies:
+            result = found.get(company.strip())
+            if result:
+                
+                # Extract all financial data
+                revenue = result.get('revenue', 0)
+                net_income = result.get('net_income', 0)
+                operating_income = result.get('operating_income', 0)
+                total_assets = result.get('total_assets', 0)
+                shareholders_equity = result.get('shareholders_equity', 0)
+                employees = result.get('employees', 0)
+                market_cap = result.get('market_cap', 0)
+                enterprise_value = result.get('enterprise_value', 0)
+                
+                # Calculate derived metrics
+                ebitda_approx = operating_income * 1.15 if operating_income else 0
+                
+                comparison_data.append({
+                    'Company Name': result.get('company_name', 'N/A'),
+                    'Ticker': result.get('ticker', 'N/A'),
+                    'Revenue ($B)': round(revenue / 1_000_000_000, 2) if revenue else 0,
+                    'Employees': employees if employees else 0,
+                    'Market Cap ($B)': round(market_cap / 1_000_000_000, 2) if market_cap else 'TBD',
+                    'Enterprise Value ($B)': round(enterprise_value / 1_000_000_000, 2) if enterprise_value else 'TBD',
+                    'EV/Revenue': round(enterprise_value / revenue, 1) if enterprise_value and revenue > 0 else 'TBD',
+                    'EV/EBITDA': round(enterprise_value / ebitda_approx, 1) if enterprise_value and ebitda_approx > 0 else 'TBD'
+                })
+        
+        return pd.DataFrame(comparison_data)
+    
+    def export_analysis_report(self, reference_company: str, output_file: str = None):
+        """Export comprehensive analysis report"""
+        
+        if not output_file:
+            output_file = f"{reference_company.replace(' ', '_')}_analysis_report.csv"
+        
+        # Get comparable companies
+        comparable_df = self.tool.find_comparable_companies(reference_company, top_companies=15)
+        
+        if not comparable_df.empty:
+            comparable_df.to_csv(output_file, index=False)
+            print(f"Analysis report exported to: {output_file}")
+            return output_file
+        else:
+            print("No data available for export")
+            return None
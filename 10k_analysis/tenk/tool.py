@@ -0,0 +1,891 @@
+import os
+import time
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from pdf_text_extractor import PageText, join_pages
+from extraction_cache import CachedExtraction, ExtractionCache, file_sha256, load_or_extract, stream_or_extract
+from embedding_cache import EmbeddingCache, embedding_key
+from tokenization import DEFAULT_ENCODING, get_token_counter
+from section_index import COVER_CHARS, SectionIndex
+from metric_extraction import MetricExtractionEngine
+from industry_classifier import IndustryClassifier
+from statement_tables import StatementTableExtractor
+from document_chunk import DocumentChunk, FilingSource
+from search_uploader import SearchUploader
+from company_index import SectionCentroids, company_index_fields, company_key, company_record, latest_filings
+from peer_screening import PeerScreener
+from ingest_manifest import IngestManifest, IngestedFiling, text_fingerprint
+from pipeline_metrics import NULL_TRACE, PipelineMetrics
+from tenk.credentials import CredentialProvider
+from tenk.interfaces import Chunker, Embedder, PageExtractor, SearchBackend
+from tenk.metrics import FinancialMetrics
+from tenk.profiles import GENERIC, PROFILES, FilingProfile
+from tenk.registry import ComponentRegistry, components
+
+# pandas, the Azure SDKs, the PDF libraries and the HTTP client are imported by the stages (and component
+# factories) that use them, so a command that only reads the manifest or queries the indexes does not load them
+# (see bench_startup.py)
+if TYPE_CHECKING:
+    import pandas as pd
+    from azure.search.documents import SearchClient
+    from azure.search.documents.indexes.models import SearchIndex
+    from azure_clients import AzureClientRegistry
+
+# The profiles read company name and ticker from the first few thousand characters of a filing, so streamed
+# chunks are labelled once this much text is extracted instead of after the last page
+HEADER_CHARS = COVER_CHARS
+
+
+class TenKIngestionTool:
+    """10-K ingestion and peer analysis: one pipeline for every credential source and filing profile.
+
+    Where the keys come from is a ``credentials`` provider (tenk.credentials:
+    keys given directly, or Key Vault secrets), and what is extracted from
+    a filing a ``profile`` (tenk.profiles: the generic metrics, or the
+    enhanced ones with valuation fields). The PDF extractor, chunker,
+    embedder and search backend are built by name from ``component_registry``
+    (tenk.registry), so an alternative implementation is registered once
+    and selected here.
+    """
+    
+    def __init__(self,
+                 credentials: CredentialProvider,
+                 azure_search_endpoint: Optional[str] = None,
+                 profile: Union[str, FilingProfile] = GENERIC,
+                 extractor: str = "pdf",
+                 chunker: str = "section",
+                 embedder: str = "azure-openai",
+                 search_backend: str = "azure",
+                 embedding_model: str = "text-embedding-ada-002",
+                 extraction_workers: Optional[int] = None,
+                 use_extraction_cache: bool = True,
+                 extraction_cache_dir: str = ".extraction_cache",
+                 extraction_cache_max_mb: int = 1024,
+                 use_embedding_cache: bool = True,
+                 embedding_cache_dir: str = ".embedding_cache",
+                 embedding_max_in_flight: int = 8,
+                 embedding_batch_tokens: int = 8000,
+                 chunk_tokens: int = 375,
+                 chunk_overlap_tokens: int = 50,
+                 upload_max_in_flight: int = 4,
+                 local_index_dir: str = ".local_search_index",
+                 max_screened_companies: int = 50000,
+                 manifest_path: str = ".ingest_manifest.json",
+                 collect_pipeline_metrics: bool = False,
+                 pipeline_metrics_path: Optional[str] = None,
+                 industry_taxonomy_path: Optional[str] = None,
+                 statement_tables: bool = False,
+                 token_encoding: str = DEFAULT_ENCODING,
+                 client_registry: Optional["AzureClientRegistry"] = None,
+                 component_registry: ComponentRegistry = components):
+        
+        # Metrics schema, patterns, taxonomy and peer table of the filings this tool ingests
+        # (industry_taxonomy_path: a taxonomy config file instead of the shared default one)
+        self.profile = PROFILES[profile] if isinstance(profile, str) else profile
+        self.industry_taxonomy_path = industry_taxonomy_path
+        
+        # Azure SDK clients and HTTP sessions, pooled per endpoint and shared with every other tool and report
+        # (the process-wide registry unless one is given, see the clients property)
+        self._clients = client_registry
+        self.components = component_registry
+        
+        # Service keys (the local search index needs no search key)
+        self.credentials = credentials
+        keys = credentials.resolve(search_key=search_backend == "azure")
+        
+        # Index management client: Azure Search, or the in-process local index ("local") for offline runs and CI
+        self.search_backend = search_backend
+        self.search_client: SearchBackend = component_registry.create(
+            'search_backend', search_backend,
+            endpoint=azure_search_endpoint,
+            search_key=keys.search_key,
+            local_dir=local_index_dir,
+            clients=client_registry
+        )
+        
+        self.embedding_model = embedding_model
+        
+        # Token counts for chunk budgets and embedding batches, from the embedding model's BPE encoding (memoized)
+        self.token_counter = get_token_counter(token_encoding)
+        
+        # Embeddings client (concurrent Azure OpenAI by default), created when the first chunks are embedded
+        self.embedder_name = embedder
+        self._embedding_settings = {
+            "endpoint": keys.openai_endpoint,
+            "api_key": keys.openai_key,
+            "deployment": embedding_model,
+            "max_in_flight": embedding_max_in_flight,
+            "max_batch_tokens": embedding_batch_tokens
+        }
+        self._embedding_client = None
+        
+        self.index_name = "financial-reports-index"
+        
+        # One row per (ticker, filing year) with the filing's metrics; chunks reference it by company_key
+        self.company_index_name = "financial-companies-index"
+        
+        # Index clients, created on first use and shared by uploads and queries
+        self._documents_client = None
+        self._company_client = None
+        
+        # Peer screening matrix over all companies, rebuilt after new filings are indexed
+        self.max_screened_companies = max_screened_companies
+        self._peer_screener = None
+        
+        # Filings already in the index (by content fingerprint), for incremental re-ingestion
+        self.manifest = IngestManifest(manifest_path)
+        
+        # Per-stage timings and counters for each filing (one JSON line per filing in pipeline_metrics_path)
+        self.pipeline_metrics = PipelineMetrics(
+            enabled=collect_pipeline_metrics or pipeline_metrics_path is not None,
+            records_path=pipeline_metrics_path
+        )
+        self.upload_max_in_flight = upload_max_in_flight
+        
+        # Per-page PDF extraction (by default fanned out over a process pool, None = one worker per core)
+        self.extractor: PageExtractor = component_registry.create('extractor', extractor, workers=extraction_workers)
+        
+        # Statement values read from the income statement and balance sheet tables of the PDF (pdfplumber),
+        # with the text patterns only as a fallback for rows the tables do not have
+        self.statement_table_extractor = StatementTableExtractor(workers=extraction_workers) if statement_tables else None
+        
+        # Extracted pages are cached on disk by PDF hash, so re-runs skip the PDF stage
+        self.extraction_cache = (
+            ExtractionCache(extraction_cache_dir, max_size_mb=extraction_cache_max_mb)
+            if use_extraction_cache else None
+        )
+        
+        # Embeddings are cached locally by (model, normalized text), only misses go to the API
+        self.embedding_cache = (
+            EmbeddingCache(embedding_cache_dir, model=embedding_model)
+            if use_embedding_cache else None
+        )
+        
+        # Streaming chunker with a token budget per chunk (same token counts the embedding client batches by)
+        self.chunker: Chunker = component_registry.create('chunker', chunker, profile=self.profile,
+                                                          chunk_tokens=chunk_tokens,
+                                                          overlap_tokens=chunk_overlap_tokens,
+                                                          token_counter=self.token_counter)
+    
+    @property
+    def metric_engine(self) -> MetricExtractionEngine:
+        """The profile's compiled metric patterns (built by the first filing analyzed)"""
+        return self.profile.metric_engine
+    
+    @property
+    def industry_classifier(self) -> IndustryClassifier:
+        """The profile's industry classifier, compiled once per taxonomy file"""
+        return self.profile.industry_classifier(self.industry_taxonomy_path)
+    
+    @property
+    def clients(self) -> "AzureClientRegistry":
+        """Pooled Azure SDK clients and HTTP sessions (imported on first use, with the Azure SDKs)"""
+        if self._clients is None:
+            from azure_clients import get_client_registry
+            self._clients = get_client_registry()
+        return self._clients
+    
+    @property
+    def embedding_client(self) -> Embedder:
+        """Embeddings client, created when the first chunks are embedded (query-only runs never need it)"""
+        if self._embedding_client is None:
+            self._embedding_client = self.components.create('embedder', self.embedder_name, **self._embedding_settings,
+                                                    token_counter=self.token_counter, clients=self.clients)
+        return self._embedding_client
+    
+    def extract_text_from_pdf(self, pdf_path: str) -> str:
+        """Extract text from PDF (PyPDF2 with per-page pdfplumber fallback by default)"""
+        
+        pages = self.extract_pages_from_pdf(pdf_path)
+        
+        failed_pages = [page.page_number for page in pages if page.extraction_method == "none"]
+        if failed_pages:
+            print(f"No text extracted from {len(failed_pages)} page(s): {failed_pages[:10]}")
+        
+        return join_pages(pages)
+    
+    def extract_pages_from_pdf(self, pdf_path: str) -> List[PageText]:
+        """Extract per-page text in page order"""
+        
+        return self.extractor.extract_pages(pdf_path)
+    
+    def load_pdf_pages(self, pdf_path: str) -> CachedExtraction:
+        """Per-page text for a PDF, served from the extraction cache when possible"""
+        
+        return load_or_extract(pdf_path, self.extractor, self.extraction_cache)
+    
+    def extract_company_info(self, text: str) -> Tuple[str, str]:
+        """Extract company name and ticker from 10-K document (as the profile reads them)"""
+        
+        return self.profile.company_info(text)
+    
+    def classify_industry(self, text: str, sections: Optional[SectionIndex] = None) -> Tuple[str, str]:
+        """Classify company industry based on business description"""
+        
+        return self.industry_classifier.classify(text, sections)
+    
+    def extract_financial_metrics(self, text: str, company_name: str, ticker: str,
+                                  sections: Optional[SectionIndex] = None,
+                                  pdf_path: Optional[str] = None) -> FinancialMetrics:
+        """Extract financial metrics (the profile's metrics class) from a company's 10-K"""
+        
+        metrics = self.profile.metrics_class(company_name=company_name, ticker=ticker)
+        
+        # Extract industry classification
+        industry, sector = self.classify_industry(text, sections)
+        metrics.industry = industry
+        metrics.sector = sector
+        
+        # Income statement and balance sheet values from the statement tables, when enabled and located
+        table_values = {}
+        if self.statement_table_extractor is not None and pdf_path and sections is not None:
+            table_values = self.statement_table_extractor.extract(pdf_path, sections)
+            print(f"Statement tables: {len(table_values)} values ({', '.join(table_values) or 'none'})")
+        
+        # Filing year, employee count and the remaining financial values from one scan of the text
+        for field, value in self.metric_engine.extract(text, sections, skip_fields=table_values).items():
+            setattr(metrics, field, value)
+        for field, value in table_values.items():
+            setattr(metrics, field, value)
+        
+        # Calculate derived metrics
+        metrics.calculate_ratios()
+        
+        return metrics
+    
+    def chunk_document_by_sections(self, text: str, company_name: str, ticker: str,
+                                   pages: Optional[List[PageText]] = None,
+                                   filing_id: Optional[str] = None,
+                                   source_file: Optional[str] = None) -> List[DocumentChunk]:
+        """Chunk 10-K document by logical sections (with page numbers when the pages are given)"""
+        
+        chunks = self.chunker.iter_chunks(pages) if pages is not None else self.chunker.chunk_text(text)
+        return self.label_chunks(list(chunks), company_name, ticker, filing_id or text_fingerprint(text), source_file)
+    
+    def label_chunks(self, chunks: List[DocumentChunk], company_name: str, ticker: str, filing_id: str,
+                     source_file: Optional[str] = None) -> List[DocumentChunk]:
+        """Point chunks at their filing (fingerprint, company fields and PDF name), shared by all of them"""
+        
+        filing = FilingSource(filing_id, company_name, ticker, os.path.basename(source_file) if source_file else None)
+        for chunk in chunks:
+            chunk.filing = filing
+        return chunks
+    
+    def generate_embeddings(self, texts: List[str], trace=NULL_TRACE) -> List[Optional[List[float]]]:
+        """Generate embeddings, reusing cached vectors and de-duplicating repeated texts.
+        
+        Texts whose embedding failed come back as None rather than as placeholder vectors.
+        Time, cache hits, tokens sent and API calls are recorded on ``trace``.
+        """
+        
+        with trace.stage('embed'):
+            embeddings = self.embedding_cache.get_many(texts) if self.embedding_cache is not None else [None] * len(texts)
+            keys = [embedding_key(self.embedding_model, text) for text in texts]
+            
+            # Only send each distinct missing text to the API once
+            missing = {}
+            for key, text, vector in zip(keys, texts, embeddings):
+                if vector is None:
+                    missing.setdefault(key, text)
+            
+            trace.count('embed', texts=len(texts), cache_hits=len(texts) - sum(v is None for v in embeddings))
+            if not missing:
+                return embeddings
+            
+            print(f"Embedding cache: {len(texts) - sum(v is None for v in embeddings)} hits, "
+                  f"{len(missing)} unique texts to embed")
+            missing_texts = list(missing.values())
+            fetched = dict(zip(missing, self._request_embeddings(missing_texts, trace)))
+            
+            if self.embedding_cache is not None:
+                succeeded = [(text, fetched[key]) for key, text in missing.items() if fetched[key] is not None]
+                if succeeded:
+                    self.embedding_cache.put_many([t for t, _ in succeeded], [v for _, v in succeeded])
+            
+            return [
+                vector if vector is not None else fetched[key]
+                for key, vector in zip(keys, embeddings)
+            ]
+    
+    def _request_embeddings(self, texts: List[str], trace=NULL_TRACE) -> List[Optional[List[float]]]:
+        """Embed texts through the embedder, None for items that failed"""
+        
+        result = self.embedding_client.embed(texts)
+        if trace.enabled:
+            trace.count('embed', api_texts=len(texts), api_tokens=sum(map(self.token_counter, texts)),
+                        api_calls=result.api_calls, retries=result.retries, failed=len(result.failures))
+        
+        if result.failures:
+            first_error = next(iter(result.failures.values()))
+            print(f"Embedding failed for {len(result.failures)} of {len(texts)} texts "
+                  f"({result.api_calls} API calls, {result.retries} retries): {first_error}")
+        
+        return result.vectors
+    
+    def create_search_index(self, recreate: bool = False):
+        """Create (or update) the chunk index and the company (per-filing metrics) index.
+        
+        Existing documents are kept, so new filings can be added incrementally.
+        ``recreate`` deletes both indexes first and clears the ingest manifest.
+        """
+        from azure.search.documents.indexes.models import (
+            SearchIndex, SimpleField, SearchableField, VectorSearch,
+            VectorSearchProfile, HnswAlgorithmConfiguration, SearchField, SearchFieldDataType
+        )
+        
+        fields = [
+            # Core document fields
+            SimpleField(name="id", type=SearchFieldDataType.String, key=True),
+            SimpleField(name="company_key", type=SearchFieldDataType.String, filterable=True),
+            SimpleField(name="filing_id", type=SearchFieldDataType.String, filterable=True),
+            SearchableField(name="company_name", type=SearchFieldDataType.String, 
+                          filterable=True, facetable=True),
+            SearchableField(name="ticker", type=SearchFieldDataType.String, 
+                          filterable=True, facetable=True),
+            SimpleField(name="filing_year", type=SearchFieldDataType.Int32, 
+                       filterable=True, sortable=True, facetable=True),
+            SearchableField(name="section_type", type=SearchFieldDataType.String, 
+                          filterable=True, facetable=True),
+            SearchableField(name="industry", type=SearchFieldDataType.String, 
+                          filterable=True, facetable=True),
+            SearchableField(name="sector", type=SearchFieldDataType.String, 
+                          filterable=True, facetable=True),
+            SearchableField(name="content", type=SearchFieldDataType.String),
+            
+            # Vector field
+            SearchField(
+                name="content_vector",
+                type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+                searchable=True,
+                vector_search_dimensions=1536,
+                vector_search_profile_name="vector-profile"
+            ),
+            
+            # Metadata
+            SimpleField(name="chunk_index", type=SearchFieldDataType.Int32, 
+                       filterable=True, sortable=True),
+            SimpleField(name="source_file", type=SearchFieldDataType.String, filterable=True),
+            SimpleField(name="page_start", type=SearchFieldDataType.Int32, 
+                       filterable=True, sortable=True),
+            SimpleField(name="page_end", type=SearchFieldDataType.Int32, filterable=True),
+            SimpleField(name="ingestion_timestamp", type=SearchFieldDataType.DateTimeOffset, 
+                       filterable=True, sortable=True)
+        ]
+        
+        # Vector search configuration
+        vector_search = VectorSearch(
+            profiles=[
+                VectorSearchProfile(
+                    name="vector-profile",
+                    algorithm_configuration_name="hnsw-config"
+                )
+            ],
+            algorithms=[
+                HnswAlgorithmConfiguration(
+                    name="hnsw-config",
+                    parameters={
+                        "m": 4,
+                        "efConstruction": 400,
+                        "efSearch": 500,
+                        "metric": "cosine"
+                    }
+                )
+            ]
+        )
+        
+        index = SearchIndex(
+            name=self.index_name,
+            fields=fields,
+            vector_search=vector_search
+        )
+        
+        # Financial metrics live in the company index, once per filing
+        company_index = SearchIndex(
+            name=self.company_index_name,
+            fields=company_index_fields(self.profile.metrics_class),
+            vector_search=vector_search
+        )
+        
+        if recreate:
+            self.manifest.clear()
+        result = self._ensure_index(index, recreate)
+        self._ensure_index(company_index, recreate)
+        return result
+    
+    def _ensure_index(self, index: "SearchIndex", recreate: bool = False):
+        """Create the index or update its schema in place; with ``recreate``, delete it first"""
+        
+        try:
+            if recreate:
+                try:
+                    self.search_client.delete_index(index.name)
+                    print(f"Deleted existing index: {index.name}")
+                except:
+                    pass
+            
+            result = self.search_client.create_or_update_index(index)
+            print(f"Index ready: {result.name}")
+            return result
+            
+        except Exception as e:
+            print(f"Error creating index: {e} (incompatible schema changes need recreate=True)")
+            return None
+    
+    def analyze_filing(self, text: str, sections: Optional[SectionIndex] = None,
+                       pdf_path: Optional[str] = None,
+                       company_info: Optional[Tuple[str, str]] = None) -> Tuple[str, str, FinancialMetrics]:
+        """Company info and financial metrics for one filing's text.
+        
+        ``sections`` locates the filing's Items and statements (built here when
+        not given) so each extractor only scans the part of the text it needs.
+        With statement tables enabled, ``pdf_path`` is the PDF they are read from.
+        ``company_info`` is the (name, ticker) already read from the filing's header, if any.
+        """
+        
+        if sections is None:
+            sections = SectionIndex.build(text)
+        
+        print("Extracting company information...")
+        company_name, ticker = company_info or self.extract_company_info(text)
+        print(f"Company: {company_name} ({ticker})")
+        
+        print("Extracting financial metrics...")
+        metrics = self.extract_financial_metrics(text, company_name, ticker, sections, pdf_path)
+        
+        print(f"Key Financial Metrics for {metrics.company_name}:")
+        print(f"  Revenue: ${metrics.revenue/1_000_000:,.0f}M" if metrics.revenue else "  Revenue: Not found")
+        if metrics.net_income:
+            print(f"  Net Income: ${metrics.net_income/1_000_000:,.0f}M")
+        print(f"  Employees: {metrics.employees:,}" if metrics.employees else "  Employees: Not found")
+        if metrics.operating_margin:
+            print(f"  Operating Margin: {metrics.operating_margin:.1f}%")
+        
+        return company_name, ticker, metrics
+    
+    def prepare_filing(self, text: str, pages: Optional[List[PageText]] = None,
+                       filing_id: Optional[str] = None, trace=NULL_TRACE,
+                       pdf_path: Optional[str] = None) -> Tuple[str, str, FinancialMetrics, List[DocumentChunk]]:
+        """Parse stage: company info, financial metrics and chunks for one filing's text (``filing_id``: PDF hash)"""
+        
+        with trace.stage('analyze'):
+            company_name, ticker, metrics = self.analyze_filing(text, SectionIndex.build(text, pages), pdf_path)
+        
+        print("Chunking document...")
+        with trace.stage('chunk'):
+            chunks = self.chunk_document_by_sections(text, company_name, ticker, pages, filing_id, pdf_path)
+        if trace.enabled:
+            trace.count('chunk', chunks=len(chunks), tokens=sum(c.token_count for c in chunks))
+        print(f"Created {len(chunks)} chunks ({sum(c.token_count for c in chunks):,} tokens to embed)")
+        
+        return company_name, ticker, metrics, chunks
+    
+    def iter_documents(self, chunks: List[DocumentChunk], embeddings: List[Optional[List[float]]],
+                       metrics: FinancialMetrics, filing_id: Optional[str] = None) -> Iterator[Dict]:
+        """Lazily build search documents for chunks that have an embedding.
+        
+        Chunks carry the fields used to filter them (company, year, sector)
+        and ``company_key``; the financial metrics are stored once, in the
+        company index (see company_document).
+        """
+        
+        ingestion_time = datetime.utcnow().isoformat() + "Z"
+        key = company_key(metrics.ticker, metrics.filing_year, filing_id)
+        
+        for chunk, embedding in zip(chunks, embeddings):
+            if embedding is None:
+                continue
+            
+            document = {
+                "id": chunk.id,
+                "company_key": key,
+                "filing_id": chunk.filing_id,
+                "company_name": chunk.company_name,
+                "ticker": chunk.ticker,
+                "section_type": chunk.section_type,
+                "content": chunk.content,
+                "content_vector": embedding,
+                "chunk_index": chunk.chunk_index,
+                "ingestion_timestamp": ingestion_time
+            }
+            
+            # Where the chunk came from, so a search hit can link to its PDF page
+            for field in ("source_file", "page_start", "page_end"):
+                value = getattr(chunk, field)
+                if value is not None:
+                    document[field] = value
+            
+            for field in ("filing_year", "industry", "sector"):
+                value = getattr(metrics, field)
+                if value is not None:
+                    document[field] = value
+            
+            yield document
+    
+    def company_document(self, metrics: FinancialMetrics, chunk_count: int,
+                         centroids: Optional[Dict[str, List[float]]] = None,
+                         filing_id: Optional[str] = None) -> Dict:
+        """Company index document for a filing, keyed by (ticker, filing year), with its section centroids"""
+        
+        return company_record(metrics.to_dict(), company_key(metrics.ticker, metrics.filing_year, filing_id),
+                              chunk_count, datetime.utcnow().isoformat() + "Z", centroids)
+    
+    def build_documents(self, chunks: List[DocumentChunk], embeddings: List[Optional[List[float]]],
+                        metrics: FinancialMetrics, filing_id: Optional[str] = None) -> List[Dict]:
+        """All search documents for a filing as a list (prefer iter_documents for uploads)"""
+        
+        return list(self.iter_documents(chunks, embeddings, metrics, filing_id))
+    
+    def get_search_client(self) -> "SearchClient":
+        """Client for the documents index, created once and shared (safe to use from several threads, pooled connections)"""
+        if self._documents_client is None:
+            self._documents_client = self.search_client.get_search_client(self.index_name)
+        return self._documents_client
+    
+    def get_company_client(self) -> "SearchClient":
+        """Client for the company index, created once and shared"""
+        if self._company_client is None:
+            self._company_client = self.search_client.get_search_client(self.company_index_name)
+        return self._company_client
+    
+    def upload_documents(self, documents: Iterable[Dict], trace=NULL_TRACE) -> bool:
+        """Upload stage: stream documents to Azure Search in size-capped batches, several in flight.
+        
+        Failed documents are retried individually; the rest of the filing is
+        still indexed when some documents cannot be.
+        """
+        
+        uploader = SearchUploader(self.get_search_client(), max_in_flight=self.upload_max_in_flight)
+        result = uploader.upload(documents)
+        trace.count('upload', documents=result.uploaded, failed=len(result.failed), batches=result.batches,
+                    bytes=result.bytes_sent, retries=result.retries)
+        
+        print(f"Uploaded {result.uploaded} documents in {result.batches} batches "
+              f"({result.bytes_sent / 1024 / 1024:.1f} MB, {result.retries} retries)")
+        if result.failed:
+            key, error = next(iter(result.failed.items()))
+            print(f"Error: {len(result.failed)} documents could not be indexed, e.g. {key}: {error}")
+        
+        return result.ok
+    
+    def index_filing(self, chunks: List[DocumentChunk], embeddings: List[Optional[List[float]]],
+                     metrics: FinancialMetrics, filing_id: str, source: Optional[str] = None,
+                     trace=NULL_TRACE) -> bool:
+        """Upload a filing's chunks, then its company record (see index_filing_batches)"""
+        
+        return self.index_filing_batches([(chunks, embeddings)], metrics, filing_id, source, trace)
+    
+    def index_filing_batches(self, batches: Iterable[Tuple[List[DocumentChunk], List[Optional[List[float]]]]],
+                             metrics: FinancialMetrics, filing_id: str, source: Optional[str] = None,
+                             trace=NULL_TRACE) -> bool:
+        """Upload a filing's chunks batch by batch, then its company record (only once its chunks are in).
+        
+        Each (chunks, embeddings) batch is turned into documents as the
+        uploader asks for them and then let go: only the chunk counts, the
+        indexes of chunks without an embedding and running section centroid
+        sums are kept, so memory does not grow with the length of the filing.
+        Chunks without an embedding are skipped.
+        
+        The company record carries the mean embedding of the filing's
+        business_overview and risk_factors chunks, used for peer screening.
+        Once both are in, the filing is added to the ingest manifest and the
+        chunks of any filing it supersedes (an earlier version of the same
+        PDF, or another filing for the same company and year) are deleted,
+        as are the trailing chunks of an earlier ingest of this same filing
+        that produced more chunks than this one.
+        """
+        
+        chunk_count = 0
+        failed_chunks: List[int] = []
+        centroids = SectionCentroids()
+        
+        def documents() -> Iterator[Dict]:
+            nonlocal chunk_count
+            for chunks, embeddings in batches:
+                chunk_count += len(chunks)
+                failed_chunks.extend(chunk.chunk_index for chunk, embedding in zip(chunks, embeddings)
+                                     if embedding is None)
+                centroids.add(chunks, embeddings)
+                yield from self.iter_documents(chunks, embeddings, metrics, filing_id)
+        
+        uploaded = self.upload_documents(documents(), trace)
+        indexed_chunks = chunk_count - len(failed_chunks)
+        if indexed_chunks == 0:
+            print("Error: no embeddings could be generated, nothing to index")
+            return False
+        if failed_chunks:
+            print(f"Warning: skipped {len(failed_chunks)} chunks without embeddings: {failed_chunks[:10]}")
+        if not uploaded:
+            return False
+        
+        try:
+            result = self.get_company_client().merge_or_upload_documents(
+                documents=[self.company_document(metrics, indexed_chunks, centroids.centroids(), filing_id)])
+            if not result[0].succeeded:
+                print(f"Error indexing company record: {result[0].error_message}")
+                return False
+        except Exception as e:
+            print(f"Error indexing company record: {e}")
+            return False
+        
+        filing = IngestedFiling(
+            filing_id=filing_id,
+            company_key=company_key(metrics.ticker, metrics.filing_year, filing_id),
+            chunk_count=chunk_count,
+            source=source,
+            ingested_at=datetime.utcnow().isoformat() + "Z"
+        )
+        trace.annotate(company_key=filing.company_key)
+        trailing = self.manifest.trailing_document_ids(filing)
+        if trailing:
+            try:
+                self.delete_chunk_documents(trailing)
+                print(f"Removed {len(trailing)} trailing chunks of the previous ingest of filing {filing_id[:12]}")
+            except Exception as e:
+                print(f"Error removing trailing chunks of filing {filing_id[:12]}: {e}")
+        superseded = self.manifest.superseded_by(filing)
+        for previous in superseded:
+            self.remove_filing_documents(previous, keep_company=previous.company_key == filing.company_key)
+        self.manifest.record(filing, replaces=superseded)
+        
+        self._peer_screener = None
+        return True
+    
+    def remove_filing_documents(self, filing: IngestedFiling, keep_company: bool = False) -> bool:
+        """Delete a filing's chunks (and its company record unless ``keep_company``) from the indexes"""
+        
+        try:
+            document_ids = filing.document_ids()
+            self.delete_chunk_documents(document_ids)
+            if not keep_company:
+                self.get_company_client().delete_documents(documents=[{"company_key": filing.company_key}])
+            print(f"Removed {len(document_ids)} stale chunks of filing {filing.filing_id[:12]} ({filing.company_key})")
+            return True
+        except Exception as e:
+            print(f"Error removing stale chunks of filing {filing.filing_id[:12]}: {e}")
+            return False
+    
+    def delete_chunk_documents(self, document_ids: List[str]):
+        """Delete chunk documents by key from the documents index, 1000 per request"""
+        search_client = self.get_search_client()
+        for start in range(0, len(document_ids), 1000):
+            search_client.delete_documents(documents=[{"id": key} for key in document_ids[start:start + 1000]])
+    
+    def _embed_batch(self, texts: List[str], trace=NULL_TRACE) -> List[Optional[np.ndarray]]:
+        """generate_embeddings, holding each vector as a float32 array (an eighth of a list of floats) until upload"""
+        
+        return [np.asarray(vector, dtype=np.float32) if vector is not None else None
+                for vector in self.generate_embeddings(texts, trace)]
+    
+    def _stream_chunks(self, pdf_path: str, pages: List[PageText], embed_pool: ThreadPoolExecutor,
+                       embed_batch_chunks: int, filing_id: str,
+                       trace=NULL_TRACE) -> Tuple[Tuple[str, str], List[Tuple[List[DocumentChunk], Future]]]:
+        """Chunk pages as they are extracted and submit each full batch of chunks for embedding.
+        
+        Extracted pages are appended to ``pages``. Company name and ticker are
+        read as soon as the first HEADER_CHARS of text are in, and chunks are
+        labelled with them as they come out of the chunker. Returns the
+        (company name, ticker) and one (chunks, embedding future) per batch,
+        in chunk order.
+        """
+        
+        extract_time = [0.0, 0.0]  # wall, CPU spent waiting for pages (the rest of the loop is chunking)
+        header_chars = 0
+        company_info: Optional[Tuple[str, str]] = None
+        
+        def collect_pages():
+            nonlocal header_chars, company_info
+            stream = stream_or_extract(pdf_path, self.extractor, self.extraction_cache, filing_id)
+            while True:
+                wall, cpu = time.perf_counter(), time.thread_time()
+                page = next(stream, None)
+                wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+                extract_time[0] += wall
+                extract_time[1] += cpu
+                if page is None:
+                    return
+                trace.add('extract', wall, cpu, pages=1, chars=len(page.text))
+                pages.append(page)
+                if company_info is None and page.text:
+                    header_chars += len(page.text) + 1
+                    if header_chars >= HEADER_CHARS:
+                        company_info = self.extract_company_info(join_pages(pages))
+                yield page
+        
+        batches: List[Tuple[List[DocumentChunk], Future]] = []
+        batch: List[DocumentChunk] = []
+        unlabelled: List[DocumentChunk] = []  # chunks made before the header was in
+        filing: Optional[FilingSource] = None
+        chunk_count = tokens = 0
+        wall, cpu = time.perf_counter(), time.thread_time()
+        for chunk in self.chunker.iter_chunks(collect_pages()):
+            chunk_count += 1
+            tokens += chunk.token_count
+            if filing is not None:
+                chunk.filing = filing
+            elif company_info is not None:
+                filing = self.label_chunks(unlabelled + [chunk], *company_info, filing_id, pdf_path)[0].filing
+                unlabelled = []
+            else:
+                unlabelled.append(chunk)
+            
+            batch.append(chunk)
+            if len(batch) >= embed_batch_chunks:
+                batches.append((batch, embed_pool.submit(self._embed_batch, [c.content for c in batch], trace)))
+                batch = []
+        
+        if batch:
+            batches.append((batch, embed_pool.submit(self._embed_batch, [c.content for c in batch], trace)))
+        if company_info is None:
+            company_info = self.extract_company_info(join_pages(pages))  # shorter than the header
+        if unlabelled:
+            self.label_chunks(unlabelled, *company_info, filing_id, pdf_path)
+        
+        if trace.enabled:
+            trace.add('chunk', time.perf_counter() - wall - extract_time[0], time.thread_time() - cpu - extract_time[1],
+                      chunks=chunk_count, tokens=tokens)
+            trace.count('extract', bytes=os.path.getsize(pdf_path))
+        return company_info, batches
+    
+    @staticmethod
+    def _embedded_batches(batches: List[Tuple[List[DocumentChunk], Future]]
+                          ) -> Iterator[Tuple[List[DocumentChunk], List[Optional[List[float]]]]]:
+        """Each batch's chunks and embeddings once its future is done, in order, letting go of each one handed over"""
+        
+        while batches:
+            chunks, future = batches.pop(0)
+            yield chunks, [vector.tolist() if vector is not None else None for vector in future.result()]
+    
+    def ingest_10k_pdf(self, pdf_path: str, embed_batch_chunks: int = 64, incremental: bool = False) -> bool:
+        """Ingest one 10-K PDF: extract, chunk, analyze, embed and index it.
+        
+        Pages are chunked as they come out of the extractor, and every
+        ``embed_batch_chunks`` chunks are embedded on a background thread, so
+        embedding overlaps with the extraction of the remaining pages. Once the
+        filing is analyzed, each batch is uploaded as soon as its embeddings
+        are in and then dropped, so the filing's vectors are never all held
+        at once (the upload stage's time includes waiting for them).
+        
+        Documents are keyed by the PDF's SHA-256, so re-ingesting a filing
+        replaces its documents. With ``incremental``, a PDF that is already in
+        the ingest manifest is skipped without being extracted or embedded.
+        Stage timings and counters go to ``pipeline_metrics`` when it is enabled.
+        """
+        
+        print(f"Processing 10-K PDF: {pdf_path}")
+        trace = self.pipeline_metrics.start_filing(pdf_path)
+        status, error = "failed", None
+        
+        try:
+            filing_id = file_sha256(pdf_path)
+            trace.annotate(filing_id=filing_id)
+            if incremental and filing_id in self.manifest:
+                print(f"Skipping {pdf_path}: unchanged since it was ingested (filing {filing_id[:12]})")
+                status = "skipped"
+                return True
+            
+            # Steps 1-2: Extract and chunk pages, embedding chunks while later pages are extracted
+            print("Extracting, chunking and embedding...")
+            pages: List[PageText] = []
+            with ThreadPoolExecutor(max_workers=1) as embed_pool:
+                company_info, batches = self._stream_chunks(pdf_path, pages, embed_pool, embed_batch_chunks,
+                                                            filing_id, trace)
+                text = join_pages(pages)
+                
+                if len(text.strip()) < 1000:
+                    print("Warning: Extracted text is very short. PDF may be image-based or corrupted.")
+                    for _, future in batches:
+                        future.cancel()
+                    return False
+                
+                # Steps 3-4: Financial metrics, while embeddings finish
+                with trace.stage('analyze'):
+                    company_name, ticker, metrics = self.analyze_filing(text, SectionIndex.build(text, pages), pdf_path,
+                                                                        company_info)
+                print(f"Created {sum(len(chunks) for chunks, _ in batches)} chunks "
+                      f"({sum(c.token_count for chunks, _ in batches for c in chunks):,} tokens)")
+                
+                # Steps 5-7: Upload each batch's chunks as its embeddings come in, then the company record
+                print("Uploading to Azure Search as embeddings complete...")
+                with trace.stage('upload'):
+                    indexed = self.index_filing_batches(self._embedded_batches(batches), metrics, filing_id,
+                                                        source=pdf_path, trace=trace)
+            if not indexed:
+                return False
+            
+            print(f"Successfully ingested {company_name}")
+            status = "ok"
+            return True
+            
+        except Exception as e:
+            print(f"Error in ingestion pipeline: {e}")
+            error = str(e)
+            return False
+        finally:
+            self.pipeline_metrics.finish_filing(trace, status, error)
+    
+    def get_peer_screener(self, refresh: bool = False) -> PeerScreener:
+        """Screening matrix over the latest filing of every company, loaded once and reused until the next ingest"""
+        
+        if self._peer_screener is None or refresh:
+            records = latest_filings(self.get_company_client().search(
+                search_text="*",
+                select="*",
+                top=self.max_screened_companies
+            ))
+            self._peer_screener = PeerScreener.from_company_records(records)
+        return self._peer_screener
+    
+    def find_comparable_companies(self, reference_company: str, top_companies: int = 10) -> "pd.DataFrame":
+        """Comparable companies with their valuation metrics as a DataFrame indexed by ticker (see comparable_companies)"""
+        import pandas as pd
+        
+        rows = self.comparable_companies(reference_company, top_companies)
+        return pd.DataFrame(rows, index=[row['Ticker'] for row in rows])
+    
+    def comparable_companies(self, reference_company: str, top_companies: int = 10) -> List[Dict[str, Any]]:
+        """Find companies comparable to the reference company and return valuation metrics, nearest first.
+        
+        Every company in the same sector is ranked by a weighted distance over
+        z-scored size, headcount, growth and margins plus the similarity of
+        the business description and risk factor centroids (see
+        PeerScreener), using each company's most recent filing. Rows are
+        plain dicts with the profile's columns (see tenk.profiles), so callers
+        that only print them never load pandas.
+        """
+        
+        company_client = self.get_company_client()
+        
+        try:
+            # Step 1: Get reference company info
+            ref_query = f"company_name:{reference_company} OR ticker:{reference_company}"
+            ref_results = latest_filings(company_client.search(
+                search_text=ref_query,
+                select="company_key,company_name,ticker,filing_year,sector,industry,revenue,employees",
+                top=5
+            ))
+            
+            if not ref_results:
+                print(f"Reference company '{reference_company}' not found in index")
+                return []
+            
+            ref_company = ref_results[0]
+            ref_sector = ref_company.get('sector')
+            ref_revenue = ref_company.get('revenue') or 0
+            
+            print(f"Reference company: {ref_company['company_name']} ({ref_company['ticker']})")
+            print(f"Sector: {ref_sector}, Revenue: ${ref_revenue:,.0f}")
+            
+            # Step 2: Rank every company in the sector by distance to the reference
+            peers = self.get_peer_screener().screen(ref_company['ticker'], top=top_companies)
+            
+            # Step 3: Comparison table, nearest peer first (one row per ticker)
+            rows = {peer.ticker: self.profile.peer_row(peer) for peer in peers}
+            return list(rows.values())
+            
+        except Exception as e:
+            print(f"Error finding comparable companies: {e}")
+            return []
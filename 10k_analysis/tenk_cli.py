@@ -0,0 +1,137 @@
+import os
+import sys
+import csv
+import json
+import argparse
+from contextlib import redirect_stdout
+
+from ingest_manifest import IngestManifest
+
+# Only the manifest is imported up front: the ingestion tools (and through them numpy and the search
+# backends) are imported by the commands that query the indexes, and pandas, the PDF libraries and the
+# Azure SDKs only by the stages that need them, so commands start in a few hundred milliseconds
+# (python bench_startup.py measures it)
+
+# Columns printed by default; --all-columns prints every metric (both tools' tables have these)
+SUMMARY_COLUMNS = ['Company Name', 'Ticker', 'Industry', 'Revenue ($B)', 'Employees', 'Operating Margin (%)',
+                   'Net Margin (%)', 'Distance', 'Main Differences']
+
+
+def create_tool(args):
+    """Generic or Key Vault ingestion tool configured from the environment, as batch_ingest.py builds them"""
+    if args.vault:
+        from AzureVault10KIngestionTool import AzureVault10KIngestionTool
+        return AzureVault10KIngestionTool(
+            tenant_id=os.getenv("AZURE_TENANT_ID"),
+            client_id=os.getenv("AZURE_CLIENT_ID"),
+            client_secret=os.getenv("AZURE_CLIENT_SECRET"),
+            key_vault_url=os.getenv("AZURE_KEY_VAULT_URL"),
+            azure_search_endpoint=os.getenv("AZURE_SEARCH_ENDPOINT"),
+            search_backend="local" if args.local_search else "azure",
+            local_index_dir=args.local_index_dir,
+            manifest_path=args.manifest
+        )
+    from Generic10KIngestionTool import Generic10KIngestionTool
+    return Generic10KIngestionTool(
+        azure_search_endpoint=os.getenv("AZURE_SEARCH_ENDPOINT"),
+        azure_search_key=os.getenv("AZURE_SEARCH_KEY"),
+        azure_openai_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        azure_openai_key=os.getenv("AZURE_OPENAI_KEY"),
+        search_backend="local" if args.local_search else "azure",
+        local_index_dir=args.local_index_dir,
+        manifest_path=args.manifest
+    )
+
+
+def print_table(rows, columns):
+    """Rows (dicts) as left-aligned text columns, sized to their longest value"""
+    widths = {column: max([len(column)] + [len(str(row.get(column, ""))) for row in rows]) for column in columns}
+    print("  ".join(f"{column:<{widths[column]}}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{str(row.get(column, '')):<{widths[column]}}" for column in columns))
+
+
+def list_filings(args) -> int:
+    """Filings recorded in the ingest manifest, newest first (the indexes are not queried)"""
+    if not os.path.exists(args.manifest):
+        print(f"No ingest manifest at {args.manifest}")
+        return 1
+    filings = sorted(IngestManifest(args.manifest).filings.values(),
+                     key=lambda filing: filing.ingested_at or "", reverse=True)
+    if args.company:
+        filings = [filing for filing in filings if filing.company_key.lower().startswith(args.company.lower())]
+
+    if args.json:
+        print(json.dumps([vars(filing) for filing in filings], indent=1))
+        return 0
+    print_table([{
+        'Company Key': filing.company_key,
+        'Chunks': filing.chunk_count,
+        'Ingested At': filing.ingested_at or '',
+        'Source': os.path.basename(filing.source) if filing.source else '',
+        'Filing ID': filing.filing_id[:12]
+    } for filing in filings], ['Company Key', 'Chunks', 'Ingested At', 'Source', 'Filing ID'])
+    print(f"\n{len(filings)} filings")
+    return 0
+
+
+def comparables(args) -> int:
+    """Companies comparable to a reference company, nearest first (see find_comparable_companies)"""
+    # The tools report progress on stdout, which would interleave with the JSON
+    with redirect_stdout(sys.stderr if args.json else sys.stdout):
+        tool = create_tool(args)
+        rows = tool.comparable_companies(args.company, top_companies=args.top)
+    if not rows:
+        print(f"No comparable companies found for {args.company}")
+        return 1
+
+    columns = list(rows[0])
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Results saved to {args.csv}")
+    if args.json:
+        print(json.dumps(rows, indent=1, default=float))
+    else:
+        print_table(rows, columns if args.all_columns else [column for column in columns if column in SUMMARY_COLUMNS])
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query ingested 10-K filings without running an ingestion")
+    parser.add_argument("--manifest", default=".ingest_manifest.json",
+                        help="Ingest manifest written by the ingestion tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    filings_parser = subparsers.add_parser("filings", help="List ingested filings (from the ingest manifest)")
+    filings_parser.add_argument("--company", default=None,
+                                help="Only filings whose company key starts with this ticker")
+    filings_parser.add_argument("--json", action="store_true", help="Print the manifest entries as JSON")
+    filings_parser.set_defaults(handler=list_filings)
+
+    comparables_parser = subparsers.add_parser("comparables", help="Find companies comparable to a company")
+    comparables_parser.add_argument("company", help="Reference company name or ticker")
+    comparables_parser.add_argument("--top", type=int, default=10, help="Number of comparable companies")
+    comparables_parser.add_argument("--vault", action="store_true",
+                                    help="Use AzureVault10KIngestionTool (Key Vault credentials)")
+    comparables_parser.add_argument("--local-search", action="store_true",
+                                    help="Query the in-process local search index instead of Azure Search")
+    comparables_parser.add_argument("--local-index-dir", default=".local_search_index",
+                                    help="Directory of the local search index")
+    comparables_parser.add_argument("--csv", default=None, help="Also save every column to this CSV file")
+    comparables_parser.add_argument("--json", action="store_true", help="Print the rows as JSON")
+    comparables_parser.add_argument("--all-columns", action="store_true", help="Print every metric column")
+    comparables_parser.set_defaults(handler=comparables)
+
+    args = parser.parse_args()
+    if args.command == "comparables":
+        # Credentials are only needed to reach the services (python-dotenv is not needed to list filings)
+        from dotenv import load_dotenv
+        load_dotenv()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
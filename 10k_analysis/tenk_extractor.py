@@ -6,6 +6,8 @@ from dataclasses import dataclass
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from section_index import COVER_CHARS, SectionIndex
+
 @dataclass
 class CompanyInfo:
     """Data class to store extracted company information"""
@@ -31,16 +33,21 @@ class TenKExtractor:
         # Clean the text
         text = self._clean_text(text)
         
+        # Locate the cover page and securities table once; every field below is on the cover,
+        # so the patterns only scan its few KB instead of the whole filing
+        sections = SectionIndex.build(text)
+        cover = sections.text_of('cover', text[:COVER_CHARS])
+        
         # Extract company name
-        company_name = self._extract_company_name(text)
+        company_name = self._extract_company_name(cover)
         
         # Extract ticker symbols
-        ticker_symbols = self._extract_ticker_symbols(text)
+        ticker_symbols = self._extract_ticker_symbols(cover, sections)
         
         # Extract additional information
-        cik = self._extract_cik(text)
-        commission_file = self._extract_commission_file(text)
-        exchange = self._extract_exchange(text)
+        cik = self._extract_cik(cover)
+        commission_file = self._extract_commission_file(cover)
+        exchange = self._extract_exchange(cover)
         
         return CompanyInfo(
             company_name=company_name,
@@ -115,7 +122,7 @@ class TenKExtractor:
         
         return "Company name not found"
     
-    def _extract_ticker_symbols(self, text: str) -> List[str]:
+    def _extract_ticker_symbols(self, text: str, sections: Optional[SectionIndex] = None) -> List[str]:
         """Extract ticker symbols from various sections"""
         
         ticker_symbols = []
@@ -133,7 +140,7 @@ class TenKExtractor:
             ticker_symbols.extend(matches)
         
         # Pattern 2: Look for securities registration table
-        securities_section = self._find_securities_section(text)
+        securities_section = self._find_securities_section(text, sections)
         if securities_section:
             # Extract from structured table
             table_tickers = self._extract_from_securities_table(securities_section)
@@ -154,8 +161,11 @@ class TenKExtractor:
         
         return ticker_symbols
     
-    def _find_securities_section(self, text: str) -> Optional[str]:
-        """Find the securities registration section"""
+    def _find_securities_section(self, text: str, sections: Optional[SectionIndex] = None) -> Optional[str]:
+        """Find the securities registration section (from the section index when it located one)"""
+        
+        if sections is not None and 'securities_table' in sections:
+            return sections.text_of('securities_table')
         
         patterns = [
             r'Securities registered pursuant to Section 12\(b\).*?(?=Securities registered pursuant to Section 12\(g\)|ITEM|Note:|$)',
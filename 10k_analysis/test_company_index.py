@@ -0,0 +1,18 @@
+from company_index import company_key, latest_filings
+
+
+def record(ticker, year, filing_id="0" * 64):
+    return {'company_key': company_key(ticker, year, filing_id), 'ticker': ticker, 'filing_year': year}
+
+
+def test_latest_filings_keeps_the_latest_year_per_company():
+    records = [record("GOOGL", 2022), record("MSFT", 2023), record("GOOGL", 2023)]
+
+    assert [(r['ticker'], r['filing_year']) for r in latest_filings(records)] == [("GOOGL", 2023), ("MSFT", 2023)]
+
+
+def test_latest_filings_keeps_companies_without_a_ticker_apart():
+    records = [record("UNK", 2023, "a" * 64), record("UNK", 2023, "b" * 64), record("UNK", 2021, "c" * 64)]
+
+    assert [r['company_key'] for r in latest_filings(records)] == [
+        "UNK-aaaaaaaaaaaa_2023", "UNK-bbbbbbbbbbbb_2023", "UNK-cccccccccccc_2021"]
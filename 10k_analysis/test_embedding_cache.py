@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+
+import embedding_cache
+from embedding_cache import EmbeddingCache
+
+
+def vectors(count, start=0, dimensions=8):
+    return [np.full(dimensions, start + i, dtype=np.float32).tolist() for i in range(count)]
+
+
+def test_round_trip_and_reopen(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), model="test", dimensions=8, initial_capacity=4)
+    texts = [f"paragraph {i}" for i in range(10)]
+    for i in range(0, 10, 3):
+        cache.put_many(texts[i:i + 3], vectors(3, i)[:len(texts[i:i + 3])])
+
+    assert cache.get_many(["paragraph  3", "unknown"]) == [vectors(1, 3)[0], None]
+    reopened = EmbeddingCache(str(tmp_path), model="test", dimensions=8)
+    assert reopened.get_many(texts) == vectors(10)
+
+
+def test_index_log_is_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, 'COMPACT_MIN_LOGGED', 4)
+    cache = EmbeddingCache(str(tmp_path), model="test", dimensions=8)
+    cache.put_many(["a", "b", "c"], vectors(3))
+    assert not (tmp_path / "test" / "index.json").exists()
+    assert len((tmp_path / "test" / "index.jsonl").read_text().splitlines()) == 1
+
+    cache.put_many(["d"], vectors(1, 3))
+    assert json.loads((tmp_path / "test" / "index.json").read_text()) == cache.index
+    assert not (tmp_path / "test" / "index.jsonl").exists()
+
+
+def test_torn_log_line_is_dropped(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), model="test", dimensions=8)
+    cache.put_many(["a", "b"], vectors(2))
+    with open(tmp_path / "test" / "index.jsonl", 'a') as f:
+        f.write('{"deadbeef": 2')  # interrupted append
+
+    reopened = EmbeddingCache(str(tmp_path), model="test", dimensions=8)
+    assert reopened.get_many(["a", "b"]) == vectors(2)
+    reopened.put_many(["c"], vectors(1, 7))
+    assert EmbeddingCache(str(tmp_path), model="test", dimensions=8).get_many(["c"]) == vectors(1, 7)
@@ -0,0 +1,49 @@
+import time
+
+from embedding_client import AzureEmbeddingClient
+from stub_services import StubEmbeddingServer, stub_embedding
+
+
+def texts(count):
+    return [f"paragraph {i} of the filing" for i in range(count)]
+
+
+def test_vectors_in_input_order():
+    with StubEmbeddingServer(dimensions=8) as server:
+        client = AzureEmbeddingClient(server.endpoint, "test-key", max_batch_items=3, max_in_flight=4)
+        result = client.embed(texts(10))
+
+    assert result.ok and result.api_calls == 4
+    assert result.vectors == [stub_embedding(text, 8) for text in texts(10)]
+
+
+def test_rate_limited_batches_are_retried_after_retry_after():
+    with StubEmbeddingServer(dimensions=8, rate_limit_every=2, retry_after=0.2) as server:
+        client = AzureEmbeddingClient(server.endpoint, "test-key", max_batch_items=2, max_in_flight=1)
+        start = time.perf_counter()
+        result = client.embed(texts(6))
+        elapsed = time.perf_counter() - start
+
+    assert result.ok and all(vector is not None for vector in result.vectors)
+    assert result.retries == server.rate_limited_count > 0
+    assert elapsed >= 0.2 * result.retries  # every worker waited out each Retry-After
+
+
+def test_rejected_batch_is_split_down_to_the_bad_items():
+    inputs = texts(8)
+    inputs[5] = "__reject__ this paragraph"
+    with StubEmbeddingServer(dimensions=8) as server:
+        result = AzureEmbeddingClient(server.endpoint, "test-key").embed(inputs)
+
+    assert list(result.failures) == [5] and result.failures[5].startswith("HTTP 400")
+    assert result.vectors[5] is None
+    assert all(vector is not None for i, vector in enumerate(result.vectors) if i != 5)
+    assert result.api_calls == 7  # 8 items: the batch, then halves of 4, 2 and 1 around the bad one
+
+
+def test_gives_up_after_max_retries():
+    with StubEmbeddingServer(dimensions=8, rate_limit_every=1, retry_after=0.01) as server:
+        result = AzureEmbeddingClient(server.endpoint, "test-key", max_retries=2).embed(texts(2))
+
+    assert sorted(result.failures) == [0, 1] and "gave up after 2 retries" in result.failures[0]
+    assert result.api_calls == 3 and result.vectors == [None, None]
@@ -0,0 +1,33 @@
+from extraction_cache import ExtractionCache, load_or_extract
+from pdf_text_extractor import PageText, PDFTextExtractor
+
+
+class FixedExtractor:
+    def __init__(self, text, cache_tag):
+        self.text = text
+        self.cache_tag = cache_tag
+        self.calls = 0
+
+    def extract_pages(self, pdf_path):
+        self.calls += 1
+        return [PageText(page_number=1, text=self.text, extraction_method="PyPDF2")]
+
+
+def test_entries_are_keyed_by_extractor_tag(tmp_path):
+    pdf_path = tmp_path / "filing.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 not really a filing")
+    cache = ExtractionCache(str(tmp_path / "cache"))
+
+    first = FixedExtractor("old text", cache_tag="extractor-v1")
+    assert load_or_extract(str(pdf_path), first, cache).pages[0].text == "old text"
+    assert load_or_extract(str(pdf_path), first, cache).pages[0].text == "old text"
+    assert first.calls == 1
+
+    second = FixedExtractor("new text", cache_tag="extractor-v2")
+    assert load_or_extract(str(pdf_path), second, cache).pages[0].text == "new text"
+    assert second.calls == 1
+
+
+def test_serial_and_pooled_extraction_share_entries():
+    assert PDFTextExtractor(workers=1).cache_tag == PDFTextExtractor(workers=8).cache_tag
+    assert PDFTextExtractor(min_page_chars=20).cache_tag != PDFTextExtractor(min_page_chars=50).cache_tag
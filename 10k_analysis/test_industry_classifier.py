@@ -0,0 +1,47 @@
+import pytest
+
+from industry_classifier import IndustryClassifier
+from section_index import LOWERED_WINDOW_CHARS
+
+TAXONOMY = {
+    "Technology": {"sector": "Technology", "keywords": ["software", "ai", "cloud"]},
+    "Retail": {"sector": "Consumer Discretionary", "keywords": ["retail", "online retail"]},
+    "Energy": {"sector": "Energy", "keywords": ["gas", "oil"]},
+}
+
+
+def test_keywords_match_whole_words_only():
+    classifier = IndustryClassifier(TAXONOMY)
+    scores = classifier.scores("We maintain gasoline stations. Our AI and Cloud Software products.")
+    assert scores == {"Technology": 3.0, "Retail": 0.0, "Energy": 0.0}
+
+
+def test_contained_keywords_count_too():
+    classifier = IndustryClassifier(TAXONOMY)
+    assert classifier.scores("An online retail business.")["Retail"] == 2.0
+
+
+def test_items_are_weighted():
+    classifier = IndustryClassifier(TAXONOMY, section_weights={"1": 3.0, "15": 0.0})
+    text = ("Item 1. Business\nWe drill for oil and gas.\n"
+            "Item 15. Exhibits\nsoftware software software software\n")
+    assert classifier.classify(text) == ("Energy", "Energy")
+    assert classifier.scores(text)["Technology"] == 0.0
+
+
+def test_no_match_is_other():
+    assert IndustryClassifier(TAXONOMY).classify("Nothing relevant here.") == ("Other", "Other")
+
+
+def test_counts_across_lowercasing_windows():
+    classifier = IndustryClassifier(TAXONOMY)
+    line = "Our Cloud platform runs the İstanbul office.\n"  # 'İ' lowercases to two characters
+    text = line * (3 * LOWERED_WINDOW_CHARS // len(line))
+    assert classifier.scores(text)["Technology"] == text.count("Cloud")
+
+
+@pytest.mark.parametrize("taxonomy", ["generic", "enhanced"])
+def test_from_config(taxonomy):
+    classifier = IndustryClassifier.from_config(taxonomy)
+    industry, sector = classifier.classify("Item 1. Business\nWe sell cloud software and AI services.\n")
+    assert industry in classifier.industries and sector != "Other"
@@ -0,0 +1,41 @@
+import pytest
+
+from Generic10KIngestionTool import Generic10KIngestionTool
+from ingest_manifest import IngestManifest, IngestedFiling
+from stub_services import StubEmbeddingServer
+from synthetic_filings import write_synthetic_pdf
+
+
+def test_trailing_document_ids(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    manifest.record(IngestedFiling(filing_id="a" * 64, company_key="ACME_2023", chunk_count=5))
+
+    assert manifest.trailing_document_ids(IngestedFiling("a" * 64, "ACME_2023", chunk_count=3)) == [
+        "a" * 32 + "_3", "a" * 32 + "_4"]
+    assert manifest.trailing_document_ids(IngestedFiling("a" * 64, "ACME_2023", chunk_count=7)) == []
+    assert manifest.trailing_document_ids(IngestedFiling("b" * 64, "ACME_2023", chunk_count=1)) == []
+
+
+def test_reingest_with_fewer_chunks_removes_trailing_chunks(tmp_path):
+    pytest.importorskip("reportlab")
+    pdf_path = write_synthetic_pdf(str(tmp_path / "filing.pdf"), pages=20)
+
+    with StubEmbeddingServer() as server:
+        def ingest(chunk_tokens):
+            tool = Generic10KIngestionTool(
+                "https://example.search.windows.net", None, server.endpoint, "test-key",
+                search_backend="local", local_index_dir=str(tmp_path / "index"),
+                manifest_path=str(tmp_path / "manifest.json"), use_extraction_cache=False,
+                use_embedding_cache=False, extraction_workers=1, chunk_tokens=chunk_tokens
+            )
+            tool.create_search_index()
+            assert tool.ingest_10k_pdf(pdf_path)
+            return tool
+
+        first = ingest(375)
+        first_count = first.get_search_client().get_document_count()
+        second = ingest(900)
+
+    filing, = second.manifest.filings.values()
+    assert filing.chunk_count < first_count
+    assert second.get_search_client().get_document_count() == filing.chunk_count
@@ -0,0 +1,56 @@
+from metric_extraction import MetricExtractionEngine, locate_financial_region
+from tenk.profiles import GENERIC
+
+FILING = (
+    "FORM 10-K\nFor the fiscal year ended December 31, 2023\n"
+    "Item 1. Business\nWe had approximately 12,500 full-time employees. Revenue: $9 million in a side note.\n"
+    "Item 7. Management's Discussion and Analysis\nTotal revenues $ 4,250 million increased 8%.\n"
+    "Net income $ 610 million.\n"
+    "Item 8. Financial Statements\nTotal assets $ 12,300 million\n"
+    "Item 9. Changes in and Disagreements with Accountants\nNone.\n"
+    "Cash and cash equivalents $ 850 million at year end.\n"
+)
+
+
+def test_generic_profile_metrics():
+    metrics = GENERIC.metric_engine.extract(FILING)
+
+    assert metrics['filing_year'] == 2023
+    assert metrics['employees'] == 12_500
+    assert metrics['revenue'] == 4_250_000_000  # from Item 7, not the note in Item 1
+    assert metrics['net_income'] == 610_000_000
+    assert metrics['total_assets'] == 12_300_000_000
+    assert metrics['cash_and_equivalents'] == 850_000_000  # found after the region when missing from it
+    assert 'operating_income' not in metrics
+
+
+def test_financial_region_spans_items_7_to_8():
+    start, end = locate_financial_region(FILING)
+    assert FILING[start:].startswith("Item 7.") and FILING[end:].startswith("Item 9.")
+
+
+def test_skip_fields_are_not_looked_up():
+    metrics = GENERIC.metric_engine.extract(FILING, skip_fields=['revenue', 'net_income'])
+    assert 'revenue' not in metrics and 'net_income' not in metrics
+    assert metrics['total_assets'] == 12_300_000_000
+
+
+def test_earlier_pattern_wins_and_matches_start_at_words():
+    engine = MetricExtractionEngine(
+        value_patterns={'revenue': [r"total revenues?\s*\$?\s*([\d,]+)", r"revenues?\s*\$?\s*([\d,]+)"]},
+        search_patterns={'employees': [r"(\d[\d,]*) employees"]},
+    )
+    metrics = engine.extract("Revenues $ 2,000,000 this year; total revenues $ 5,000,000. We have 1234 employees.")
+    assert metrics == {'revenue': 5_000_000, 'employees': 1234}
+
+
+def test_values_outside_the_valid_range_are_ignored():
+    engine = MetricExtractionEngine(value_patterns={'revenue': [r"revenues?\s*\$?\s*([\d,]+)"]},
+                                    search_patterns={}, min_value=1_000)
+    assert engine.extract("Revenue $ 12 and later revenue $ 45,000.") == {'revenue': 45_000}
+
+
+def test_scale_from_surrounding_text():
+    engine = MetricExtractionEngine(value_patterns={'revenue': [r"revenues?\s*\$?\s*([\d,.]+)"]},
+                                    search_patterns={}, scale_window=40)
+    assert engine.extract("(in millions) Revenue $ 3.5 for the year") == {'revenue': 3_500_000}
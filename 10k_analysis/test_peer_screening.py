@@ -0,0 +1,78 @@
+import pytest
+
+from bench_peer_screening import synthetic_companies
+from company_index import centroid_field
+from peer_screening import PeerScreener
+
+
+def company(ticker, revenue, margin, sector="Technology", year=2023, **extra):
+    record = {'company_key': f"{ticker}_{year}", 'ticker': ticker, 'company_name': f"{ticker} Inc",
+              'sector': sector, 'revenue': revenue, 'operating_margin': margin}
+    record.update(extra)
+    return record
+
+
+RECORDS = [
+    company("REF", 1e9, 20.0),
+    company("NEAR", 1.1e9, 21.0),
+    company("MID", 5e9, 10.0),
+    company("FAR", 1e12, -30.0),
+    company("BANK", 1e9, 20.0, sector="Financials"),
+]
+
+
+def tickers(matches):
+    return [match.ticker for match in matches]
+
+
+def test_screen_ranks_closer_companies_first_within_the_sector():
+    screener = PeerScreener(RECORDS)
+
+    matches = screener.screen("REF")
+
+    assert tickers(matches) == ["NEAR", "MID", "FAR"]
+    assert matches[0].distance < matches[1].distance < matches[2].distance
+    assert set(matches[0].contributions) == {'size', 'operating_margin'}
+    assert tickers(screener.screen("REF_2023", same_sector=False))[0] == "BANK"
+
+
+def test_screen_excludes_the_reference_and_excluded_tickers():
+    screener = PeerScreener(RECORDS + [company("REF", 1e9, 20.0, year=2022)])
+
+    assert tickers(screener.screen("REF", exclude_tickers=["NEAR"])) == ["MID", "FAR"]
+    assert screener.screen("MISSING") == []
+
+
+def test_missing_features_are_scaled_up_rather_than_counted_as_close():
+    # SPARSE has no margin: its size difference is scaled by total weight / available weight (2 / 1)
+    records = RECORDS + [company("SPARSE", 1.5e9, None)]
+    weights = {name: 0.0 for name in ('headcount', 'growth', 'gross_margin', 'net_margin')}
+    screener = PeerScreener(records, weights=dict(weights, size=1.0, operating_margin=1.0))
+
+    matches = {match.ticker: match for match in screener.screen("REF")}
+
+    size_only = matches["SPARSE"].contributions['size']
+    assert set(matches["SPARSE"].contributions) == {'size'}
+    assert matches["SPARSE"].distance == pytest.approx((size_only * 2) ** 0.5)
+
+
+def test_centroids_from_company_records_drive_the_ranking():
+    records = [dict(company(ticker, 1e9, 20.0), **{centroid_field('business_overview'): vector})
+               for ticker, vector in [("REF", [1.0, 0.0]), ("CLOSE", [0.9, 0.1]), ("AWAY", [0.0, 1.0])]]
+
+    screener = PeerScreener.from_company_records(records)
+    matches = screener.screen("REF")
+
+    assert tickers(matches) == ["CLOSE", "AWAY"]
+    assert matches[1].main_differences(1) == ['business']
+    assert all(centroid_field('business_overview') not in match.record for match in matches)
+
+
+def test_top_returns_the_prefix_of_the_full_ranking():
+    screener = PeerScreener(synthetic_companies(500))
+
+    full = screener.screen("C00000", top=500)
+    top = screener.screen("C00000", top=10)
+
+    assert [match.company_key for match in top] == [match.company_key for match in full[:10]]
+    assert all(match.record['sector'] == screener.records[0]['sector'] for match in full)
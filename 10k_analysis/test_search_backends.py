@@ -0,0 +1,97 @@
+import pytest
+
+pytest.importorskip("azure.search.documents")
+
+from azure.search.documents.indexes.models import (SearchableField, SearchField, SearchFieldDataType, SearchIndex,
+                                                   SimpleField)
+from azure.search.documents.models import VectorizedQuery
+
+from search_backends import LocalSearchIndexClient
+
+DOCUMENTS = [
+    {'id': '1', 'content': "revenue grew on cloud revenue and revenue from ads", 'ticker': "GOOGL",
+     'filing_year': 2023, 'vector': [1.0, 0.0, 0.0]},
+    {'id': '2', 'content': "cloud margins improved", 'ticker': "MSFT", 'filing_year': 2023,
+     'vector': [0.9, 0.1, 0.0]},
+    {'id': '3', 'content': "revenue declined slightly", 'ticker': "IBM", 'filing_year': 2021,
+     'vector': [0.0, 1.0, 0.0]},
+    {'id': '4', 'content': "risk factors include competition", 'ticker': "O'NEIL", 'filing_year': 2022,
+     'vector': [0.0, 0.0, 1.0]},
+]
+
+
+def create_client(directory):
+    index = SearchIndex(name="chunks", fields=[
+        SimpleField(name="id", type=SearchFieldDataType.String, key=True),
+        SearchableField(name="content", type=SearchFieldDataType.String),
+        SimpleField(name="ticker", type=SearchFieldDataType.String, filterable=True),
+        SimpleField(name="filing_year", type=SearchFieldDataType.Int32, filterable=True, sortable=True),
+        SearchField(name="vector", type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
+                    searchable=True, vector_search_dimensions=3, vector_search_profile_name="profile"),
+    ])
+    index_client = LocalSearchIndexClient(str(directory))
+    index_client.create_index(index)
+    client = index_client.get_search_client("chunks")
+    client.upload_documents(DOCUMENTS)
+    return client
+
+
+def ids(results):
+    return [document['id'] for document in results]
+
+
+@pytest.fixture
+def client(tmp_path):
+    return create_client(tmp_path)
+
+
+def test_bm25_ranks_the_document_with_more_matching_terms_first(client):
+    assert ids(client.search("revenue")) == ['1', '3']
+    assert ids(client.search("content:cloud")) == ['2', '1']
+
+
+def test_knn_returns_nearest_vectors_within_the_filter(client):
+    query = VectorizedQuery(vector=[1.0, 0.05, 0.0], k_nearest_neighbors=3, fields="vector")
+
+    assert ids(client.search(vector_queries=[query])) == ['1', '2', '3']
+    assert ids(client.search(vector_queries=[query], filter="ticker ne 'GOOGL'")) == ['2', '3', '4']
+
+
+def test_hybrid_query_fuses_text_and_vector_rankings(client):
+    # "revenue" ranks 1 then 3; the vector ranks 3 then 2 then 1, so 3 leads both lists on reciprocal rank
+    query = VectorizedQuery(vector=[0.1, 1.0, 0.0], k_nearest_neighbors=3, fields="vector")
+
+    results = list(client.search("revenue", vector_queries=[query]))
+
+    assert ids(results) == ['3', '1', '2']
+    assert results[0]['@search.score'] == pytest.approx(1 / 61 + 1 / 62)
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("filing_year eq 2023", ['1', '2']),
+    ("filing_year ge 2022 and not (ticker eq 'MSFT')", ['1', '4']),
+    ("ticker eq 'IBM' or filing_year lt 2022", ['3']),
+    ("search.in(ticker, 'GOOGL,IBM', ',')", ['1', '3']),
+    ("search.in(ticker, 'O''NEIL|MSFT', '|')", ['2', '4']),
+    ("ticker eq null", []),
+])
+def test_odata_filters(client, expression, expected):
+    assert ids(client.search("*", filter=expression, order_by=["id"])) == expected
+
+
+def test_invalid_filter_raises(client):
+    with pytest.raises(ValueError):
+        list(client.search("*", filter="filing_year eq"))
+
+
+def test_writes_survive_reopening_the_index(tmp_path):
+    client = create_client(tmp_path)
+    client.delete_documents([{'id': '4'}])
+    client.merge_documents([{'id': '3', 'filing_year': 2024}])
+    client.flush()
+
+    reopened = LocalSearchIndexClient(str(tmp_path)).get_search_client("chunks")
+
+    assert reopened.get_document_count() == 3
+    assert reopened.get_document('3')['filing_year'] == 2024
+    assert ids(reopened.search("*", order_by=["filing_year desc"])) == ['3', '1', '2']
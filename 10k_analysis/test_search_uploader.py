@@ -0,0 +1,84 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from search_uploader import SearchUploader, retry_after
+
+
+class FakeSearchClient:
+    """Records each request's keys and answers with the status scripted per (attempt, key)"""
+
+    def __init__(self, statuses=None, errors=None):
+        self.statuses = statuses or {}  # key -> statuses of its successive attempts (200 once they run out)
+        self.errors = list(errors or [])  # exceptions raised by the first requests, None to answer normally
+        self.requests = []
+
+    def merge_or_upload_documents(self, documents):
+        self.requests.append([document['id'] for document in documents])
+        if self.errors:
+            error = self.errors.pop(0)
+            if error is not None:
+                raise error
+        results = []
+        for document in documents:
+            statuses = self.statuses.get(document['id'], [])
+            status = statuses.pop(0) if statuses else 200
+            results.append(SimpleNamespace(key=document['id'], succeeded=status in (200, 201), status_code=status,
+                                           error_message=None if status in (200, 201) else "failed"))
+        return results
+
+
+def documents(count):
+    return ({'id': str(i), 'content': f"chunk {i}"} for i in range(count))
+
+
+def test_only_failed_documents_are_resent():
+    client = FakeSearchClient({'1': [503], '2': [400], '3': [409, 422]})
+    result = SearchUploader(client, retry_delay=0).upload(documents(5))
+
+    assert client.requests == [['0', '1', '2', '3', '4'], ['1', '3'], ['3']]
+    assert result.uploaded == 4 and result.retries == 2
+    assert list(result.failed) == ['2'] and result.failed['2'].startswith("400")
+    assert not result.ok
+
+
+def test_retryable_document_fails_after_max_retries():
+    client = FakeSearchClient({'0': [503] * 10})
+    result = SearchUploader(client, max_retries=2, retry_delay=0).upload(documents(2))
+
+    assert client.requests == [['0', '1'], ['0'], ['0']]
+    assert result.uploaded == 1 and list(result.failed) == ['0']
+
+
+def test_batches_are_capped_by_document_count():
+    client = FakeSearchClient()
+    result = SearchUploader(client, max_batch_documents=3, max_in_flight=1).upload(documents(7))
+
+    assert [len(request) for request in client.requests] == [3, 3, 1]
+    assert result.uploaded == 7 and result.batches == 3 and result.ok
+
+
+def test_failed_request_is_retried_only_when_transient():
+    exceptions = pytest.importorskip("azure.core.exceptions")
+
+    def http_error(status, headers=None):
+        response = SimpleNamespace(status_code=status, headers=headers or {}, reason="error", text=lambda: "")
+        return exceptions.HttpResponseError(message=f"HTTP {status}", response=response)
+
+    client = FakeSearchClient(errors=[http_error(503, {'retry-after-ms': '50'}), None])
+    start = time.perf_counter()
+    result = SearchUploader(client, retry_delay=10).upload(documents(2))
+    assert time.perf_counter() - start < 5  # waited the 50 ms asked for, not the 10 s backoff
+    assert result.uploaded == 2 and result.retries == 1
+
+    client = FakeSearchClient(errors=[http_error(400)] * 4)
+    result = SearchUploader(client, retry_delay=0).upload(documents(2))
+    assert len(client.requests) == 1 and sorted(result.failed) == ['0', '1']
+
+
+def test_retry_after_headers():
+    assert retry_after({'retry-after-ms': '250'}) == 0.25
+    assert retry_after({'Retry-After': '3'}) == 3.0
+    assert retry_after({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}) is None
+    assert retry_after(None) is None
@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+import secret_providers
+from secret_providers import CachedSecretProvider, KeyVaultSecretProvider, LocalSecretClient
+
+SECRETS = {"azure-openai-key": "openai", "azure-search-key": "search", "azure-openai-endpoint": "https://x"}
+
+
+def provider(client, **kwargs):
+    kwargs.setdefault('background_refresh', False)
+    return CachedSecretProvider(KeyVaultSecretProvider(client), **kwargs)
+
+
+def test_secrets_are_fetched_once_within_ttl():
+    client = LocalSecretClient(SECRETS)
+    cached = provider(client)
+
+    assert cached.get_many(SECRETS) == SECRETS
+    assert cached.get("azure-openai-key") == "openai"
+    assert client.calls == len(SECRETS)
+
+
+def test_secrets_are_fetched_concurrently():
+    client = LocalSecretClient(SECRETS, latency=0.2)
+    start = time.perf_counter()
+    provider(client).get_many(SECRETS)
+    assert time.perf_counter() - start < 0.2 * len(SECRETS)
+
+
+def test_missing_secret_falls_back_to_environment(monkeypatch):
+    monkeypatch.setenv("AZURE_SEARCH_ENDPOINT", "https://search")
+    cached = provider(LocalSecretClient(SECRETS))
+    assert cached.get("azure-search-endpoint") == "https://search"
+    with pytest.raises(KeyError):
+        cached.get("not-anywhere")
+
+
+def test_failed_refresh_serves_cached_value_and_backs_off(monkeypatch):
+    client = LocalSecretClient(SECRETS)
+    cached = provider(client, ttl=60.0)
+    cached.get("azure-openai-key")
+
+    now = time.time() + 120  # the cached value has expired
+    monkeypatch.setattr(secret_providers.time, 'time', lambda: now)
+    del client.secrets["azure-openai-key"]
+    assert cached.get("azure-openai-key") == "openai"
+    assert cached.get("azure-openai-key") == "openai"
+    assert client.calls == 2  # the second call waits for REFRESH_RETRY_DELAY
+
+    now += secret_providers.REFRESH_RETRY_DELAY
+    client.secrets["azure-openai-key"] = "rotated"
+    assert cached.get("azure-openai-key") == "rotated"
+    assert client.calls == 3
+
+
+def test_encrypted_file_cache(tmp_path):
+    pytest.importorskip("cryptography")
+    from cryptography.fernet import Fernet
+    key = Fernet.generate_key().decode()
+    cache_path = str(tmp_path / "secrets.bin")
+
+    provider(LocalSecretClient(SECRETS), cache_path=cache_path, encryption_key=key).get_many(SECRETS)
+    assert b"openai" not in open(cache_path, 'rb').read()
+
+    client = LocalSecretClient(SECRETS)
+    assert provider(client, cache_path=cache_path, encryption_key=key).get_many(SECRETS) == SECRETS
+    assert client.calls == 0
+
+    client = LocalSecretClient(SECRETS)
+    other_key = Fernet.generate_key().decode()
+    assert provider(client, cache_path=cache_path, encryption_key=other_key).get_many(SECRETS) == SECRETS
+    assert client.calls == len(SECRETS)
+
+
+def test_no_file_cache_without_key(tmp_path, monkeypatch):
+    monkeypatch.delenv(secret_providers.CACHE_KEY_ENV, raising=False)
+    cached = provider(LocalSecretClient(SECRETS), cache_path=str(tmp_path / "secrets.bin"))
+    cached.get_many(SECRETS)
+    assert cached.cache_path is None and not (tmp_path / "secrets.bin").exists()
+
+
+def test_background_refresh_replaces_values_before_expiry():
+    client = LocalSecretClient(SECRETS)
+    cached = provider(client, ttl=1.5, refresh_margin=0.5, background_refresh=True)
+    try:
+        cached.get("azure-openai-key")
+        client.secrets["azure-openai-key"] = "rotated"
+        deadline = time.time() + 5
+        while cached.get("azure-openai-key") != "rotated" and time.time() < deadline:
+            time.sleep(0.05)
+        assert cached.get("azure-openai-key") == "rotated"
+        assert client.calls == 2  # refreshed by the background thread, not by get()
+    finally:
+        cached.close()
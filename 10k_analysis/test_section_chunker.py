@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from pdf_text_extractor import PageText, join_pages
+from section_chunker import SectionChunker
+from synthetic_filings import synthetic_10k_pages
+from tenk.profiles import PROFILES
+
+
+def chunker(**kwargs):
+    return SectionChunker(PROFILES['generic'].section_patterns, **kwargs)
+
+
+def check_offsets(chunks, pages):
+    text = join_pages(pages)
+    page_starts = []
+    position = 0
+    for page in pages:
+        if page.text:
+            page_starts.append((position, position + len(page.text), page.page_number))
+            position += len(page.text) + 1
+
+    for chunk in chunks:
+        paragraphs = chunk.content.split("\n\n")
+        assert text.startswith(paragraphs[0], chunk.char_start)
+        assert text[:chunk.char_end].endswith(paragraphs[-1])
+        assert next(number for start, end, number in page_starts if start <= chunk.char_start <= end) == chunk.page_start
+        assert next(number for start, end, number in page_starts if start < chunk.char_end <= end) == chunk.page_end
+
+
+@pytest.mark.parametrize("chunk_tokens", [120, 375, 900])
+def test_offsets_match_joined_pages(chunk_tokens):
+    pages = synthetic_10k_pages(30, seed=3)
+    chunks = list(chunker(chunk_tokens=chunk_tokens).iter_chunks(pages))
+    assert [chunk.chunk_index for chunk in chunks] == list(range(len(chunks)))
+    assert all(chunk.token_count <= chunk_tokens for chunk in chunks)
+    check_offsets(chunks, pages)
+
+
+def test_paragraph_spanning_pages():
+    pages = [PageText(1, "Item 1. Business\n\nWe make", "PyPDF2"),
+             PageText(2, "widgets in Ohio.\n\nItem 1A. Risk Factors", "pdfplumber")]
+    chunks = list(chunker().iter_chunks(pages))
+    assert chunks[0].content == "Item 1. Business\n\nWe make\nwidgets in Ohio.\n\nItem 1A. Risk Factors"
+    assert (chunks[0].page_start, chunks[0].page_end) == (1, 2)
+    assert chunks[0].extraction_method == "PyPDF2+pdfplumber"
+    check_offsets(chunks, pages)
+
+
+def test_chunk_text_offsets():
+    text = "Item 7. Management's Discussion\n\n" + "Revenue grew. " * 400
+    for chunk in chunker(chunk_tokens=200).chunk_text(text):
+        assert text.startswith(chunk.content.split("\n\n")[0], chunk.char_start)
+        assert chunk.page_start is None
+
+
+def test_pages_without_blank_lines_stream():
+    source = [PageText(p.page_number, re.sub(r"\n+", "\n", p.text).strip("\n"), p.extraction_method)
+              for p in synthetic_10k_pages(40, seed=5)]
+    consumed = []
+
+    def pages():
+        for page in source:
+            consumed.append(page.page_number)
+            yield page
+
+    chunks = chunker(chunk_tokens=200).iter_chunks(pages())
+    next(chunks)
+    assert len(consumed) < len(source) // 4
+
+    rest = list(chunks)
+    assert len(consumed) == len(source)
+    check_offsets(rest, source)
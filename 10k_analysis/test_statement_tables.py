@@ -0,0 +1,41 @@
+import pytest
+
+from statement_tables import StatementPage, StatementTableExtractor, parse_amount
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("$ 1,234", 1234.0),
+    ("1,234.5", 1234.5),
+    ("(123)", -123.0),
+    ("$ (1,234)", -1234.0),
+    ("$(1,234)", -1234.0),
+    ("($1,234)", -1234.0),
+    ("-1,234", -1234.0),
+    ("—", 0.0),
+    ("Note 7", None),
+    (None, None),
+])
+def test_parse_amount(cell, expected):
+    assert parse_amount(cell) == expected
+
+
+def test_label_is_first_text_cell():
+    extractor = StatementTableExtractor(workers=1)
+    page = StatementPage('income_statement', page_number=40, scale=1_000_000)
+    best = {}
+
+    extractor._match_row(page, [None, "", "Net income (loss)", "$ (1,234)", "$ 987"], best)
+    extractor._match_row(page, ["", "Total revenues", "$", "5,000", "4,200"], best)
+
+    assert best['net_income'] == (0, -1_234_000_000.0)
+    assert best['revenue'] == (0, 5_000_000_000.0)
+
+
+def test_latest_year_in_last_column():
+    extractor = StatementTableExtractor(workers=1)
+    page = StatementPage('balance_sheet', page_number=42, latest_first=False)
+    best = {}
+
+    extractor._match_row(page, [None, "Total assets", "100", "250"], best)
+
+    assert best['total_assets'] == (0, 250.0)
@@ -0,0 +1,76 @@
+import os
+import threading
+from functools import lru_cache
+from typing import Optional
+
+# BPE encoding of the Azure OpenAI embedding models (text-embedding-ada-002, text-embedding-3-*)
+DEFAULT_ENCODING = "cl100k_base"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about 4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+class TokenCounter:
+    """Memoized token counts from a locally cached BPE tokenizer (tiktoken).
+
+    The encoding is loaded on the first count, once per process, from
+    ``cache_dir`` (tiktoken's TIKTOKEN_CACHE_DIR, downloaded there on first
+    use), so tools built only to query never load it. Counts are
+    memoized per text, so a paragraph is tokenized once however often the
+    chunker, the overlap and the embedding batcher ask for it; repeated
+    boilerplate (page headers, legends) is only tokenized the first time.
+
+    tiktoken is optional: without it, or when the encoding cannot be loaded
+    (offline without a cached copy), counts fall back to the 4-characters-
+    per-token estimate and ``exact`` is False.
+    """
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING, cache_dir: Optional[str] = None,
+                 max_cached_texts: int = 200_000):
+        self.encoding_name = encoding_name
+        self.cache_dir = cache_dir
+        self.max_cached_texts = max_cached_texts
+        self.encoding = None
+        self._count = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._count is None:
+                try:
+                    import tiktoken
+                    if self.cache_dir:
+                        os.environ.setdefault("TIKTOKEN_CACHE_DIR", self.cache_dir)
+                    self.encoding = tiktoken.get_encoding(self.encoding_name)
+                except ImportError:
+                    print("tiktoken is not installed, token counts are estimated (about 4 characters per token)")
+                except Exception as e:
+                    print(f"Tokenizer {self.encoding_name} unavailable ({type(e).__name__}), token counts are estimated")
+                self._count = lru_cache(maxsize=self.max_cached_texts)(
+                    self._tokens if self.encoding else estimate_tokens
+                )
+        return self._count
+
+    @property
+    def exact(self) -> bool:
+        if self._count is None:
+            self._load()
+        return self.encoding is not None
+
+    def _tokens(self, text: str) -> int:
+        # Special-token text ("<|endoftext|>") in a filing is counted as plain text, as the API sees it
+        return len(self.encoding.encode_ordinary(text))
+
+    def __call__(self, text: str) -> int:
+        return (self._count or self._load())(text)
+
+    def cache_info(self):
+        return (self._count or self._load()).cache_info()
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(encoding_name: str = DEFAULT_ENCODING, cache_dir: Optional[str] = None) -> TokenCounter:
+    """Process-wide TokenCounter for an encoding, shared by every tool and chunker"""
+    return TokenCounter(encoding_name, cache_dir=cache_dir)